@@ -414,19 +414,14 @@ if __name__ == "__main__":
         
             # QSDetector measurement and remaining state after partial trace
             povms = bsm.povms
-            povm_tuple = tuple([tuple(map(tuple, povm)) for povm in povms])
             keys = [photon0_anl.quantum_state, photon0_hc.quantum_state]
             new_state, all_keys = tl.quantum_manager._prepare_state(keys)
-            indices = tuple([all_keys.index(key) for key in keys])
-            state_tuple = tuple(map(tuple, new_state))
-            states, probs = measure_multiple_with_cache_fock_density(state_tuple, indices, len(all_keys), povm_tuple, tl.quantum_manager.truncation)
-            state_plus, state_minus = states[1], states[2]
+            indices = [all_keys.index(key) for key in keys]
+            grouped_state = density_group_subsystems(new_state, indices, len(all_keys), tl.quantum_manager.dim)
                     
-            # assign remaining state (minus as example)
+            # assign remaining state (plus as example)
             if len(keys) < len(all_keys):
-                indices = tuple([all_keys.index(key) for key in keys])
-                new_state_tuple = tuple(map(tuple, state_plus))
-                remaining_state = density_partial_trace(new_state_tuple, indices, len(all_keys), tl.quantum_manager.truncation)
+                remaining_state = povm_remaining_density(grouped_state, povms[1])
                 
             # effective Bell state generated 
             def effective_state(state):
@@ -555,20 +550,14 @@ if __name__ == "__main__":
 
         # QSDetector measurement
         povms = bsm.povms
-        povm_tuple = tuple([tuple(map(tuple, povm)) for povm in povms])
         keys = [photon0_anl.quantum_state, photon0_hc.quantum_state]
         new_state, all_keys = tl.quantum_manager._prepare_state(keys)
-        indices = tuple([all_keys.index(key) for key in keys])
-        state_tuple = tuple(map(tuple, new_state))
-        states, probs = measure_multiple_with_cache_fock_density(state_tuple, indices, len(all_keys), povm_tuple,
-                                                                 tl.quantum_manager.truncation)
-        state_plus, state_minus = states[1], states[2]
+        indices = [all_keys.index(key) for key in keys]
+        grouped_state = density_group_subsystems(new_state, indices, len(all_keys), tl.quantum_manager.dim)
+        probs = povm_probabilities_density(grouped_state, povms)
     
         # calculate remaining state
-        indices = tuple([all_keys.index(key) for key in keys])
-        new_state_tuple = tuple(map(tuple, state_plus))
-        remaining_state = density_partial_trace(new_state_tuple, indices, len(all_keys),
-                                                tl.quantum_manager.truncation)
+        remaining_state = povm_remaining_density(grouped_state, povms[1])
         remaining_keys = [key for key in all_keys if key not in keys]
             
         # effective Bell state generated 
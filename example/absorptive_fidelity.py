@@ -105,19 +105,11 @@ for idx1, mean_num1 in enumerate(mean_num1_list):
 
         # QSDetector measurement and remaining state after partial trace
         povms = bsm.povms
-        povm_tuple = tuple([tuple(map(tuple, povm)) for povm in povms])
         keys = [photon0_anl.quantum_state, photon0_hc.quantum_state]
         new_state, all_keys = tl.quantum_manager._prepare_state(keys)
-        indices = tuple([all_keys.index(key) for key in keys])
-        state_tuple = tuple(map(tuple, new_state))
-        states, probs = measure_multiple_with_cache_fock_density(state_tuple, indices, len(all_keys), povm_tuple,
-                                                                 tl.quantum_manager.truncation)
-        state_plus, state_minus = states[1], states[2]
-
-        indices = tuple([all_keys.index(key) for key in keys])
-        new_state_tuple = tuple(map(tuple, state_plus))
-        remaining_state = density_partial_trace(new_state_tuple, indices, len(all_keys),
-                                                tl.quantum_manager.truncation)
+        indices = [all_keys.index(key) for key in keys]
+        grouped_state = density_group_subsystems(new_state, indices, len(all_keys), tl.quantum_manager.dim)
+        remaining_state = povm_remaining_density(grouped_state, povms[1])
 
 
         remaining_state_eff = effective_state(remaining_state)
@@ -12,6 +12,7 @@ from sequence.topology.node import QKDNode
 if __name__ == "__main__":
     NUM_EXPERIMENTS = 11
     runtime = 6e12
+    pulse_train = False  # set to True to send and measure photons as vectorized pulse trains
 
     # open file to store experiment results
     # Path("results/sensitivity").mkdir(parents=True, exist_ok=True)
@@ -38,7 +39,7 @@ if __name__ == "__main__":
 
         # Alice
         ls_params = {"frequency": 80e6, "mean_photon_num": 0.1}
-        alice = QKDNode("alice", tl, stack_size=1)
+        alice = QKDNode("alice", tl, stack_size=1, pulse_train=pulse_train)
         alice.set_seed(0)
 
         for name, param in ls_params.items():
@@ -47,7 +48,7 @@ if __name__ == "__main__":
         # Bob
         detector_params = [{"efficiency": 0.8, "dark_count": 10, "time_resolution": 10, "count_rate": 50e6},
                            {"efficiency": 0.8, "dark_count": 10, "time_resolution": 10, "count_rate": 50e6}]
-        bob = QKDNode("bob", tl, stack_size=1)
+        bob = QKDNode("bob", tl, stack_size=1, pulse_train=pulse_train)
         bob.set_seed(1)
 
         for i in range(len(detector_params)):
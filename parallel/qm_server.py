@@ -7,9 +7,14 @@ Arguments:
     ip (str): ip address to listen on.
     port (int): port to listen on.
     client_num (int): number of quantum manager clients linked to the server.
+    --protocol (str): wire protocol used by the clients ('binary' or 'json', default 'binary').
+    --workers (int): number of quantum manager worker processes (default 1, i.e. no separate workers).
+        More than one worker starts the sharded server (see the quantum_manager_router module; binary protocol only).
 """
 
 from psequence.quantum_manager_server import start_server, valid_ip, valid_port
+from psequence.quantum_manager_router import start_sharded_server
+from psequence.communication import BINARY_PROTOCOL, JSON_PROTOCOL
 import argparse
 
 if __name__ == '__main__':
@@ -19,6 +24,15 @@ if __name__ == '__main__':
     parser.add_argument('port', type=valid_port, help='listening port number')
     parser.add_argument('client_num', type=int,
                         help='The number of connected clients')
+    parser.add_argument('--protocol', choices=[BINARY_PROTOCOL, JSON_PROTOCOL], default=BINARY_PROTOCOL,
+                        help='The wire protocol used by the clients')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='The number of quantum manager worker processes')
     args = parser.parse_args()
 
-    start_server(args.ip, args.port, args.client_num)
+    if args.workers > 1:
+        if args.protocol != BINARY_PROTOCOL:
+            parser.error('the sharded server requires the binary protocol')
+        start_sharded_server(args.ip, args.port, args.client_num, args.workers)
+    else:
+        start_server(args.ip, args.port, args.client_num, protocol=args.protocol)
@@ -1,4 +1,5 @@
-__all__ = ['p_quantum_manager', 'p_router_net_topo', 'p_timeline', 'quantum_manager_client', 'quantum_manager_server']
+__all__ = ['p_quantum_manager', 'p_router_net_topo', 'p_timeline', 'quantum_manager_client', 'quantum_manager_router',
+           'quantum_manager_server', 'shared_memory_quantum_manager']
 
 def __dir__():
     return sorted(__all__)
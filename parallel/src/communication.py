@@ -1,12 +1,38 @@
+"""This module defines the wire protocols used between quantum manager clients and servers.
+
+Two protocols are supported:
+    - `JSON_PROTOCOL`: each frame is a JSON document prefixed by its length (used by the C++ server).
+    - `BINARY_PROTOCOL`: versioned binary frames of records (see `encode_record` and `decode_records`).
+
+A binary frame consists of a header (protocol version, payload length) followed by the payload.
+The payload is a sequence of records, each with a header (request id, message type, number of keys, body length),
+the keys as 16-byte unsigned integers, and a body specific to the message type.
+Responses carry the request id of their request, so that clients may keep several requests in flight.
+Complex arrays are sent as raw complex128 buffers.
+"""
+
 from json import dumps, loads
-from typing import TYPE_CHECKING, Any
+from struct import Struct
+from typing import TYPE_CHECKING, Any, List, Tuple, Iterator
+
+from numpy import asarray, frombuffer, ndarray, complex128
 
 if TYPE_CHECKING:
     from socket import socket
 
+JSON_PROTOCOL = "json"
+BINARY_PROTOCOL = "binary"
+
 LEN_BYTE_LEN = 4
 BYTE_ORDER = "big"
 
+PROTOCOL_VERSION = 2
+FRAME_HEADER = Struct("!BI")  # protocol version, payload length
+RECORD_HEADER = Struct("!IBHI")  # request id, message type, number of keys, body length
+MAX_REQUEST_ID = 2 ** 32 - 1
+KEY_LEN = 16  # keys are 128-bit unsigned integers (e.g. from uuid4)
+COMPLEX_DTYPE = complex128().dtype.newbyteorder("<")
+
 
 def send_msg_with_length(socket: "socket", msg: Any):
     msg_byte = dumps(msg)
@@ -16,14 +42,130 @@ def send_msg_with_length(socket: "socket", msg: Any):
 
 
 def recv_msg_with_length(socket: "socket") -> Any:
-    length_byte = socket.recv(LEN_BYTE_LEN)
+    length_byte = bytearray(LEN_BYTE_LEN)
+    recv_exactly(socket, memoryview(length_byte))
     length = int.from_bytes(length_byte, BYTE_ORDER)
-    all_data = ''
-    while len(all_data) < length:
-        received_data = socket.recv(length)
-        if all_data == '':
-            all_data = received_data
-        else:
-            all_data += received_data
+    all_data = bytearray(length)
+    recv_exactly(socket, memoryview(all_data))
     received_msg = loads(all_data)
     return received_msg
+
+
+def recv_exactly(socket: "socket", view: memoryview) -> memoryview:
+    """Function to fill a buffer with data received from a socket.
+
+    Args:
+        socket (socket): socket to receive from.
+        view (memoryview): writable buffer; is filled completely.
+
+    Returns:
+        memoryview: the filled buffer.
+
+    Raises:
+        ConnectionError: if the connection is closed before the buffer is filled.
+    """
+
+    received = 0
+    while received < len(view):
+        num_bytes = socket.recv_into(view[received:])
+        if num_bytes == 0:
+            raise ConnectionError("socket closed after {} of {} bytes".format(received, len(view)))
+        received += num_bytes
+    return view
+
+
+def encode_keys(keys: List[int]) -> bytes:
+    return b"".join(key.to_bytes(KEY_LEN, BYTE_ORDER) for key in keys)
+
+
+def decode_keys(view: memoryview, num_keys: int) -> List[int]:
+    return [int.from_bytes(view[i * KEY_LEN:(i + 1) * KEY_LEN], BYTE_ORDER) for i in range(num_keys)]
+
+
+def encode_complex(amplitudes: Any) -> bytes:
+    """Function to encode a complex array (of any shape) as a raw little-endian complex128 buffer."""
+
+    return asarray(amplitudes, dtype=COMPLEX_DTYPE).tobytes()
+
+
+def decode_complex(view: memoryview) -> ndarray:
+    """Function to decode a raw complex128 buffer without copying (the returned array is read-only)."""
+
+    return frombuffer(view, dtype=COMPLEX_DTYPE)
+
+
+def encode_record(msg_type: int, keys: List[int], body: bytes = b"", request_id: int = 0) -> bytes:
+    """Function to encode one record of a binary frame.
+
+    Args:
+        msg_type (int): value of the message type.
+        keys (List[int]): keys of the record.
+        body (bytes): type-specific body of the record (default empty).
+        request_id (int): id of the request (or of the request answered by a response) (default 0).
+
+    Returns:
+        bytes: encoded record.
+    """
+
+    return RECORD_HEADER.pack(request_id, msg_type, len(keys), len(body)) + encode_keys(keys) + body
+
+
+def decode_records(payload: memoryview) -> Iterator[Tuple[int, int, List[int], memoryview]]:
+    """Function to iterate over the records of a binary frame payload.
+
+    Args:
+        payload (memoryview): payload of a frame (from `FrameReader.recv_frame`).
+
+    Yields:
+        Tuple[int, int, List[int], memoryview]: request id, message type value, keys, and body of each record.
+    """
+
+    offset = 0
+    while offset < len(payload):
+        request_id, msg_type, num_keys, body_len = RECORD_HEADER.unpack_from(payload, offset)
+        offset += RECORD_HEADER.size
+        keys = decode_keys(payload[offset:], num_keys)
+        offset += num_keys * KEY_LEN
+        yield request_id, msg_type, keys, payload[offset:offset + body_len]
+        offset += body_len
+
+
+def send_frame(socket: "socket", records: List[bytes]) -> None:
+    """Function to send records as one binary frame."""
+
+    payload_len = sum(len(record) for record in records)
+    socket.sendall(b"".join([FRAME_HEADER.pack(PROTOCOL_VERSION, payload_len)] + records))
+
+
+class FrameReader:
+    """Class to receive binary frames from a socket into a reusable buffer.
+
+    The buffer only grows when a larger frame arrives; a grown buffer replaces the old one,
+    so views returned for earlier frames stay valid (but are overwritten by later frames of the same size).
+
+    Attributes:
+        socket (socket): socket to receive from.
+        buffer (bytearray): receive buffer.
+    """
+
+    def __init__(self, socket: "socket", size: int = 4096):
+        self.socket = socket
+        self.buffer = bytearray(size)
+        self._header = memoryview(bytearray(FRAME_HEADER.size))
+
+    def recv_frame(self) -> memoryview:
+        """Method to receive one frame.
+
+        Returns:
+            memoryview: payload of the frame (valid until the next call).
+
+        Raises:
+            ValueError: if the frame uses a different protocol version.
+        """
+
+        version, length = FRAME_HEADER.unpack(recv_exactly(self.socket, self._header))
+        if version != PROTOCOL_VERSION:
+            raise ValueError("unsupported protocol version {} (expected {})".format(version, PROTOCOL_VERSION))
+        if length > len(self.buffer):
+            self.buffer = bytearray(max(length, 2 * len(self.buffer)))
+        return recv_exactly(self.socket, memoryview(self.buffer)[:length])
@@ -7,7 +7,7 @@ The states may currently be defined in two possible ways:
 The manager defines an API for interacting with quantum states.
 """
 from typing import List, Dict, TYPE_CHECKING
-from sequence.kernel.quantum_manager import QuantumManagerKet, QuantumManagerDensity
+from sequence.kernel.quantum_manager import QuantumManagerKet, QuantumManagerDensity, QuantumManager
 
 if TYPE_CHECKING:
     from sequence.components.circuit import Circuit
@@ -43,3 +43,20 @@ class ParallelQuantumManagerDensity(QuantumManagerDensity):
 
     def remove(self, key: int) -> None:
         del self.states[key]
+
+
+def new_parallel_quantum_manager(formalism: str) -> QuantumManager:
+    """Function to create the quantum manager of a quantum manager server.
+
+    Args:
+        formalism (str): formalism of the server (`"KET"` or `"DENSITY"`).
+
+    Returns:
+        QuantumManager: quantum manager with an empty state dictionary.
+    """
+
+    if formalism == "KET":
+        return ParallelQuantumManagerKet({})
+    elif formalism == "DENSITY":
+        return ParallelQuantumManagerDensity({})
+    raise ValueError("Invalid formalism {} given".format(formalism))
@@ -5,8 +5,17 @@ from sequence.topology.node import QuantumRouter, BSMNode
 
 from .p_timeline import ParallelTimeline
 
+LIGHT_SPEED = 2e-4  # default light speed (in m/ps) of channels
+
 
 class ParallelRouterNetTopo(RouterNetTopo):
+    """Class for generating a parallel quantum router network.
+
+    Nodes are assigned to processes by their group.
+    The lookahead between each pair of processes is the minimum delay of quantum and classical channels
+    from the nodes of one process to the nodes of the other (or the configured lookahead, if larger).
+    """
+
     def _add_timeline(self, config):
         stop_time = config.get(Topo.STOP_TIME, float('inf'))
         assert MPI.COMM_WORLD.Get_size() == config[self.PROC_NUM]
@@ -46,3 +55,32 @@ class ParallelRouterNetTopo(RouterNetTopo):
                     self.nodes[type] = [node_obj]
             else:
                 self.tl.add_foreign_entity(name, group)
+
+        self._set_lookaheads(config)
+
+    def _set_lookaheads(self, config):
+        rank = MPI.COMM_WORLD.Get_rank()
+        groups = {node[Topo.NAME]: node.get(self.GROUP, 0) for node in config[Topo.ALL_NODE]}
+
+        links = []  # (source node, destination node, delay)
+        for qc in config.get(Topo.ALL_Q_CHANNEL, []):
+            links.append((qc[Topo.SRC], qc[Topo.DST], qc[Topo.DISTANCE] / LIGHT_SPEED))
+        for cc in config.get(Topo.ALL_C_CHANNEL, []):
+            delay = cc.get(Topo.DELAY, -1)
+            if delay == -1:
+                delay = cc.get(Topo.DISTANCE, 1000) / LIGHT_SPEED
+            links.append((cc[Topo.SRC], cc[Topo.DST], delay))
+        for cc in config.get(Topo.ALL_CC_CONNECT, []):
+            delay = cc.get(Topo.DELAY, -1)
+            if delay == -1:
+                delay = cc.get(Topo.DISTANCE, 1000) / LIGHT_SPEED
+            node1, node2 = cc[Topo.CONNECT_NODE_1], cc[Topo.CONNECT_NODE_2]
+            links += [(node1, node2, delay), (node2, node1, delay)]
+
+        lookaheads = {}
+        for src, dst, delay in links:
+            if groups[dst] == rank and groups[src] != rank:
+                lookaheads[groups[src]] = min(lookaheads.get(groups[src], float('inf')), delay)
+        for tl_id in range(MPI.COMM_WORLD.Get_size()):
+            if tl_id != rank:
+                self.tl.set_lookahead(tl_id, max(self.tl.lookahead, lookaheads.get(tl_id, float('inf'))))
@@ -1,12 +1,15 @@
-from typing import List
+from typing import List, Dict
 
 from mpi4py import MPI
 from time import time
 from sequence.kernel.timeline import Timeline
 from sequence.kernel.event import Event
 from sequence.kernel.quantum_manager import KET_STATE_FORMALISM
+from sequence.kernel.eventlist import HEAP_EVENT_LIST
 
 from .quantum_manager_client import QuantumManagerClient
+from .shared_memory_quantum_manager import SharedMemoryQuantumManager
+from .communication import BINARY_PROTOCOL
 
 
 class ParallelTimeline(Timeline):
@@ -16,23 +19,33 @@ class ParallelTimeline(Timeline):
     There is one Parallel Timeline per simulation process.
     Each timeline controls a subset of the simulated network nodes.
     For events executed on nodes belonging to other timelines, an event buffer is maintained.
-    These buffers are exchanged between timelines at regular synchronization intervals.
+    These buffers are exchanged between timelines at synchronization points.
     All Parallel Timelines in a simulation communicate with a Quantum Manager Server for shared quantum states.
 
+    Synchronization is conservative, with a lookahead for each pair of timelines
+    (the minimum delay of events sent from the entities of one timeline to the entities of the other).
+    At each synchronization, timelines exchange the time of their next event and of the events they sent.
+    A timeline then executes its events up to the earliest time another timeline may send it an event;
+    timelines without events, or with no channels to this timeline, do not limit its execution window.
+
     Attributes:
         id (int): rank of MPI process running the Parallel Timeline instance.
         foreign_entities (Dict[str, int]): mapping of object names on other processes to process id.
         event_buffer(List[List[Event]]): stores events for execution on foreign entities;
             swapped during synchronization.
-        lookahead (int): defines width of time window for execution (simulation time between synchronization).
-        quantum_manager (QuantumManagerClient): local quantum manager client to communicate with server.
+        lookahead (int): default lookahead for events sent by other timelines.
+        lookaheads (Dict[int, int]): lookahead for events sent by specific timelines (by id).
+        quantum_manager (QuantumManagerClient): local quantum manager client to communicate with server
+            (or SharedMemoryQuantumManager for single-host runs).
     """
 
     def __init__(self, lookahead: int, stop_time=float('inf'), formalism=KET_STATE_FORMALISM,
-                 qm_ip=None, qm_port=None):
+                 qm_ip=None, qm_port=None, event_queue=HEAP_EVENT_LIST, qm_protocol=BINARY_PROTOCOL,
+                 qm_pipelined=False, qm_shm_name=None):
         """Constructor for the ParallelTimeline class.
 
         Also creates a quantum manager client, unless `qm_ip` and `qm_port` are both set to None.
+        If `qm_shm_name` is set, quantum states are instead kept in a shared memory arena (all processes on one host).
 
         Args:
             lookahead (int): sets the timeline lookahead time.
@@ -40,20 +53,35 @@ class ParallelTimeline(Timeline):
             formalism (str): formalism to use for storing quantum states (default 'KET').
             qm_ip (str): IP address for the quantum manager server (default None).
             qm_port (int): port to connect to for quantum manager server (default None).
+            event_queue (str): backend of the event list (default 'heap').
+            qm_protocol (str): wire protocol of the quantum manager server (default 'binary'; use 'json' for the
+                C++ server).
+            qm_pipelined (bool): if the quantum manager client should return measurement results as futures,
+                resolved when accessed or at the next synchronization (default False).
+            qm_shm_name (str): name of the shared memory arena for quantum states (default None).
+                The arena is created by the process of rank 0 and removed when it calls `disconnect_from_server`.
         """
 
-        super(ParallelTimeline, self).__init__(stop_time, formalism)
+        super(ParallelTimeline, self).__init__(stop_time, formalism, event_queue=event_queue)
 
         self.id = MPI.COMM_WORLD.Get_rank()
         self.foreign_entities = {}
         self.event_buffer = [[] for _ in range(MPI.COMM_WORLD.Get_size())]
         self.lookahead = lookahead
+        self.lookaheads: Dict[int, int] = {}
         if qm_ip is not None and qm_port is not None:
-            self.quantum_manager = QuantumManagerClient(formalism, qm_ip, qm_port)
+            self.quantum_manager = QuantumManagerClient(formalism, qm_ip, qm_port, qm_protocol, qm_pipelined)
+        elif qm_shm_name is not None:
+            if self.id == 0:
+                self.quantum_manager = SharedMemoryQuantumManager(formalism, qm_shm_name, create=True)
+            MPI.COMM_WORLD.Barrier()
+            if self.id != 0:
+                self.quantum_manager = SharedMemoryQuantumManager(formalism, qm_shm_name)
 
         self.show_progress = False
 
-        self.buffer_min_ts = float('inf')
+        # earliest event time sent to each timeline since the last synchronization
+        self.buffer_min_ts = [float('inf')] * MPI.COMM_WORLD.Get_size()
 
         self.sync_counter = 0
         self.exchange_counter = 0
@@ -65,8 +93,8 @@ class ParallelTimeline(Timeline):
 
         if type(event.process.owner) is str \
                 and event.process.owner in self.foreign_entities:
-            self.buffer_min_ts = min(self.buffer_min_ts, event.time)
             tl_id = self.foreign_entities[event.process.owner]
+            self.buffer_min_ts[tl_id] = min(self.buffer_min_ts[tl_id], event.time)
             self.event_buffer[tl_id].append(event)
             self.schedule_counter += 1
         else:
@@ -84,34 +112,66 @@ class ParallelTimeline(Timeline):
         else:
             return float('inf')
 
+    def set_lookahead(self, tl_id: int, lookahead: int) -> None:
+        """Sets the lookahead for events sent by another timeline.
+
+        Args:
+            tl_id (int): id of the sending timeline.
+            lookahead (int): minimum delay (in ps) of events sent by the timeline to this timeline
+                (infinite if no events are sent).
+        """
+
+        assert lookahead > 0
+        self.lookaheads[tl_id] = lookahead
+
+    def get_sync_time(self, next_times: List[float]) -> float:
+        """Method to get the end of the next execution window.
+
+        Args:
+            next_times (List[float]): earliest possible event time of each timeline.
+
+        Returns:
+            float: time before which no other timeline can send events to this timeline (at most `stop_time`).
+        """
+
+        sync_time = self.stop_time
+        for tl_id, next_time in enumerate(next_times):
+            if tl_id != self.id:
+                sync_time = min(sync_time, next_time + self.lookaheads.get(tl_id, self.lookahead))
+        return sync_time
+
     def run(self):
         while self.time < self.stop_time:
             tick = time()
-            min_time = min(self.buffer_min_ts, self.top_time())
+            bounds = [self.top_time()] + self.buffer_min_ts
             for buf in self.event_buffer:
-                buf.append(min_time)
+                buf.append(bounds)
             inbox = MPI.COMM_WORLD.alltoall(self.event_buffer)
             self.communication_time += time() - tick
 
             for buff in self.event_buffer:
                 buff.clear()
-            self.buffer_min_ts = float('inf')
+            self.buffer_min_ts = [float('inf')] * len(self.buffer_min_ts)
 
+            all_bounds = []
             for events in inbox:
-                min_time = min(min_time, events.pop())
+                all_bounds.append(events.pop())
                 for event in events:
                     self.exchange_counter += 1
                     self.schedule(event)
 
-            assert min_time >= self.time
+            # earliest event of each timeline: its next event, or the earliest event sent to it
+            next_times = [min([all_bounds[tl_id][0]] + [bounds[tl_id + 1] for bounds in all_bounds])
+                          for tl_id in range(len(all_bounds))]
+            min_time = min(next_times)
+            assert next_times[self.id] >= self.time
 
             if min_time >= self.stop_time:
                 break
 
             self.sync_counter += 1
 
-            sync_time = min(min_time + self.lookahead, self.stop_time)
-            self.time = min_time
+            sync_time = self.get_sync_time(next_times)
 
             tick = time()
             while len(self.events) > 0 and self.events.top().time < sync_time:
@@ -123,7 +183,7 @@ class ParallelTimeline(Timeline):
                 self.time = event.time
                 event.process.run()
                 self.run_counter += 1
-            if isinstance(self.quantum_manager, QuantumManagerClient):
+            if isinstance(self.quantum_manager, (QuantumManagerClient, SharedMemoryQuantumManager)):
                 self.quantum_manager.flush_before_sync()
             self.computing_time += time() - tick
 
@@ -3,19 +3,103 @@
 This client provides the same interface as the QuantumManager class for manipulating qubits.
 Qubits only managed by the local process are stored within a QuantumManager class instance.
 Qubits managed or accessed between processes are stored on a remote quantum manager server.
+
+In pipelined mode, the client does not wait for the responses of remote requests.
+Requests are tagged with ids and return futures, which receive responses only when their values are needed.
 """
 from collections import defaultdict
+from collections.abc import Mapping
 from socket import socket
-from typing import List
+from typing import List, Dict
 from time import time
 from uuid import uuid4
-from sequence.kernel.quantum_manager import QuantumManagerKet, QuantumManagerDensity, KetState, \
+from sequence.kernel.quantum_manager import QuantumManagerKet, QuantumManagerDensity, KetState, DensityState, \
     KET_STATE_FORMALISM, DENSITY_MATRIX_FORMALISM
 from sequence.components.circuit import Circuit
-from .communication import send_msg_with_length, recv_msg_with_length
+from .communication import send_msg_with_length, recv_msg_with_length, send_frame, decode_records, FrameReader, \
+    JSON_PROTOCOL, BINARY_PROTOCOL, MAX_REQUEST_ID
 
 from .quantum_manager_server import QuantumManagerMsgType, \
-    QuantumManagerMessage
+    QuantumManagerMessage, decode_response
+
+
+class QuantumManagerFuture:
+    """Class for the pending response of a request to the quantum manager server.
+
+    Responses are received in order of requests, so waiting for one response also resolves
+    the futures of all earlier requests.
+
+    Attributes:
+        client (QuantumManagerClient): client that sent the request.
+        request_id (int): id of the request (0 for values obtained locally).
+        msg_type (QuantumManagerMsgType): type of the request.
+    """
+
+    def __init__(self, client: "QuantumManagerClient", request_id: int, msg_type: QuantumManagerMsgType):
+        self.client = client
+        self.request_id = request_id
+        self.msg_type = msg_type
+        self._done = False
+        self._result = None
+
+    def done(self) -> bool:
+        return self._done
+
+    def result(self) -> any:
+        """Method to get the value of the response, blocking until it is received."""
+
+        while not self._done:
+            self.client._receive()
+        return self._result
+
+    def set_result(self, response: any) -> None:
+        self._result = self._process(response)
+        self._done = True
+
+    def _process(self, response: any) -> any:
+        return response
+
+
+class StateFuture(QuantumManagerFuture):
+    """Future for the state returned by a `GET` request."""
+
+    def _process(self, response):
+        keys, amplitudes = response
+        if self.client.protocol == JSON_PROTOCOL:
+            state = KetState([0, 1], [0])
+            state.deserialize({"keys": keys, "state": amplitudes})
+        elif self.client.formalism == KET_STATE_FORMALISM:
+            state = KetState(amplitudes, keys)
+        else:
+            dim = int(round(len(amplitudes) ** 0.5))
+            state = DensityState(amplitudes.reshape((dim, dim)), keys)
+        return state
+
+
+class MeasurementFuture(QuantumManagerFuture, Mapping):
+    """Future for the measurement results returned by a `RUN` request.
+
+    The future may be used as the dictionary of results (mapping measured keys to outcomes),
+    and only blocks when the results are first accessed.
+    """
+
+    def _process(self, response):
+        measured_keys, results = response
+        ret_val = dict(zip(measured_keys, results))
+        self.client._move_measured_to_client(self.request_id, ret_val)
+        return ret_val
+
+    def __getitem__(self, key):
+        return self.result()[key]
+
+    def __iter__(self):
+        return iter(self.result())
+
+    def __len__(self):
+        return len(self.result())
+
+    def __repr__(self):
+        return repr(self.result()) if self._done else "<pending measurement {}>".format(self.request_id)
 
 
 class QuantumManagerClient:
@@ -27,23 +111,36 @@ class QuantumManagerClient:
         formalism (str): formalism to use for quantum manager (must match server).
         ip (str): ip address of quantum manager server.
         port (int): port of quantum manager server.
+        protocol (str): wire protocol (must match server; `JSON_PROTOCOL` for the C++ server).
         socket (socket): socket for communication with server.
         managed_qubits (set): keys for all qubits managed locally by client.
         message_buffer (List): list of messages to send to quantum manager server.
+        pipelined (bool): if `run_circuit` should return without waiting for measurement results.
+        pending (Dict[int, QuantumManagerFuture]): futures of requests awaiting responses (in order of requests).
     """
 
-    def __init__(self, formalism: str, ip: str, port: int):
+    def __init__(self, formalism: str, ip: str, port: int, protocol: str = BINARY_PROTOCOL,
+                 pipelined: bool = False):
         """Constructor for QuantumManagerClient class.
 
         Args:
             formalism (str): formalism to use for quantum manager.
             ip (str): ip of quantum manager server.
             port (int): port of quantum manager server.
+            protocol (str): wire protocol to use (default `BINARY_PROTOCOL`).
+            pipelined (bool): if `run_circuit` should return a `MeasurementFuture` for remote measurements,
+                instead of blocking until results are received (default `False`).
         """
         self.formalism = formalism
         self.ip = ip
         self.port = port
+        self.protocol = protocol
+        self.pipelined = pipelined
+        self.pending: Dict[int, QuantumManagerFuture] = {}
+        self._next_request_id = 1
+        self._last_request: Dict[int, int] = {}  # key -> id of the last request sent for the key
         self.socket = socket()
+        self.reader = FrameReader(self.socket)
         self.managed_qubits = set()
         self.io_time = 0
         self.type_counter = defaultdict(lambda: 0)
@@ -95,15 +192,25 @@ class QuantumManagerClient:
         return key
 
     def get(self, key: int) -> any:
+        return self.get_async(key).result()
+
+    def get_async(self, key: int) -> QuantumManagerFuture:
+        """Method to request a state without waiting for the response.
+
+        Args:
+            key (int): key of the state.
+
+        Returns:
+            QuantumManagerFuture: future for the state (already resolved if the qubit is managed locally).
+        """
+
         self.client_call_counter += 1
         if self._check_local([key]):
-            return self.qm.get(key)
+            future = QuantumManagerFuture(self, 0, QuantumManagerMsgType.GET)
+            future.set_result(self.qm.get(key))
+            return future
         else:
-            state_raw = self._send_message(QuantumManagerMsgType.GET, [key],
-                                           [])
-            state = KetState([0, 1], [0])
-            state.deserialize(state_raw)
-            return state
+            return self._send_message(QuantumManagerMsgType.GET, [key], [], future_type=StateFuture)
 
     def run_circuit(self, circuit: "Circuit", keys: List[int], meas_samp=None) -> any:
         self.client_call_counter += 1
@@ -130,22 +237,29 @@ class QuantumManagerClient:
                                    [circuit, keys], False)
                 return {}
 
-            ret_val_raw = self._send_message(QuantumManagerMsgType.RUN,
-                                             list(visited_qubits),
-                                             [circuit, keys, meas_samp])
+            future = self._send_message(QuantumManagerMsgType.RUN,
+                                        list(visited_qubits),
+                                        [circuit, keys, meas_samp],
+                                        future_type=MeasurementFuture)
+            if self.pipelined:
+                return future
+            return future.result()
 
-            ret_val = {}
-            for key in ret_val_raw:
-                ret_val[int(key, 16)] = ret_val_raw[key]
+    def _move_measured_to_client(self, request_id: int, ret_val: Dict[int, int]) -> None:
+        """Moves measured qubits back to the client once the results of a measurement are received.
 
-            for measured_q in ret_val:
-                if not measured_q in self.qm.states:
-                    continue
-                if ret_val[measured_q] == 1:
-                    self.move_manage_to_client([measured_q], [0, 1])
-                else:
-                    self.move_manage_to_client([measured_q], [1, 0])
-            return ret_val
+        Qubits used by requests sent after the measurement stay on the server.
+        """
+
+        for measured_q in ret_val:
+            if not measured_q in self.qm.states:
+                continue
+            if self._last_request.get(measured_q) != request_id:
+                continue
+            if ret_val[measured_q] == 1:
+                self.move_manage_to_client([measured_q], [0, 1])
+            else:
+                self.move_manage_to_client([measured_q], [1, 0])
 
     def set(self, keys: List[int], amplitudes: any) -> None:
         self.client_call_counter += 1
@@ -161,7 +275,8 @@ class QuantumManagerClient:
 
     def remove(self, key: int) -> None:
         self.client_call_counter += 1
-        self._send_message(QuantumManagerMsgType.REMOVE, [key], [])
+        self._send_message(QuantumManagerMsgType.REMOVE, [key], [], False)
+        self._last_request.pop(key, None)
         self.qm.remove(key)
 
     def kill(self) -> None:
@@ -201,45 +316,78 @@ class QuantumManagerClient:
         assert all(qubit_key in self.qm.states for qubit_key in qubit_keys)
         for key in qubit_keys:
             self.managed_qubits.add(key)
+            self._last_request.pop(key, None)
         self.qm.set(qubit_keys, amplitude)
 
     def _send_message(self, msg_type, keys: List, args: List,
-                      expecting_receive=True) -> any:
+                      expecting_receive=True, future_type=QuantumManagerFuture) -> any:
         """Sends a message to the remote quantum manager server.
 
+        Messages not expecting a response are buffered until the next flush.
+        Messages expecting a response flush the buffer, but do not wait for the response.
+
         Args:
             msg_type (QuantumManagerMsgType): type of message to send.
             keys (List[int]): list of all keys affected by message process.
             args (List[any]): any other arguments used for the message.
-            expecting_receive (bool): indicates if client should block until response received (default `True`).
+            expecting_receive (bool): indicates if the server will respond to the message (default `True`).
+            future_type (type): class of the future for the response (default `QuantumManagerFuture`).
 
         Returns:
-            any: result of process on quantum manager server (if `expecting_receive` is `True`).
+            QuantumManagerFuture: future for the response (if `expecting_receive` is `True`).
         """
 
         self.type_counter[msg_type.name] += 1
 
-        msg = QuantumManagerMessage(msg_type, keys, args)
+        request_id = self._next_request_id
+        self._next_request_id = request_id % MAX_REQUEST_ID + 1
+        msg = QuantumManagerMessage(msg_type, keys, args, request_id)
         self.message_buffer.append(msg)
+        for key in keys:
+            self._last_request[key] = request_id
 
         if expecting_receive:
+            future = future_type(self, request_id, msg_type)
+            self.pending[request_id] = future
             self.flush_message_buffer()
-            tick = time()
-            received_msg = recv_msg_with_length(self.socket)
+            return future
+
+    def _receive(self) -> None:
+        """Receives one response frame and resolves the futures of the answered requests."""
+
+        tick = time()
+        if self.protocol == BINARY_PROTOCOL:
+            payload = self.reader.recv_frame()
             self.io_time += time() - tick
-            return received_msg
+            for record in decode_records(payload):
+                future = self.pending.pop(record[0])
+                future.set_result(decode_response(future.msg_type, record, self.protocol))
+        else:
+            response = recv_msg_with_length(self.socket)
+            self.io_time += time() - tick
+            # JSON responses carry no request id, but arrive in order of requests
+            future = self.pending.pop(next(iter(self.pending)))
+            future.set_result(decode_response(future.msg_type, response, self.protocol))
 
     def flush_message_buffer(self):
         if len(self.message_buffer) > 0:
             tick = time()
-            msgs = [msg.serialize() for msg in self.message_buffer]
-            send_msg_with_length(self.socket, msgs)
+            if self.protocol == BINARY_PROTOCOL:
+                send_frame(self.socket, [msg.encode() for msg in self.message_buffer])
+            else:
+                msgs = [msg.serialize() for msg in self.message_buffer]
+                send_msg_with_length(self.socket, msgs)
             self.io_time += time() - tick
             self.message_buffer = []
 
     def flush_before_sync(self):
-        if len(self.message_buffer) > 0:
-            self._send_message(QuantumManagerMsgType.SYNC, [], [])
+        """Sends buffered messages and waits until the server has processed all requests of the client.
+
+        Pending futures are resolved.
+        """
+
+        if len(self.message_buffer) > 0 or len(self.pending) > 0:
+            self._send_message(QuantumManagerMsgType.SYNC, [], []).result()
 
     def _check_local(self, keys: List[int]):
         return not any([self.is_managed_by_server(key) for key in keys])
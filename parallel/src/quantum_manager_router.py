@@ -0,0 +1,338 @@
+"""This module defines the sharded quantum manager server.
+
+The sharded server splits the quantum manager across several worker processes.
+A routing front-end accepts client connections (using the binary protocol) and forwards each request to the worker owning its keys.
+When a request involves keys owned by different workers (e.g. a circuit entangling them),
+the states of these keys are migrated to a single worker before the request is forwarded.
+Clients use the same messages (`QuantumManagerMsgType`) as for the single process server.
+
+Requests received in the same round of `select` are forwarded to all workers before any response is awaited,
+so that workers process requests in parallel.
+"""
+
+from collections import Counter
+from json import dump
+from multiprocessing import Pipe, Process
+import select
+import socket
+from time import time
+from typing import Dict, List, Tuple, Optional
+
+from .communication import decode_records, encode_record, send_frame, FrameReader, BINARY_PROTOCOL, \
+    MAX_REQUEST_ID, KEY_LEN
+from .p_quantum_manager import new_parallel_quantum_manager
+from .quantum_manager_server import QuantumManagerMsgType, QuantumManagerMessage, process_message, \
+    encode_response, decode_response, RUN_HEADER, CIRCUIT_HEADER
+
+
+def run_worker(conn, formalism: str) -> None:
+    """Main function of a quantum manager worker process.
+
+    The worker receives batches of binary records from the router, and replies to each batch with one batch of responses.
+    A `TERMINATE` record stops the worker; the worker then replies with its timing information.
+
+    Args:
+        conn (Connection): connection to the router.
+        formalism (str): formalism of the quantum manager.
+    """
+
+    qm = new_parallel_quantum_manager(formalism)
+    timing_comp = {}
+
+    while True:
+        payload = conn.recv_bytes()
+        responses = []
+        for record in decode_records(memoryview(payload)):
+            msg = QuantumManagerMessage(None, [], [])
+            msg.decode(*record)
+            if msg.type == QuantumManagerMsgType.TERMINATE:
+                conn.send({msg_type.name: timer for msg_type, timer in timing_comp.items()})
+                conn.close()
+                return
+
+            tick = time()
+            return_val = process_message(qm, msg)
+            if return_val is not None:
+                responses.append(encode_response(msg.type, return_val, BINARY_PROTOCOL, msg.request_id))
+            timing_comp[msg.type] = timing_comp.get(msg.type, 0) + time() - tick
+
+        conn.send_bytes(b"".join(responses))
+
+
+def run_expects_response(body: memoryview) -> bool:
+    """Function to check if an encoded `RUN` request measures qubits (and thus receives a response)."""
+
+    _, num_keys = RUN_HEADER.unpack_from(body)
+    _, _, num_measured = CIRCUIT_HEADER.unpack_from(body, RUN_HEADER.size + num_keys * KEY_LEN)
+    return num_measured > 0
+
+
+class QuantumManagerShard:
+    """Class for the router side of a quantum manager worker process.
+
+    Attributes:
+        conn (Connection): connection to the worker.
+        process (Process): worker process.
+        records (List[bytes]): records to send in the next batch.
+        num_batches (int): number of batches awaiting a reply.
+        num_keys (int): number of keys owned by the worker.
+    """
+
+    def __init__(self, formalism: str):
+        self.conn, worker_conn = Pipe()
+        self.process = Process(target=run_worker, args=(worker_conn, formalism), daemon=True)
+        self.process.start()
+        worker_conn.close()
+        self.records = []
+        self.num_batches = 0
+        self.num_keys = 0
+
+    def flush(self) -> None:
+        if len(self.records) > 0:
+            self.conn.send_bytes(b"".join(self.records))
+            self.records = []
+            self.num_batches += 1
+
+    def receive(self) -> memoryview:
+        """Method to receive the reply to the oldest unanswered batch."""
+
+        self.num_batches -= 1
+        return memoryview(self.conn.recv_bytes())
+
+
+class QuantumManagerRouter:
+    """Class to route quantum manager requests to worker processes.
+
+    Each key is owned by one worker, which stores the state of the key.
+    Keys are assigned to the least loaded worker when first used,
+    and states are migrated when a request involves keys of several workers.
+
+    Attributes:
+        shards (List[QuantumManagerShard]): worker handles.
+        owners (Dict[int, int]): mapping of keys to the index of their owning worker.
+        pending (Dict[int, Tuple[socket, int]]): mapping of forwarded request ids to client sockets and request ids.
+        responses (Dict[socket, List[bytes]]): responses to send to each client at the end of the round.
+        migration_counter (int): number of migrated states.
+    """
+
+    def __init__(self, num_workers: int, formalism: str = "KET"):
+        """Constructor of the router; starts the worker processes.
+
+        Args:
+            num_workers (int): number of worker processes.
+            formalism (str): formalism of the quantum managers (default `"KET"`).
+        """
+
+        assert num_workers > 0
+        self.shards = [QuantumManagerShard(formalism) for _ in range(num_workers)]
+        self.owners: Dict[int, int] = {}
+        self.pending: Dict[int, Optional[Tuple[socket.socket, int]]] = {}
+        self.responses: Dict[socket.socket, List[bytes]] = {}
+        self.migration_counter = 0
+        self._exported: Dict[int, Tuple[List[int], any]] = {}
+        self._next_request_id = 1
+
+    def _new_request_id(self) -> int:
+        request_id = self._next_request_id
+        self._next_request_id = request_id % MAX_REQUEST_ID + 1
+        return request_id
+
+    def respond(self, client: socket.socket, record: bytes) -> None:
+        self.responses.setdefault(client, []).append(record)
+
+    def dispatch(self, client: socket.socket, request_id: int, msg_type: QuantumManagerMsgType,
+                 keys: List[int], body: memoryview) -> None:
+        """Method to forward a request to the worker owning its keys.
+
+        Args:
+            client (socket): socket of the client sending the request.
+            request_id (int): id of the request given by the client.
+            msg_type (QuantumManagerMsgType): type of the request (`GET`, `SET`, `RUN` or `REMOVE`).
+            keys (List[int]): keys of the request.
+            body (memoryview): encoded body of the request.
+        """
+
+        if msg_type == QuantumManagerMsgType.REMOVE:
+            index = self.owners.pop(keys[0], None)
+            if index is None:
+                return
+            self.shards[index].num_keys -= 1
+        else:
+            index = self._colocate(keys)
+
+        forward_id = 0
+        if msg_type == QuantumManagerMsgType.GET or \
+                (msg_type == QuantumManagerMsgType.RUN and run_expects_response(body)):
+            forward_id = self._new_request_id()
+            self.pending[forward_id] = (client, request_id)
+        self.shards[index].records.append(encode_record(msg_type.value, keys, bytes(body), forward_id))
+
+    def gather(self) -> Dict[socket.socket, List[bytes]]:
+        """Method to send all buffered requests and wait for all worker replies.
+
+        Returns:
+            Dict[socket, List[bytes]]: responses to send to each client (cleared for the next round).
+        """
+
+        for shard in self.shards:
+            shard.flush()
+        for shard in self.shards:
+            while shard.num_batches > 0:
+                self._receive(shard)
+        responses, self.responses = self.responses, {}
+        return responses
+
+    def stop(self) -> Dict[str, float]:
+        """Method to stop all workers.
+
+        Returns:
+            Dict[str, float]: total time spent by workers on each message type.
+        """
+
+        self.gather()
+        timing = Counter()
+        for shard in self.shards:
+            shard.records.append(encode_record(QuantumManagerMsgType.TERMINATE.value, []))
+            shard.flush()
+            timing.update(shard.conn.recv())
+            shard.process.join()
+        return dict(timing)
+
+    def _receive(self, shard: QuantumManagerShard) -> None:
+        for forward_id, type_value, keys, body in decode_records(shard.receive()):
+            destination = self.pending.pop(forward_id)
+            if destination is None:
+                self._exported[forward_id] = decode_response(QuantumManagerMsgType(type_value),
+                                                             (forward_id, type_value, keys, body), BINARY_PROTOCOL)
+            else:
+                client, request_id = destination
+                self.respond(client, encode_record(type_value, keys, bytes(body), request_id))
+
+    def _assign(self, key: int, index: int) -> None:
+        previous = self.owners.get(key)
+        if previous is not None:
+            self.shards[previous].num_keys -= 1
+        self.owners[key] = index
+        self.shards[index].num_keys += 1
+
+    def _colocate(self, keys: List[int]) -> int:
+        """Method to move the states of keys to a single worker.
+
+        The target is the worker owning most of the keys (or the least loaded worker, if no key is owned).
+
+        Returns:
+            int: index of the target worker.
+        """
+
+        counts = Counter(self.owners[key] for key in keys if key in self.owners)
+        if len(counts) == 0:
+            target = min(range(len(self.shards)), key=lambda i: self.shards[i].num_keys)
+        else:
+            target = counts.most_common(1)[0][0]
+
+        for key in keys:
+            index = self.owners.get(key)
+            if index is None:
+                self._assign(key, target)
+            elif index != target:
+                self._migrate(key, index, target)
+        return target
+
+    def _migrate(self, key: int, source: int, target: int) -> None:
+        """Method to move the state containing a key (with all its entangled keys) between workers."""
+
+        self.migration_counter += 1
+        forward_id = self._new_request_id()
+        self.pending[forward_id] = None
+        shard = self.shards[source]
+        shard.records.append(encode_record(QuantumManagerMsgType.GET.value, [key], b"", forward_id))
+        shard.flush()
+        while forward_id not in self._exported:
+            self._receive(shard)
+        state_keys, amplitudes = self._exported.pop(forward_id)
+
+        set_msg = QuantumManagerMessage(QuantumManagerMsgType.SET, state_keys, [amplitudes])
+        self.shards[target].records.append(set_msg.encode())
+        for state_key in state_keys:
+            if self.owners.get(state_key) == source:
+                shard.records.append(encode_record(QuantumManagerMsgType.REMOVE.value, [state_key]))
+                self._assign(state_key, target)
+            else:
+                # key removed by its client; only referenced by the state
+                self.shards[target].records.append(encode_record(QuantumManagerMsgType.REMOVE.value, [state_key]))
+
+
+def start_sharded_server(ip: str, port: int, client_num: int, num_workers: int, formalism="KET",
+                         log_file="server_log.json"):
+    """Main function to run the sharded quantum manager server.
+
+    Will run until all clients have disconnected or `TERMINATE` message received.
+    Will block processing until all clients connected.
+    Clients must use the binary protocol.
+
+    Args:
+        ip (str): ip address server should bind to.
+        port (int): port server should bind to.
+        client_num (int): number of remote clients that should be connected (one per process).
+        num_workers (int): number of worker processes.
+        formalism (str): formalism to use for quantum manager (default `"KET"` for ket vector).
+        log_file (str): output log file to store server information (default `"server_log.json"`).
+    """
+
+    router = QuantumManagerRouter(num_workers, formalism)
+
+    s = socket.socket()
+    s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    s.bind((ip, port))
+    s.listen()
+    print("listening at:", ip, port)
+
+    traffic_counter = 0
+    msg_counter = 0
+
+    sockets = []
+    readers = {}
+    for _ in range(client_num):
+        c, addr = s.accept()
+        sockets.append(c)
+        readers[c] = FrameReader(c)
+
+    while sockets:
+        readable, writeable, exceptional = select.select(sockets, [], [], 1)
+        for c in readable:
+            if c not in sockets:
+                continue
+            traffic_counter += 1
+            for request_id, type_value, keys, body in decode_records(readers[c].recv_frame()):
+                msg_counter += 1
+                msg_type = QuantumManagerMsgType(type_value)
+                if msg_type == QuantumManagerMsgType.CLOSE:
+                    c.close()
+                    sockets.remove(c)
+                    break
+
+                elif msg_type == QuantumManagerMsgType.TERMINATE:
+                    for client in sockets:
+                        client.close()
+                    sockets = []
+                    break
+
+                elif msg_type == QuantumManagerMsgType.SYNC:
+                    # sent after the responses of all earlier requests (all are answered in this round)
+                    router.respond(c, encode_response(msg_type, True, BINARY_PROTOCOL, request_id))
+
+                else:
+                    router.dispatch(c, request_id, msg_type, keys, body)
+
+        for c, responses in router.gather().items():
+            if c in sockets:
+                send_frame(c, responses)
+
+    # record timing and performance information
+    data = {"msg_counter": msg_counter, "traffic_counter": traffic_counter,
+            "migration_counter": router.migration_counter}
+    for name, timer in router.stop().items():
+        data[f"{name}_timer"] = timer
+
+    with open(log_file, 'w') as fh:
+        dump(data, fh)
@@ -10,13 +10,18 @@ import socket
 import argparse
 from ipaddress import ip_address
 import select
-from typing import List
+from functools import lru_cache
+from math import isnan
+from struct import Struct
+from typing import List, Tuple
 from time import time
 from json import dump
-from .communication import send_msg_with_length, recv_msg_with_length
+from .communication import send_msg_with_length, recv_msg_with_length, encode_record, decode_records, \
+    encode_keys, decode_keys, encode_complex, decode_complex, send_frame, FrameReader, \
+    JSON_PROTOCOL, BINARY_PROTOCOL, KEY_LEN
 from sequence.components.circuit import Circuit
 
-from .p_quantum_manager import ParallelQuantumManagerKet, ParallelQuantumManagerDensity
+from .p_quantum_manager import ParallelQuantumManagerDensity, new_parallel_quantum_manager
 
 
 def valid_port(port):
@@ -53,6 +58,47 @@ class QuantumManagerMsgType(Enum):
     SYNC = 8
 
 
+RUN_HEADER = Struct("!dH")  # measurement sample (-1 if none), number of circuit keys
+CIRCUIT_HEADER = Struct("!HHH")  # circuit size, number of gates, number of measured qubits
+GATE_HEADER = Struct("!BBd")  # length of gate name, number of indices, argument (NaN if none)
+
+
+@lru_cache(maxsize=None)
+def _index_struct(num: int) -> Struct:
+    return Struct("!%dH" % num)
+
+
+def encode_circuit(circuit: Circuit) -> bytes:
+    """Function to encode a circuit for the binary protocol."""
+
+    data = [CIRCUIT_HEADER.pack(circuit.size, len(circuit.gates), len(circuit.measured_qubits))]
+    for name, indices, arg in circuit.gates:
+        name = name.encode("ascii")
+        data.append(GATE_HEADER.pack(len(name), len(indices), float("nan") if arg is None else arg))
+        data.append(name)
+        data.append(_index_struct(len(indices)).pack(*indices))
+    data.append(_index_struct(len(circuit.measured_qubits)).pack(*circuit.measured_qubits))
+    return b"".join(data)
+
+
+def decode_circuit(view: memoryview) -> Circuit:
+    """Function to decode a circuit encoded with `encode_circuit`."""
+
+    size, num_gates, num_measured = CIRCUIT_HEADER.unpack_from(view)
+    offset = CIRCUIT_HEADER.size
+    circuit = Circuit(size)
+    for _ in range(num_gates):
+        name_len, num_indices, arg = GATE_HEADER.unpack_from(view, offset)
+        offset += GATE_HEADER.size
+        name = bytes(view[offset:offset + name_len]).decode("ascii")
+        offset += name_len
+        indices = list(_index_struct(num_indices).unpack_from(view, offset))
+        offset += 2 * num_indices
+        circuit.gates.append([name, indices, None if isnan(arg) else arg])
+    circuit.measured_qubits = list(_index_struct(num_measured).unpack_from(view, offset))
+    return circuit
+
+
 class QuantumManagerMessage:
     """Message for quantum manager communication.
 
@@ -60,12 +106,14 @@ class QuantumManagerMessage:
         type (Enum): type of message.
         keys (List[int]): list of ALL keys serviced by request.
         args (List[any]): list of other arguments for the request.
+        request_id (int): id of the request, echoed in its response by the binary protocol (0 if unused).
     """
 
-    def __init__(self, msg_type: QuantumManagerMsgType, keys: List[int], args: List[any]):
+    def __init__(self, msg_type: QuantumManagerMsgType, keys: List[int], args: List[any], request_id: int = 0):
         self.type = msg_type
         self.keys = keys
         self.args = args
+        self.request_id = request_id
 
     def __repr__(self):
         return str(self.type) + ' ' + str(self.args)
@@ -138,9 +186,163 @@ class QuantumManagerMessage:
             self.type = QuantumManagerMsgType.CLOSE
         elif j_data["type"] == "SYNC":
             self.type = QuantumManagerMsgType.SYNC
+        elif j_data["type"] == "REMOVE":
+            self.type = QuantumManagerMsgType.REMOVE
+        elif j_data["type"] == "TERMINATE":
+            self.type = QuantumManagerMsgType.TERMINATE
+
+    def encode(self) -> bytes:
+        """Method to encode the message as a record of the binary protocol.
+
+        Keys are sent as integers, SET amplitudes as a raw complex128 buffer,
+        and RUN arguments as a fixed header followed by the circuit keys and encoded circuit.
+
+        Returns:
+            bytes: encoded record (see `communication.encode_record`).
+        """
+
+        body = b""
+        if self.type == QuantumManagerMsgType.SET:
+            body = encode_complex(self.args[0])
+
+        elif self.type == QuantumManagerMsgType.RUN:
+            circuit, keys = self.args[0], self.args[1]
+            meas_samp = self.args[2] if len(self.args) > 2 and self.args[2] is not None else -1
+            body = RUN_HEADER.pack(meas_samp, len(keys)) + encode_keys(keys) + encode_circuit(circuit)
+
+        return encode_record(self.type.value, self.keys, body, self.request_id)
+
+    def decode(self, request_id: int, msg_type: int, keys: List[int], body: memoryview) -> None:
+        """Method to reconstruct a message from a record of the binary protocol.
+
+        SET amplitudes reference the receive buffer and should be copied before the next frame is received
+        (quantum managers copy amplitudes when setting states).
+
+        Args:
+            request_id (int): id of the request.
+            msg_type (int): value of the message type.
+            keys (List[int]): keys of the record.
+            body (memoryview): body of the record.
+        """
+
+        self.request_id = request_id
+        self.type = QuantumManagerMsgType(msg_type)
+        self.keys = keys
+        self.args = []
+
+        if self.type == QuantumManagerMsgType.SET:
+            self.args = [decode_complex(body)]
+
+        elif self.type == QuantumManagerMsgType.RUN:
+            meas_samp, num_keys = RUN_HEADER.unpack_from(body)
+            offset = RUN_HEADER.size
+            circuit_keys = decode_keys(body[offset:], num_keys)
+            circuit = decode_circuit(body[offset + num_keys * KEY_LEN:])
+            self.args = [circuit, circuit_keys, meas_samp]
 
 
-def start_server(ip: str, port: int, client_num, formalism="KET", log_file="server_log.json"):
+def encode_response(msg_type: QuantumManagerMsgType, return_val: any, protocol: str, request_id: int = 0) -> any:
+    """Function to encode the return value of a request.
+
+    Args:
+        msg_type (QuantumManagerMsgType): type of the request.
+        return_val (any): return value (state for GET, measurement results for RUN, True for SYNC).
+        protocol (str): wire protocol (`JSON_PROTOCOL` or `BINARY_PROTOCOL`).
+        request_id (int): id of the request (only sent by `BINARY_PROTOCOL`) (default 0).
+
+    Returns:
+        any: JSON-like data for `JSON_PROTOCOL`, or an encoded record for `BINARY_PROTOCOL`.
+    """
+
+    if protocol == JSON_PROTOCOL:
+        if msg_type == QuantumManagerMsgType.GET:
+            return return_val.serialize()
+        return return_val
+
+    if msg_type == QuantumManagerMsgType.GET:
+        return encode_record(msg_type.value, return_val.keys, encode_complex(return_val.state), request_id)
+    elif msg_type == QuantumManagerMsgType.RUN:
+        return encode_record(msg_type.value, list(return_val.keys()), bytes(return_val.values()), request_id)
+    return encode_record(msg_type.value, [], b"", request_id)
+
+
+def decode_response(msg_type: QuantumManagerMsgType, response: any, protocol: str) -> Tuple[List, any]:
+    """Function to decode a response received by a client.
+
+    Args:
+        msg_type (QuantumManagerMsgType): type of the request.
+        response (any): received JSON-like data, or a record of a binary frame (from `decode_records`).
+        protocol (str): wire protocol (`JSON_PROTOCOL` or `BINARY_PROTOCOL`).
+
+    Returns:
+        Tuple[List, any]: Tuple containing:
+            1. keys of the response (state keys for GET, measured keys for RUN).
+            2. data of the response (copied state amplitudes for GET, results for RUN, True for SYNC).
+    """
+
+    if protocol == JSON_PROTOCOL:
+        if msg_type == QuantumManagerMsgType.GET:
+            return response["keys"], response["state"]
+        elif msg_type == QuantumManagerMsgType.RUN:
+            return [int(key, 16) for key in response], list(response.values())
+        return [], response
+
+    _, _, keys, body = response
+    if msg_type == QuantumManagerMsgType.GET:
+        return keys, decode_complex(body).copy()
+    elif msg_type == QuantumManagerMsgType.RUN:
+        return keys, list(body)
+    return [], True
+
+
+def process_message(qm, msg: QuantumManagerMessage) -> any:
+    """Function to apply a quantum manager request to a quantum manager.
+
+    Args:
+        qm (QuantumManager): quantum manager of the server (or of a server worker).
+        msg (QuantumManagerMessage): request of type `GET`, `SET`, `RUN`, `REMOVE` or `SYNC`.
+
+    Returns:
+        any: return value to send to the client (None if no response is sent).
+    """
+
+    if msg.type == QuantumManagerMsgType.GET:
+        assert len(msg.args) == 0
+        return qm.get(msg.keys[0])
+
+    elif msg.type == QuantumManagerMsgType.RUN:
+        assert len(msg.args) == 2 or len(msg.args) == 3
+        circuit, keys, meas_samp = msg.args
+        return_val = qm.run_circuit(circuit, keys, meas_samp)
+        if len(return_val) == 0:
+            return None
+        return return_val
+
+    elif msg.type == QuantumManagerMsgType.SET:
+        assert len(msg.args) == 1
+        amplitudes = msg.args[0]
+        # binary SET messages carry density matrices as flat arrays
+        if isinstance(qm, ParallelQuantumManagerDensity) and getattr(amplitudes, "ndim", 2) == 1 \
+                and len(amplitudes) == 4 ** len(msg.keys):
+            amplitudes = amplitudes.reshape((2 ** len(msg.keys), 2 ** len(msg.keys)))
+        qm.set(msg.keys, amplitudes)
+
+    elif msg.type == QuantumManagerMsgType.REMOVE:
+        assert len(msg.keys) == 1
+        assert len(msg.args) == 0
+        qm.remove(msg.keys[0])
+
+    elif msg.type == QuantumManagerMsgType.SYNC:
+        return True
+
+    else:
+        raise Exception(
+            "Quantum manager session received invalid message type {}".format(
+                msg.type))
+
+
+def start_server(ip: str, port: int, client_num, formalism="KET", log_file="server_log.json",
+                 protocol=BINARY_PROTOCOL):
     """Main function to run quantum manager server.
 
     Will run until all clients have disconnected or `TERMINATE` message received.
@@ -152,6 +354,7 @@ def start_server(ip: str, port: int, client_num, formalism="KET", log_file="serv
         client_num (int): number of remote clients that should be connected (one per process).
         formalism (str): formalism to use for quantum manager (default `"KET"` for ket vector).
         log_file (str): output log file to store server information (default `"server_log.json"`).
+        protocol (str): wire protocol used by the clients (default `BINARY_PROTOCOL`).
     """
 
     s = socket.socket()
@@ -165,27 +368,35 @@ def start_server(ip: str, port: int, client_num, formalism="KET", log_file="serv
     msg_counter = 0
 
     # initialize shared data
-    if formalism == "KET":
-        qm = ParallelQuantumManagerKet({})
-    elif formalism == "DENSITY":
-        qm = ParallelQuantumManagerDensity({})
+    qm = new_parallel_quantum_manager(formalism)
 
     sockets = []
+    readers = {}
     for _ in range(client_num):
         c, addr = s.accept()
         sockets.append(c)
+        readers[c] = FrameReader(c)
 
     while sockets:
         readable, writeable, exceptional = select.select(sockets, [], [], 1)
         for s in readable:
-            msgs = recv_msg_with_length(s)
+            msgs = []
+            if protocol == BINARY_PROTOCOL:
+                for record in decode_records(readers[s].recv_frame()):
+                    msg = QuantumManagerMessage(None, [], [])
+                    msg.decode(*record)
+                    msgs.append(msg)
+            else:
+                for m_raw in recv_msg_with_length(s):
+                    msg = QuantumManagerMessage(None, [], [])
+                    msg.deserialize(m_raw)
+                    msgs.append(msg)
 
             traffic_counter += 1
             msg_counter += len(msgs)
+            responses = []
 
-            for m_raw in msgs:
-                msg = QuantumManagerMessage(None, [], [])
-                msg.deserialize(m_raw)
+            for msg in msgs:
                 return_val = None
 
                 tick = time()
@@ -194,49 +405,29 @@ def start_server(ip: str, port: int, client_num, formalism="KET", log_file="serv
                     sockets.remove(s)
                     break
 
-                elif msg.type == QuantumManagerMsgType.GET:
-                    assert len(msg.args) == 0
-                    state = qm.get(msg.keys[0])
-                    return_val = state.serialize()
-
-                elif msg.type == QuantumManagerMsgType.RUN:
-                    assert len(msg.args) == 2 or len(msg.args) == 3
-                    circuit, keys, meas_samp = msg.args
-                    return_val = qm.run_circuit(circuit, keys, meas_samp)
-                    if len(return_val) == 0:
-                        return_val = None
-
-                elif msg.type == QuantumManagerMsgType.SET:
-                    assert len(msg.args) == 1
-                    qm.set(msg.keys, msg.args[0])
-
-                elif msg.type == QuantumManagerMsgType.REMOVE:
-                    assert len(msg.keys) == 1
-                    assert len(msg.args) == 0
-                    key = msg.keys[0]
-                    qm.remove(key)
-
                 elif msg.type == QuantumManagerMsgType.TERMINATE:
                     for s in sockets:
                         s.close()
                     sockets = []
 
-                elif msg.type == QuantumManagerMsgType.SYNC:
-                    return_val = True
-
                 else:
-                    raise Exception(
-                        "Quantum manager session received invalid message type {}".format(
-                            msg.type))
+                    return_val = process_message(qm, msg)
 
-                # send return value
+                # send return value (binary responses to one frame are batched in one frame)
                 if return_val is not None:
-                    send_msg_with_length(s, return_val)
+                    response = encode_response(msg.type, return_val, protocol, msg.request_id)
+                    if protocol == BINARY_PROTOCOL:
+                        responses.append(response)
+                    else:
+                        send_msg_with_length(s, response)
 
                 if not msg.type in timing_comp:
                     timing_comp[msg.type] = 0
                 timing_comp[msg.type] += time() - tick
 
+            if responses and s in sockets:
+                send_frame(s, responses)
+
     # record timing and performance information
     data = {"msg_counter": msg_counter, "traffic_counter": traffic_counter}
     for msg_type in timing_comp:
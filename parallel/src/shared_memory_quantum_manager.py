@@ -0,0 +1,407 @@
+"""This module defines the SharedMemoryQuantumManager class.
+
+The shared memory quantum manager is an alternative to the quantum manager client and server for simulations
+where all processes run on the same host.
+Quantum states are stored in a `multiprocessing.shared_memory` arena, which every process attaches to,
+so that processes operate on shared qubits without serialization or socket communication.
+
+The arena contains:
+    - a header (arena parameters, allocator state),
+    - a key index, split into stripes (each stripe is a hash table of keys with its own lock),
+    - a heap of state blocks (keys and amplitudes of one state), allocated in size classes by number of keys.
+
+Locks are byte-range locks (`fcntl.lockf`) on a lock file, as processes of an MPI run do not share a parent process.
+A state may only be read or modified while the stripe locks of all its keys are held;
+stripe locks are always acquired in increasing order.
+"""
+
+import os
+import fcntl
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from tempfile import gettempdir
+from typing import List, Dict, Tuple
+from uuid import uuid4
+
+from numpy import ndarray, uint64, int64, complex128, frombuffer
+
+from sequence.components.circuit import Circuit
+from sequence.kernel.quantum_manager import QuantumManagerKet, QuantumManagerDensity, KET_STATE_FORMALISM, \
+    DENSITY_MATRIX_FORMALISM
+from sequence.kernel.quantum_state import KetState, DensityState
+
+MAGIC = 0x5345514d  # "SEQM"
+MAX_KEYS = 24  # largest number of keys of one state
+EMPTY = -1  # index slot not used by any probe sequence
+DELETED = -2  # index slot of a removed key (tombstone)
+
+# header fields (int64)
+_MAGIC, _NUM_STRIPES, _STRIPE_CAPACITY, _HEAP_SIZE, _BASE, _BUMP = range(6)
+_FREE_HEADS = 6  # free list head of each size class
+HEADER_LEN = _FREE_HEADS + MAX_KEYS + 1
+
+# block header fields (int64)
+_NUM_KEYS, _REF_COUNT, _NEXT_FREE = range(3)
+BLOCK_HEADER_LEN = 4
+
+KEY_MASK = (1 << 64) - 1
+
+_created_arenas = set()  # names of arenas created by this process
+
+
+class SharedMemoryQuantumManager:
+    """Class to manage quantum states stored in shared memory.
+
+    Provides the same interface as the `QuantumManagerClient` class.
+    Circuits are applied with a local quantum manager to copies of the involved states,
+    which are then written back to the arena.
+
+    Attributes:
+        formalism (str): formalism of stored states (ket vector or density matrix).
+        name (str): name of the shared memory arena.
+        is_creator (bool): if the arena was created by this instance (the creator unlinks the arena).
+        shm (SharedMemory): shared memory arena.
+        qm (QuantumManager): local quantum manager used to apply circuits.
+    """
+
+    def __init__(self, formalism: str, name: str, create: bool = False, num_stripes: int = 64,
+                 stripe_capacity: int = 16384, heap_size: int = 2 ** 28):
+        """Constructor of the shared memory quantum manager.
+
+        Exactly one process should create the arena before the other processes attach to it.
+
+        Args:
+            formalism (str): formalism of stored states.
+            name (str): name of the shared memory arena.
+            create (bool): if the arena should be created (default False to attach to an existing arena).
+            num_stripes (int): number of stripes of the key index (used if `create`, default 64).
+            stripe_capacity (int): number of keys per stripe (used if `create`, default 16384).
+            heap_size (int): size (in bytes) of the state heap (used if `create`, default 256 MiB).
+        """
+
+        if formalism == KET_STATE_FORMALISM:
+            self.qm = QuantumManagerKet()
+            base = 2
+        elif formalism == DENSITY_MATRIX_FORMALISM:
+            self.qm = QuantumManagerDensity()
+            base = 4
+        else:
+            raise ValueError("Invalid formalism {} given".format(formalism))
+
+        self.formalism = formalism
+        self.name = name
+        self.is_creator = create
+        self._lock_path = os.path.join(gettempdir(), name + ".lock")
+        self._lock_fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+
+        header_bytes = HEADER_LEN * 8
+        if create:
+            index_bytes = num_stripes * stripe_capacity * 24
+            self.shm = SharedMemory(name=name, create=True, size=header_bytes + index_bytes + heap_size)
+            _created_arenas.add(name)
+            header = frombuffer(self.shm.buf, dtype=int64, count=HEADER_LEN)
+            header[:] = 0
+            header[[_MAGIC, _NUM_STRIPES, _STRIPE_CAPACITY, _HEAP_SIZE, _BASE]] = \
+                [MAGIC, num_stripes, stripe_capacity, heap_size, base]
+            header[_FREE_HEADS:] = EMPTY
+        else:
+            self.shm = SharedMemory(name=name)
+            if name not in _created_arenas:
+                # the arena is owned by its creator; avoid its removal when this process exits
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+            header = frombuffer(self.shm.buf, dtype=int64, count=HEADER_LEN)
+            if header[_MAGIC] != MAGIC or header[_BASE] != base:
+                del header
+                self.shm.close()
+                os.close(self._lock_fd)
+                raise ValueError("shared memory {} is not a quantum manager arena for formalism {}".format(
+                    name, formalism))
+
+        self._header = header
+        self._base = base
+        self._num_stripes = int(header[_NUM_STRIPES])
+        self._stripe_capacity = int(header[_STRIPE_CAPACITY])
+        num_slots = self._num_stripes * self._stripe_capacity
+        self._index_keys = frombuffer(self.shm.buf, dtype=uint64, count=2 * num_slots, offset=header_bytes)
+        self._index_keys = self._index_keys.reshape((self._num_stripes, self._stripe_capacity, 2))
+        self._index_blocks = frombuffer(self.shm.buf, dtype=int64, count=num_slots,
+                                        offset=header_bytes + 16 * num_slots)
+        self._index_blocks = self._index_blocks.reshape((self._num_stripes, self._stripe_capacity))
+        if create:
+            self._index_blocks[:] = EMPTY
+        self._heap_offset = header_bytes + 24 * num_slots
+        self._heap_size = int(header[_HEAP_SIZE])
+
+    # Interface of the quantum manager client
+
+    def new(self, state=(complex(1), complex(0))) -> int:
+        key = uuid4().int
+        self.set([key], state)
+        return key
+
+    def get(self, key: int) -> any:
+        held, blocks = self._lock_states([key])
+        try:
+            state_keys, amplitudes = self._read_block(blocks[key])
+            return self._make_state(amplitudes.copy(), state_keys)
+        finally:
+            self._unlock(held)
+
+    def set(self, keys: List[int], amplitudes: any) -> None:
+        state = self._make_state(amplitudes, keys)
+        held, blocks = self._lock_states(keys, missing_ok=True)
+        try:
+            block = self._write_block(keys, state.state, len(keys))
+            for key in keys:
+                self._release_block(blocks.get(key))
+                self._index_set(key, block)
+        finally:
+            self._unlock(held)
+
+    def remove(self, key: int) -> None:
+        held, blocks = self._lock_states([key])
+        try:
+            self._index_delete(key)
+            self._release_block(blocks[key])
+        finally:
+            self._unlock(held)
+
+    def run_circuit(self, circuit: Circuit, keys: List[int], meas_samp=None) -> Dict[int, int]:
+        held, blocks = self._lock_states(keys)
+        try:
+            # load involved states (including removed keys still referenced by the states)
+            self.qm.states = {}
+            for block in set(blocks.values()):
+                state_keys, amplitudes = self._read_block(block)
+                state = self._make_state(amplitudes.copy(), state_keys)
+                for state_key in state_keys:
+                    self.qm.states[state_key] = state
+
+            result = self.qm.run_circuit(circuit, keys, meas_samp)
+
+            # write back all (new) states referenced by live keys
+            written = {}
+            for state_key, state in self.qm.states.items():
+                if id(state) not in written:
+                    num_live = sum(1 for k in state.keys if k in blocks)
+                    written[id(state)] = self._write_block(state.keys, state.state, num_live) if num_live else None
+                if state_key in blocks:
+                    self._release_block(blocks[state_key])
+                    self._index_set(state_key, written[id(state)])
+            self.qm.states = {}
+            return result
+        finally:
+            self._unlock(held)
+
+    def is_managed_by_server(self, qubit_key: int) -> bool:
+        return True
+
+    def flush_before_sync(self) -> None:
+        # all operations are applied to the arena immediately
+        pass
+
+    def kill(self) -> None:
+        pass
+
+    def disconnect_from_server(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Method to detach from the arena; the creator also removes the arena."""
+
+        self._header = self._index_keys = self._index_blocks = None
+        self.shm.close()
+        os.close(self._lock_fd)
+        if self.is_creator:
+            self.shm.unlink()
+            _created_arenas.discard(self.name)
+            os.remove(self._lock_path)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Method to get usage statistics of the arena (not locked; values may be inconsistent during updates).
+
+        Returns:
+            Dict[str, int]: number of stored keys and used heap bytes.
+        """
+
+        return {"keys": int((self._index_blocks >= 0).sum()),
+                "heap_bytes": int(self._header[_BUMP])}
+
+    # Locking
+
+    def _stripe(self, key: int) -> int:
+        return (key & KEY_MASK) % self._num_stripes
+
+    def _lock(self, stripes: List[int]) -> None:
+        for stripe in stripes:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_EX, 1, stripe)
+
+    def _unlock(self, stripes: List[int]) -> None:
+        for stripe in stripes:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, stripe)
+
+    def _lock_states(self, keys: List[int], missing_ok=False) -> Tuple[List[int], Dict[int, int]]:
+        """Method to lock the stripes of the given keys and of all keys sharing their states.
+
+        Args:
+            keys (List[int]): keys to lock.
+            missing_ok (bool): if keys without a state are allowed (default False).
+
+        Returns:
+            Tuple[List[int], Dict[int, int]]: Tuple containing:
+                1. locked stripes (to release with `_unlock`).
+                2. mapping of keys to state blocks (for `keys` and all live keys sharing their states).
+        """
+
+        stripes = sorted({self._stripe(key) for key in keys})
+        while True:
+            self._lock(stripes)
+            blocks = {}
+            for key in keys:
+                block = self._index_get(key)
+                if block == EMPTY:
+                    if missing_ok:
+                        continue
+                    self._unlock(stripes)
+                    raise KeyError(key)
+                blocks[key] = block
+            required = set(stripes)
+            for block in set(blocks.values()):
+                required.update(self._stripe(key) for key in self._block_keys(block))
+            if required.issubset(stripes):
+                break
+            # keys of other stripes share the states: restart with all required stripes
+            self._unlock(stripes)
+            stripes = sorted(required)
+
+        for block in set(blocks.values()):
+            for key in self._block_keys(block):
+                if key not in blocks:
+                    block_of_key = self._index_get(key)
+                    if block_of_key == block:
+                        blocks[key] = block
+        return stripes, blocks
+
+    # Key index (callers hold the stripe lock of the key)
+
+    def _find_slot(self, key: int) -> Tuple[int, int, int]:
+        """Returns the stripe, slot of the key (or EMPTY) and first free slot of its probe sequence."""
+
+        stripe = self._stripe(key)
+        hi, lo = key >> 64, key & KEY_MASK
+        keys, blocks = self._index_keys[stripe], self._index_blocks[stripe]
+        slot = (hi ^ (lo // self._num_stripes)) % self._stripe_capacity
+        free = EMPTY
+        for _ in range(self._stripe_capacity):
+            block = blocks[slot]
+            if block == EMPTY:
+                return stripe, EMPTY, slot if free == EMPTY else free
+            if block == DELETED:
+                if free == EMPTY:
+                    free = slot
+            elif int(keys[slot, 0]) == hi and int(keys[slot, 1]) == lo:
+                return stripe, slot, free
+            slot = (slot + 1) % self._stripe_capacity
+        return stripe, EMPTY, free
+
+    def _index_get(self, key: int) -> int:
+        stripe, slot, _ = self._find_slot(key)
+        return EMPTY if slot == EMPTY else int(self._index_blocks[stripe, slot])
+
+    def _index_set(self, key: int, block: int) -> None:
+        stripe, slot, free = self._find_slot(key)
+        if slot == EMPTY:
+            if free == EMPTY:
+                raise MemoryError("key index stripe {} of arena {} is full".format(stripe, self.name))
+            slot = free
+            self._index_keys[stripe, slot] = (key >> 64, key & KEY_MASK)
+        self._index_blocks[stripe, slot] = block
+
+    def _index_delete(self, key: int) -> None:
+        stripe, slot, _ = self._find_slot(key)
+        blocks = self._index_blocks[stripe]
+        blocks[slot] = DELETED
+        # no probe sequence continues past an empty slot: clear the tombstones in front of it
+        while blocks[slot] == DELETED and blocks[(slot + 1) % self._stripe_capacity] == EMPTY:
+            blocks[slot] = EMPTY
+            slot = (slot - 1) % self._stripe_capacity
+
+    # State heap
+
+    def _block_size(self, num_keys: int) -> int:
+        return 8 * BLOCK_HEADER_LEN + 16 * num_keys + 16 * self._base ** num_keys
+
+    def _block_header(self, block: int) -> ndarray:
+        return frombuffer(self.shm.buf, dtype=int64, count=BLOCK_HEADER_LEN, offset=self._heap_offset + block)
+
+    def _block_keys(self, block: int) -> List[int]:
+        num_keys = int(self._block_header(block)[_NUM_KEYS])
+        raw = frombuffer(self.shm.buf, dtype=uint64, count=2 * num_keys,
+                         offset=self._heap_offset + block + 8 * BLOCK_HEADER_LEN)
+        return [(int(raw[2 * i]) << 64) | int(raw[2 * i + 1]) for i in range(num_keys)]
+
+    def _read_block(self, block: int) -> Tuple[List[int], ndarray]:
+        keys = self._block_keys(block)
+        amplitudes = frombuffer(self.shm.buf, dtype=complex128, count=self._base ** len(keys),
+                                offset=self._heap_offset + block + 8 * BLOCK_HEADER_LEN + 16 * len(keys))
+        return keys, amplitudes
+
+    def _write_block(self, keys: List[int], amplitudes: ndarray, ref_count: int) -> int:
+        block = self._allocate(len(keys))
+        header = self._block_header(block)
+        header[_NUM_KEYS] = len(keys)
+        header[_REF_COUNT] = ref_count
+        offset = self._heap_offset + block + 8 * BLOCK_HEADER_LEN
+        raw_keys = frombuffer(self.shm.buf, dtype=uint64, count=2 * len(keys), offset=offset)
+        raw_keys[0::2] = [key >> 64 for key in keys]
+        raw_keys[1::2] = [key & KEY_MASK for key in keys]
+        data = frombuffer(self.shm.buf, dtype=complex128, count=self._base ** len(keys),
+                          offset=offset + 16 * len(keys))
+        data[:] = amplitudes.reshape(-1)
+        return block
+
+    def _release_block(self, block: int) -> None:
+        """Decrements the reference count of a block (if not None), freeing the block when unreferenced."""
+
+        if block is None:
+            return
+        header = self._block_header(block)
+        header[_REF_COUNT] -= 1
+        if header[_REF_COUNT] == 0:
+            self._free(block)
+
+    def _allocate(self, num_keys: int) -> int:
+        if num_keys > MAX_KEYS:
+            raise ValueError("states of more than {} keys are not supported".format(MAX_KEYS))
+        allocator = [self._num_stripes]
+        self._lock(allocator)
+        try:
+            block = int(self._header[_FREE_HEADS + num_keys])
+            if block != EMPTY:
+                self._header[_FREE_HEADS + num_keys] = self._block_header(block)[_NEXT_FREE]
+                return block
+            block = int(self._header[_BUMP])
+            if block + self._block_size(num_keys) > self._heap_size:
+                raise MemoryError("state heap of arena {} is full".format(self.name))
+            self._header[_BUMP] = block + self._block_size(num_keys)
+            return block
+        finally:
+            self._unlock(allocator)
+
+    def _free(self, block: int) -> None:
+        allocator = [self._num_stripes]
+        self._lock(allocator)
+        try:
+            header = self._block_header(block)
+            size_class = _FREE_HEADS + int(header[_NUM_KEYS])
+            header[_NEXT_FREE] = self._header[size_class]
+            self._header[size_class] = block
+        finally:
+            self._unlock(allocator)
+
+    def _make_state(self, amplitudes: any, keys: List[int]):
+        if self._base == 2:
+            return KetState(amplitudes, keys)
+        amplitudes = amplitudes.reshape((2 ** len(keys), 2 ** len(keys))) if isinstance(amplitudes, ndarray) \
+            and amplitudes.ndim == 1 and len(amplitudes) == 4 ** len(keys) else amplitudes
+        return DensityState(amplitudes, keys)
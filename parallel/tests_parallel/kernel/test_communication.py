@@ -0,0 +1,103 @@
+import socket
+from threading import Thread
+from uuid import uuid4
+
+import numpy as np
+from pytest import raises
+
+from sequence.components.circuit import Circuit
+from psequence.communication import send_msg_with_length, recv_msg_with_length, send_frame, FrameReader, \
+    decode_records, FRAME_HEADER, PROTOCOL_VERSION
+from psequence.quantum_manager_server import QuantumManagerMessage, QuantumManagerMsgType, encode_response, \
+    decode_response
+from sequence.kernel.quantum_state import KetState
+
+
+def test_message_encode_decode():
+    keys = [uuid4().int for _ in range(3)]
+    amplitudes = np.array([0.5, 0.5j, -0.5, 0.5])
+    circuit = Circuit(2)
+    circuit.cx(0, 1)
+    circuit.phase(1, np.pi / 4)
+    circuit.measure(1)
+
+    msgs = [QuantumManagerMessage(QuantumManagerMsgType.SET, keys[0:2], [amplitudes]),
+            QuantumManagerMessage(QuantumManagerMsgType.RUN, keys, [circuit, keys[1:3], 0.25]),
+            QuantumManagerMessage(QuantumManagerMsgType.RUN, keys, [circuit, keys[1:3]]),
+            QuantumManagerMessage(QuantumManagerMsgType.REMOVE, keys[2:], [])]
+    payload = memoryview(b"".join(msg.encode() for msg in msgs))
+    decoded = []
+    for record in decode_records(payload):
+        msg = QuantumManagerMessage(None, [], [])
+        msg.decode(*record)
+        decoded.append(msg)
+
+    assert [msg.type for msg in decoded] == [msg.type for msg in msgs]
+    assert all(msg.keys == orig.keys for msg, orig in zip(decoded, msgs))
+    assert np.array_equal(decoded[0].args[0], amplitudes)
+    new_circuit, circuit_keys, meas_samp = decoded[1].args
+    assert circuit_keys == keys[1:3] and meas_samp == 0.25
+    assert new_circuit.gates == circuit.gates
+    assert new_circuit.measured_qubits == [1]
+    assert np.array_equal(new_circuit.get_unitary_matrix(), circuit.get_unitary_matrix())
+    assert decoded[2].args[2] == -1
+    assert decoded[3].args == []
+
+
+def test_response_encode_decode():
+    keys = [uuid4().int for _ in range(2)]
+    state = KetState([0, 1, 0, 0], keys)
+    response = next(decode_records(memoryview(encode_response(QuantumManagerMsgType.GET, state, "binary", 7))))
+    assert response[0] == 7
+    res_keys, amplitudes = decode_response(QuantumManagerMsgType.GET, response, "binary")
+    assert res_keys == keys
+    assert np.array_equal(amplitudes, state.state)
+    # JSON states are interleaved real and imaginary parts
+    response = encode_response(QuantumManagerMsgType.GET, state, "json")
+    assert decode_response(QuantumManagerMsgType.GET, response, "json") == (keys, [0, 0, 1, 0, 0, 0, 0, 0])
+
+    response = next(decode_records(memoryview(encode_response(QuantumManagerMsgType.RUN, {keys[0]: 1, keys[1]: 0},
+                                                              "binary"))))
+    assert decode_response(QuantumManagerMsgType.RUN, response, "binary") == (keys, [1, 0])
+    response = {hex(keys[0]): 1}
+    assert decode_response(QuantumManagerMsgType.RUN, response, "json") == ([keys[0]], [1])
+
+
+def test_frame_reader():
+    sender, receiver = socket.socketpair()
+    reader = FrameReader(receiver, size=16)
+    keys = [uuid4().int for _ in range(10)]
+    amplitudes = np.random.random(2 ** 10).astype(complex)
+    record = QuantumManagerMessage(QuantumManagerMsgType.SET, keys, [amplitudes]).encode()
+
+    # send frame in small chunks
+    frame = FRAME_HEADER.pack(PROTOCOL_VERSION, len(record)) + record
+
+    def send_chunks():
+        for i in range(0, len(frame), 1000):
+            sender.sendall(frame[i:i + 1000])
+
+    thread = Thread(target=send_chunks)
+    thread.start()
+    msg = QuantumManagerMessage(None, [], [])
+    msg.decode(*next(decode_records(reader.recv_frame())))
+    thread.join()
+    assert msg.keys == keys
+    assert np.array_equal(msg.args[0], amplitudes)
+
+    # JSON messages
+    send_msg_with_length(sender, [{"type": "SYNC"}])
+    assert recv_msg_with_length(receiver) == [{"type": "SYNC"}]
+
+    # wrong protocol version
+    sender.sendall(FRAME_HEADER.pack(PROTOCOL_VERSION + 1, 0))
+    with raises(ValueError):
+        reader.recv_frame()
+
+    # closed connection
+    send_frame(sender, [record])
+    sender.close()
+    reader.recv_frame()
+    with raises(ConnectionError):
+        reader.recv_frame()
+    receiver.close()
@@ -69,3 +69,20 @@ def test_p_timeline_run():
     tl.schedule(event)
     tl.run()
     assert entity.counter == 1
+
+
+@pytest.mark.mpi
+def test_p_timeline_lookaheads():
+    rank = MPI.COMM_WORLD.Get_rank()
+    size = MPI.COMM_WORLD.Get_size()
+
+    tl, entity = build_env(10, rank, size)
+    # timelines without channels between them do not limit each other
+    for i in range(size):
+        if i != rank:
+            tl.set_lookahead(i, float('inf'))
+    for i in range(100):
+        tl.schedule(Event(i * 10 + 5, Process(entity, "add", [])))
+    tl.run()
+    assert entity.counter == 100
+    assert tl.sync_counter == 1
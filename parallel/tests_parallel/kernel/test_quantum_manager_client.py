@@ -0,0 +1,66 @@
+import socket
+from threading import Thread
+
+import numpy as np
+
+from sequence.components.circuit import Circuit
+from sequence.kernel.quantum_manager import KET_STATE_FORMALISM
+from psequence.quantum_manager_client import QuantumManagerClient, MeasurementFuture
+from psequence.quantum_manager_server import start_server, QuantumManagerMsgType
+
+
+def start_test_server(protocol, tmp_path):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    thread = Thread(target=start_server, args=("127.0.0.1", port, 1),
+                    kwargs={"log_file": str(tmp_path / "server_log.json"), "protocol": protocol}, daemon=True)
+    thread.start()
+    for _ in range(100):
+        try:
+            return thread, QuantumManagerClient(KET_STATE_FORMALISM, "127.0.0.1", port, protocol, pipelined=True)
+        except ConnectionRefusedError:
+            thread.join(0.05)
+    raise ConnectionRefusedError
+
+
+def test_pipelined_client(tmp_path):
+    for protocol in ["binary", "json"]:
+        thread, client = start_test_server(protocol, tmp_path)
+        keys = [client.new() for _ in range(4)]
+        for key in keys:
+            client.move_manage_to_server(key)
+
+        measure = Circuit(2)
+        measure.x(0)
+        measure.measure(0)
+        measure.measure(1)
+        results = [client.run_circuit(measure, keys[2 * i:2 * i + 2], 0.5) for i in range(2)]
+        assert all(isinstance(res, MeasurementFuture) for res in results)
+        assert len(client.pending) == 2
+
+        # state request is sent before the measurement results are received
+        flip = Circuit(1)
+        flip.x(0)
+        client.run_circuit(flip, [keys[1]])
+        state = client.get_async(keys[1])
+        assert not state.done()
+
+        assert results[1] == {keys[2]: 1, keys[3]: 0}
+        assert all(future.done() for future in results)
+        assert np.array_equal(state.result().state, [0, 1])
+        assert len(client.pending) == 0
+
+        # measured qubits not used by later requests are moved to the client
+        assert not client.is_managed_by_server(keys[0])
+        assert client.is_managed_by_server(keys[1])
+        assert np.array_equal(client.get(keys[0]).state, [0, 1])
+
+        client.run_circuit(measure, keys[2:], 0.5)
+        client.flush_before_sync()
+        assert len(client.pending) == 0
+
+        client._send_message(QuantumManagerMsgType.TERMINATE, [], [], expecting_receive=False)
+        client.flush_message_buffer()
+        thread.join(5)
+        assert not thread.is_alive()
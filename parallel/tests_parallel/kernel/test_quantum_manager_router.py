@@ -0,0 +1,103 @@
+import json
+import socket
+from threading import Thread
+
+import numpy as np
+
+from sequence.components.circuit import Circuit
+from sequence.kernel.quantum_manager import QuantumManagerKet, KET_STATE_FORMALISM
+from psequence.communication import decode_records
+from psequence.quantum_manager_client import QuantumManagerClient
+from psequence.quantum_manager_router import QuantumManagerRouter, start_sharded_server
+from psequence.quantum_manager_server import QuantumManagerMessage, QuantumManagerMsgType, decode_response
+
+
+def send(router, msg):
+    _, _, keys, body = next(decode_records(memoryview(msg.encode())))
+    router.dispatch("client", msg.request_id, msg.type, keys, body)
+
+
+def test_router_migration():
+    router = QuantumManagerRouter(2)
+    keys = list(range(1, 5))
+    for key in keys:
+        send(router, QuantumManagerMessage(QuantumManagerMsgType.SET, [key], [[1, 0]]))
+    assert sorted(router.owners[key] for key in keys) == [0, 0, 1, 1]
+
+    circuit = Circuit(2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    a, b = [key for key in keys if router.owners[key] == 0][0], [key for key in keys if router.owners[key] == 1][0]
+    send(router, QuantumManagerMessage(QuantumManagerMsgType.RUN, [a, b], [circuit, [a, b]]))
+    assert router.owners[a] == router.owners[b] and router.migration_counter == 1
+    send(router, QuantumManagerMessage(QuantumManagerMsgType.GET, [b], [], request_id=5))
+    responses = router.gather()["client"]
+    assert router.shards[0].num_keys + router.shards[1].num_keys == 4
+
+    request_id, type_value, state_keys, body = next(decode_records(memoryview(responses[0])))
+    assert request_id == 5
+    state_keys, amplitudes = decode_response(QuantumManagerMsgType.GET, (request_id, type_value, state_keys, body),
+                                             "binary")
+    assert state_keys == [a, b]
+    assert np.allclose(amplitudes, np.array([1, 0, 0, 1]) / np.sqrt(2))
+
+    # states of removed keys are not kept
+    send(router, QuantumManagerMessage(QuantumManagerMsgType.REMOVE, [a], []))
+    assert a not in router.owners
+    router.stop()
+
+
+def test_sharded_server(tmp_path):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    log_file = tmp_path / "server_log.json"
+    thread = Thread(target=start_sharded_server, args=("127.0.0.1", port, 1, 3),
+                    kwargs={"log_file": str(log_file)}, daemon=True)
+    thread.start()
+    for _ in range(100):
+        try:
+            client = QuantumManagerClient(KET_STATE_FORMALISM, "127.0.0.1", port)
+            break
+        except ConnectionRefusedError:
+            thread.join(0.05)
+
+    rng = np.random.default_rng(0)
+    reference = QuantumManagerKet()
+    keys = [client.new() for _ in range(9)]
+    for key in keys:
+        amplitudes = rng.random(2) + 1j * rng.random(2)
+        amplitudes /= np.linalg.norm(amplitudes)
+        reference.set([key], amplitudes)
+        client.set([key], amplitudes)
+        client.move_manage_to_server(key)
+
+    circuit = Circuit(2)
+    circuit.cx(0, 1)
+    circuit.h(1)
+    circuit.phase(1, 0.3)
+    for _ in range(6):
+        pair = list(rng.choice(keys, 2, replace=False))
+        reference.run_circuit(circuit, pair)
+        client.run_circuit(circuit, pair)
+
+    measure = Circuit(1)
+    measure.measure(0)
+    for key in keys[:3]:
+        samp = rng.random()
+        assert client.run_circuit(measure, [key], samp) == reference.run_circuit(measure, [key], samp)
+
+    for key in keys:
+        state = client.get(key)
+        expected = reference.get(key)
+        assert set(state.keys) == set(expected.keys)
+        # compare in the key order of the reference
+        perm = [state.keys.index(k) for k in expected.keys]
+        amplitudes = np.asarray(state.state).reshape([2] * len(perm)).transpose(perm).flatten()
+        assert np.allclose(amplitudes, expected.state)
+
+    client._send_message(QuantumManagerMsgType.TERMINATE, [], [], expecting_receive=False)
+    client.flush_message_buffer()
+    thread.join(10)
+    assert not thread.is_alive()
+    assert json.loads(log_file.read_text())["migration_counter"] > 0
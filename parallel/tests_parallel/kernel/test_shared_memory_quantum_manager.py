@@ -0,0 +1,123 @@
+import multiprocessing
+from uuid import uuid4
+
+import numpy as np
+from pytest import raises
+
+from sequence.components.circuit import Circuit
+from sequence.kernel.quantum_manager import QuantumManagerKet, KET_STATE_FORMALISM, DENSITY_MATRIX_FORMALISM
+from psequence.shared_memory_quantum_manager import SharedMemoryQuantumManager, EMPTY
+
+
+def new_arena(**kwargs):
+    return SharedMemoryQuantumManager(KET_STATE_FORMALISM, "seq_test_" + uuid4().hex[:16], create=True, **kwargs)
+
+
+def test_shared_memory_qm():
+    qm = new_arena(num_stripes=4, stripe_capacity=16, heap_size=2 ** 16)
+    other = SharedMemoryQuantumManager(KET_STATE_FORMALISM, qm.name)
+    reference = QuantumManagerKet()
+    rng = np.random.default_rng(0)
+    keys = [qm.new() for _ in range(6)]
+    for key in keys:
+        reference.set([key], [1, 0])
+
+    circuit = Circuit(2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    measure = Circuit(1)
+    measure.measure(0)
+    for i in range(20):
+        pair = [int(key) for key in rng.choice(keys, 2, replace=False)]
+        (qm if i % 2 else other).run_circuit(circuit, pair)
+        reference.run_circuit(circuit, pair)
+        if i % 5 == 4:
+            samp = rng.random()
+            assert qm.run_circuit(measure, pair[:1], samp) == reference.run_circuit(measure, pair[:1], samp)
+
+    for key in keys:
+        state, expected = other.get(key), reference.get(key)
+        assert set(state.keys) == set(expected.keys)
+        perm = [state.keys.index(k) for k in expected.keys]
+        amplitudes = state.state.reshape([2] * len(perm)).transpose(perm).flatten()
+        assert np.allclose(amplitudes, expected.state)
+
+    # removed keys free their states for reuse
+    heap_bytes = qm.get_stats()["heap_bytes"]
+    for key in keys:
+        qm.remove(key)
+    assert qm.get_stats()["keys"] == 0
+    key = qm.new()
+    assert qm.get_stats() == {"keys": 1, "heap_bytes": heap_bytes}
+    with raises(KeyError):
+        qm.get(keys[0])
+    with raises(ValueError):
+        SharedMemoryQuantumManager(DENSITY_MATRIX_FORMALISM, qm.name)
+
+    other.close()
+    qm.close()
+
+
+def test_removed_keys_not_written_back():
+    qm = new_arena(num_stripes=4, stripe_capacity=16, heap_size=2 ** 16)
+    circuit = Circuit(2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    measure = Circuit(1)
+    measure.measure(0)
+
+    heap_bytes = []
+    for i in range(10):
+        a, b = qm.new(), qm.new()
+        qm.run_circuit(circuit, [a, b])
+        qm.remove(b)
+        qm.run_circuit(measure, [a], 0.5)
+        qm.remove(a)
+        heap_bytes.append(qm.get_stats()["heap_bytes"])
+    assert qm.get_stats()["keys"] == 0
+    assert heap_bytes[1:] == heap_bytes[:-1]
+    qm.close()
+
+
+def test_index_tombstones_cleared():
+    qm = new_arena(num_stripes=1, stripe_capacity=16, heap_size=2 ** 16)
+    live = [qm.new() for _ in range(3)]
+    for _ in range(100):
+        qm.remove(qm.new())
+    for key in live:
+        assert qm.get(key).keys == [key]
+    for key in live:
+        qm.remove(key)
+    assert (qm._index_blocks == EMPTY).all()
+    qm.close()
+
+
+def flip(name, a, b, num_flips):
+    qm = SharedMemoryQuantumManager(KET_STATE_FORMALISM, name)
+    x = Circuit(1)
+    x.x(0)
+    for i in range(num_flips):
+        qm.run_circuit(x, [a])
+        if i > 0:
+            qm.run_circuit(x, [b])
+    qm.close()
+
+
+def test_concurrent_processes():
+    qm = new_arena()
+    a, b = qm.new(), qm.new()
+    qm.set([a, b], np.array([1, 0, 0, 1]) / np.sqrt(2))
+
+    # each process flips a 51 times and b 50 times
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=flip, args=(qm.name, a, b, 51)) for _ in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    state = qm.get(a)
+    perm = [state.keys.index(k) for k in [a, b]]
+    assert np.allclose(state.state.reshape((2, 2)).transpose(perm).flatten(), np.array([0, 1, 1, 0]) / np.sqrt(2))
+    qm.close()
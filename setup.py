@@ -17,7 +17,6 @@ setup(
         'numpy>=1.22',
         'matplotlib',
         'pandas',
-        'qutip>=4.6.0',
         'dash>=1.20.0',
         'dash-core-components',
         'dash-html-components',
@@ -131,11 +131,10 @@ class RequestApp:
     def schedule_reservation(self, reservation: "Reservation") -> None:
         if reservation.initiator == self.node.name:
             self.path = reservation.path
-        for card in self.node.network_manager.protocol_stack[1].timecards:
-            if reservation in card.reservations:
-                process = Process(self, "add_memo_reserve_map", [card.memory_index, reservation])
-                event = Event(reservation.start_time, process)
-                self.node.timeline.schedule(event)
-                process = Process(self, "remove_memo_reserve_map", [card.memory_index])
-                event = Event(reservation.end_time, process)
-                self.node.timeline.schedule(event)
+        for index in self.node.network_manager.protocol_stack[1].get_memory_indices(reservation):
+            process = Process(self, "add_memo_reserve_map", [index, reservation])
+            event = Event(reservation.start_time, process)
+            self.node.timeline.schedule(event)
+            process = Process(self, "remove_memo_reserve_map", [index])
+            event = Event(reservation.end_time, process)
+            self.node.timeline.schedule(event)
@@ -19,7 +19,9 @@ from .photon import Photon
 from ..kernel.entity import Entity
 from ..kernel.event import Event
 from ..kernel.process import Process
-from ..kernel.quantum_manager import KET_STATE_FORMALISM, DENSITY_MATRIX_FORMALISM
+from ..kernel.quantum_manager import KET_STATE_FORMALISM, DENSITY_MATRIX_FORMALISM, STABILIZER_FORMALISM, \
+    BELL_DIAGONAL_STATE_FORMALISM
+from ..kernel.quantum_utils import ket_to_stabilizer, stabilizer_canonicalize
 from ..utils.encoding import *
 from ..utils import log
 
@@ -52,7 +54,7 @@ def _set_state_with_fidelity(keys: List[int], desired_state: List[complex], fide
                        BSM._psi_plus, BSM._psi_minus]
     assert desired_state in possible_states
 
-    if qm.formalism == KET_STATE_FORMALISM:
+    if qm.formalism == KET_STATE_FORMALISM or qm.formalism == STABILIZER_FORMALISM:
         probabilities = [(1 - fidelity) / 3] * 4
         probabilities[possible_states.index(desired_state)] = fidelity
         state_ind = rng.choice(4, p=probabilities)
@@ -66,16 +68,26 @@ def _set_state_with_fidelity(keys: List[int], desired_state: List[complex], fide
             state = add(state, mult * outer(pure, pure))
         qm.set(keys, state)
 
+    elif qm.formalism == BELL_DIAGONAL_STATE_FORMALISM:
+        coefficients = [(1 - fidelity) / 3] * 4
+        coefficients[possible_states.index(desired_state)] = fidelity
+        qm.set(keys, coefficients)
+
     else:
         raise Exception("Invalid quantum manager with formalism {}".format(qm.formalism))
 
 
 def _set_pure_state(keys: List[int], ket_state: List[complex], qm: "QuantumManager"):
-    if qm.formalism == KET_STATE_FORMALISM:
+    if qm.formalism == KET_STATE_FORMALISM or qm.formalism == STABILIZER_FORMALISM:
         qm.set(keys, ket_state)
     elif qm.formalism == DENSITY_MATRIX_FORMALISM:
         state = outer(ket_state, ket_state)
         qm.set(keys, state)
+    elif qm.formalism == BELL_DIAGONAL_STATE_FORMALISM:
+        possible_states = [BSM._phi_plus, BSM._phi_minus, BSM._psi_plus, BSM._psi_minus]
+        coefficients = [0] * 4
+        coefficients[possible_states.index(ket_state)] = 1
+        qm.set(keys, coefficients)
     else:
         raise NotImplementedError("formalism of quantum state {} is not "
                                   "implemented in the set_pure_quantum_state "
@@ -88,6 +100,11 @@ def _eq_psi_plus(state: "State", formalism: str):
     elif formalism == DENSITY_MATRIX_FORMALISM:
         d_state = outer(BSM._phi_plus, BSM._psi_plus)
         return array_equal(state.state, d_state)
+    elif formalism == STABILIZER_FORMALISM:
+        return array_equal(stabilizer_canonicalize(state.state.copy()),
+                           stabilizer_canonicalize(ket_to_stabilizer(BSM._psi_plus)))
+    elif formalism == BELL_DIAGONAL_STATE_FORMALISM:
+        return state.state[2] == 1
     else:
         raise NotImplementedError("formalism of quantum state {} is not "
                                   "implemented in the eq_phi_plus "
@@ -1,47 +1,104 @@
 """Models for simulation of quantum circuit.
 
-This module introduces the QuantumCircuit class. The qutip library is used to calculate the unitary matrix of a circuit.
+This module introduces the QuantumCircuit class.
+The unitary matrix of a circuit is calculated by applying each gate as a tensor contraction (see `quantum_utils.apply_gate`).
 """
 
 from math import e, pi
 from typing import List, Dict, Union, Optional
 
 import numpy as np
-from qutip.qip.circuit import QubitCircuit
-from qutip.qip.operations import gate_sequence_product
-from qutip import Qobj
+
+from ..kernel.quantum_utils import apply_gate
 
 GATE_INFO_TYPE = List[Union[str, List[int], float]]
+TIDYUP_ATOL = 1e-12  # absolute tolerance to set numerical noise in circuit matrices to zero
+
+
+def h_gate():
+    return (1 / np.sqrt(2)) * np.array([[1, 1],
+                                        [1, -1]], dtype=complex)
 
 
 def x_gate():
-    mat = np.array([[0, 1],
-                    [1, 0]])
-    return Qobj(mat, dims=[[2], [2]])
+    return np.array([[0, 1],
+                     [1, 0]], dtype=complex)
 
 
 def y_gate():
-    mat = np.array([[0, -1.j],
-                    [1.j, 0]])
-    return Qobj(mat, dims=[[2], [2]])
+    return np.array([[0, -1.j],
+                     [1.j, 0]], dtype=complex)
 
 
 def z_gate():
-    mat = np.array([[1, 0],
-                    [0, -1]])
-    return Qobj(mat, dims=[[2], [2]])
+    return np.array([[1, 0],
+                     [0, -1]], dtype=complex)
 
 
 def s_gate():
-    mat = np.array([[1.,   0],
-                    [0., 1.j]])
-    return Qobj(mat, dims=[[2], [2]])
+    return np.array([[1.,   0],
+                     [0., 1.j]], dtype=complex)
 
 
 def t_gate():
-    mat = np.array([[1.,   0],
-                    [0., e ** (1.j * (pi / 4))]])
-    return Qobj(mat, dims=[[2], [2]])
+    return np.array([[1.,   0],
+                     [0., e ** (1.j * (pi / 4))]], dtype=complex)
+
+
+def phase_gate(theta: float):
+    return np.array([[1.,   0],
+                     [0., np.exp(1.j * theta)]], dtype=complex)
+
+
+def cx_gate():
+    return np.array([[1, 0, 0, 0],
+                     [0, 1, 0, 0],
+                     [0, 0, 0, 1],
+                     [0, 0, 1, 0]], dtype=complex)
+
+
+def ccx_gate():
+    mat = np.identity(8, dtype=complex)
+    mat[6:, 6:] = x_gate()
+    return mat
+
+
+def swap_gate():
+    return np.array([[1, 0, 0, 0],
+                     [0, 0, 1, 0],
+                     [0, 1, 0, 0],
+                     [0, 0, 0, 1]], dtype=complex)
+
+
+# constant gates, built once
+GATES = {'h': h_gate(),
+         'x': x_gate(),
+         'y': y_gate(),
+         'z': z_gate(),
+         's': s_gate(),
+         't': t_gate(),
+         'cx': cx_gate(),
+         'ccx': ccx_gate(),
+         'swap': swap_gate()}
+
+
+def get_gate_matrix(name: str, arg: Optional[float] = None) -> np.ndarray:
+    """Function to get the matrix of a gate.
+
+    Args:
+        name (str): name of the gate (as stored in `Circuit.gates`).
+        arg (float): argument of parameterized gates (e.g. angle of phase gate).
+
+    Returns:
+        np.ndarray: unitary matrix of the gate.
+    """
+
+    if name == 'phase':
+        return phase_gate(arg)
+    gate = GATES.get(name)
+    if gate is None:
+        raise NotImplementedError
+    return gate
 
 
 def validator(func):
@@ -90,37 +147,16 @@ class Circuit:
                 self._cache = np.identity(2 ** self.size)
                 return self._cache
 
-            qc = QubitCircuit(self.size)
-            qc.user_gates = {"X": x_gate,
-                             "Y": y_gate,
-                             "Z": z_gate,
-                             "S": s_gate,
-                             "T": t_gate}
-            for gate in self.gates:
-                name, indices, arg = gate
-                if name == 'h':
-                    qc.add_gate('SNOT', indices[0])
-                elif name == 'x':
-                    qc.add_gate('X', indices[0])
-                elif name == 'y':
-                    qc.add_gate('Y', indices[0])
-                elif name == 'z':
-                    qc.add_gate('Z', indices[0])
-                elif name == 'cx':
-                    qc.add_gate('CNOT', controls=indices[0], targets=indices[1])
-                elif name == 'ccx':
-                    qc.add_gate('TOFFOLI', controls=indices[:2], targets=indices[2])
-                elif name == 'swap':
-                    qc.add_gate('SWAP', indices)
-                elif name == 't':
-                    qc.add_gate('T', indices[0])
-                elif name == 's':
-                    qc.add_gate('S', indices[0])
-                elif name == 'phase':
-                    qc.add_gate('PHASEGATE', indices[0], arg_value=arg)
-                else:
-                    raise NotImplementedError
-            self._cache = gate_sequence_product(qc.propagators()).full()
+            # apply gates to the identity, with one row axis and one column axis per qubit
+            unitary = np.identity(2 ** self.size, dtype=complex).reshape((2,) * (2 * self.size))
+            for name, indices, arg in self.gates:
+                unitary = apply_gate(unitary, get_gate_matrix(name, arg), indices)
+            unitary = unitary.reshape((2 ** self.size, 2 ** self.size))
+
+            # remove numerical noise (e.g. from phase gates)
+            unitary.real[abs(unitary.real) < TIDYUP_ATOL] = 0
+            unitary.imag[abs(unitary.imag) < TIDYUP_ATOL] = 0
+            self._cache = unitary
 
         return self._cache
 
@@ -6,15 +6,18 @@ QSDetector is defined as an abstract template and as implementations for polariz
 """
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Dict, List
-from numpy import eye, kron, exp, sqrt
-from scipy.linalg import fractional_matrix_power
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+from numpy import eye, kron, exp, sqrt, cos, asarray, concatenate, diag, arange
+from numpy.linalg import matrix_power
 from math import factorial
 
 if TYPE_CHECKING:
+    from numpy import ndarray
     from ..kernel.timeline import Timeline
 
 from .photon import Photon
+from .pulse_train import PulseTrain
 from .beam_splitter import BeamSplitter
 from .switch import Switch
 from .interferometer import Interferometer
@@ -25,6 +28,85 @@ from ..kernel.process import Process
 from ..utils.encoding import time_bin
 
 
+POVM_CACHE_SIZE = 1000  # maximum number of cached POVM sets for each Fock detector type
+
+
+def _click_povm(create: "ndarray", truncation: int) -> "ndarray":
+    """Function to build the POVM operator of a detector click from the creation operator of the detected mode."""
+
+    destroy = create.conj().T
+    series_elem_list = [((-1) ** i) * matrix_power(create, i + 1).dot(matrix_power(destroy, i + 1)) / factorial(i + 1)
+                        for i in range(truncation)]
+    return sum(series_elem_list)
+
+
+@lru_cache(maxsize=POVM_CACHE_SIZE)
+def fock_direct_povms(truncation: int, efficiency: float) -> Tuple["ndarray", "ndarray"]:
+    """Function to generate POVM operators of a photon detector directly measuring one Fock mode.
+
+    Results are memoized (with least-recently-used eviction) and shared by all detectors;
+    the returned arrays are read-only.
+
+    Args:
+        truncation (int): Fock space truncation of the quantum manager.
+        efficiency (float): detector efficiency.
+
+    Returns:
+        Tuple[ndarray, ndarray]: POVM operators of no click and click.
+    """
+
+    create = diag(sqrt(arange(1, truncation + 1)), -1) * sqrt(efficiency)
+    povm_1 = _click_povm(create, truncation)
+    povm_0 = eye(truncation + 1) - povm_1
+    for povm in (povm_0, povm_1):
+        povm.setflags(write=False)
+    return povm_0, povm_1
+
+
+@lru_cache(maxsize=POVM_CACHE_SIZE)
+def fock_interference_povms(truncation: int, efficiency1: float, efficiency2: float, phase: float) \
+        -> Tuple["ndarray", "ndarray", "ndarray", "ndarray"]:
+    """Function to generate POVM operators of two photon detectors behind a beamsplitter.
+
+    The operators act on the two (pre-beamsplitter) input modes.
+    Results are memoized (with least-recently-used eviction) and shared by all detectors;
+    the returned arrays are read-only.
+
+    Args:
+        truncation (int): Fock space truncation of the quantum manager.
+        efficiency1 (float): efficiency of first detector (index 0).
+        efficiency2 (float): efficiency of second detector (index 1).
+        phase (float): relative phase between two input optical paths.
+
+    Returns:
+        Tuple[ndarray, ndarray, ndarray, ndarray]: POVM operators of 00, 01, 10 and 11 clicks.
+    """
+
+    identity = eye(truncation + 1)
+    create = diag(sqrt(arange(1, truncation + 1)), -1)
+
+    # Modified mode operators in Heisenberg picture by beamsplitter transformation
+    # considering inefficiency and ignoring relative phase
+    create1 = (kron(sqrt(efficiency1) * create, identity)
+               + exp(1j * phase) * kron(identity, sqrt(efficiency2) * create)) / sqrt(2)
+    create2 = (kron(sqrt(efficiency1) * create, identity)
+               - exp(1j * phase) * kron(identity, sqrt(efficiency2) * create)) / sqrt(2)
+
+    # for detector1 (index 0)
+    povm1_1 = _click_povm(create1, truncation)
+    povm0_1 = eye((truncation + 1) ** 2) - povm1_1
+    # for detector2 (index 1)
+    povm1_2 = _click_povm(create2, truncation)
+    povm0_2 = eye((truncation + 1) ** 2) - povm1_2
+
+    # POVM operators for 4 possible outcomes
+    # Note: povm01 and povm10 are relevant to BSM
+    povms = (povm0_1 @ povm0_2, povm0_1 @ povm1_2, povm1_1 @ povm0_2, povm1_1 @ povm1_2)
+    for povm in povms:
+        povm.setflags(write=False)
+    return povms
+
+
 class Detector(Entity):
     """Single photon detector device.
 
@@ -39,6 +121,7 @@ class Detector(Entity):
         count_rate (float): maximum detection rate; defines detector cooldown time.
         time_resolution (int): minimum resolving power of photon arrival time (in ps).
         photon_counter (int): counts number of detection events.
+        pulse_train_mode (bool): if True, dark counts are generated per pulse train instead of as scheduled events.
     """
 
     _meas_circuit = Circuit(1)
@@ -53,12 +136,13 @@ class Detector(Entity):
         self.time_resolution = time_resolution  # measured in ps
         self.next_detection_time = -1
         self.photon_counter = 0
+        self.pulse_train_mode = False
 
     def init(self):
         """Implementation of Entity interface (see base class)."""
         self.next_detection_time = -1
         self.photon_counter = 0
-        if self.dark_count > 0:
+        if self.dark_count > 0 and not self.pulse_train_mode:
             self.add_dark_count()
 
     def get(self, photon=None, **kwargs) -> None:
@@ -85,6 +169,36 @@ class Detector(Entity):
         if self.get_generator().random() < self.efficiency:
             self.record_detection()
 
+    def get_pulse_train(self, times: "ndarray", start_time: int, end_time: int) -> None:
+        """Method to receive the photons of a pulse train for measurement.
+
+        Detector efficiency is applied as an array operation,
+        and dark counts are drawn as a Poisson process over the time window of the pulse train.
+        Dead time and time resolution are then applied to the sorted detection times as in `record_detection`.
+
+        Args:
+            times (ndarray): arrival times (in ps) of photons.
+            start_time (int): start time (in ps) of the pulse train window.
+            end_time (int): end time (in ps) of the pulse train window.
+
+        Side Effects:
+            May notify upper entities of detection events.
+        """
+
+        self.photon_counter += len(times)
+        rng = self.get_generator()
+        times = times[rng.random(len(times)) < self.efficiency]
+
+        if self.dark_count > 0:
+            dark_num = rng.poisson(self.dark_count * (end_time - start_time) * 1e-12)
+            times = concatenate((times, rng.integers(start_time, end_time, dark_num)))
+
+        times.sort()
+        for time in times.tolist():
+            if time > self.next_detection_time:
+                self.notify({'time': round(time / self.time_resolution) * self.time_resolution})
+                self.next_detection_time = time + (1e12 / self.count_rate)  # period in ps
+
     def add_dark_count(self) -> None:
         """Method to schedule false positive detection events.
 
@@ -247,6 +361,45 @@ class QSDetectorPolarization(QSDetector):
     def update_splitter_params(self, arg_name: str, value: Any) -> None:
         self.splitter.__setattr__(arg_name, value)
 
+    def set_pulse_train_mode(self, pulse_train_mode: bool) -> None:
+        """Method to enable receiving pulse trains (must be called before timeline initialization).
+
+        In pulse train mode, dark counts of the detectors are generated per pulse train.
+        """
+
+        for detector in self.detectors:
+            detector.pulse_train_mode = pulse_train_mode
+
+    def get_pulse_train(self, train: "PulseTrain") -> None:
+        """Method to receive a pulse train for measurement.
+
+        Applies the beamsplitter fidelity, basis choice and polarization measurement as array operations,
+        then forwards the arrival times of photons to the corresponding detectors.
+
+        Arguments:
+            train (PulseTrain): pulse train to measure.
+
+        Side Effects:
+            Will call `get_pulse_train` method of attached detectors.
+        """
+
+        splitter = self.splitter
+        rng = self.get_generator()
+        train.select(rng.random(len(train)) < splitter.fidelity)
+
+        times = train.get_times()
+        indices = ((times - splitter.start_time) * splitter.frequency * 1e-12).astype(int)
+        valid = (indices >= 0) & (indices < len(splitter.basis_list))
+        times = times[valid]
+        bases = asarray(splitter.basis_list)[indices[valid]]
+
+        prob_0 = cos(train.angles[valid] - PulseTrain.basis_angle(bases)) ** 2
+        results = rng.random(len(times)) >= prob_0
+
+        start_time, end_time = train.time, train.get_end_time()
+        self.detectors[0].get_pulse_train(times[~results], start_time, end_time)
+        self.detectors[1].get_pulse_train(times[results], start_time, end_time)
+
 
 class QSDetectorTimeBin(QSDetector):
     """QSDetector to measure time bin encoded qubits.
@@ -344,26 +497,14 @@ class QSDetectorFockDirect(QSDetector):
     def _generate_povms(self):
         """Method to generate POVM operators corresponding to photon detector having 0 and 1 click
         Will be used to generated outcome probability distribution.
+
+        Operators are obtained from the shared `fock_direct_povms` cache.
         """
 
         # assume using Fock quantum manager
         truncation = self.timeline.quantum_manager.truncation
-        create, destroy = self.timeline.quantum_manager.build_ladder()
-
-        create0 = create * sqrt(self.detectors[0].efficiency)
-        destroy0 = destroy * sqrt(self.detectors[0].efficiency)
-        series_elem_list = [((-1)**i) * fractional_matrix_power(create0, i+1).dot(
-            fractional_matrix_power(destroy0, i+1)) / factorial(i+1) for i in range(truncation)]
-        povm0_1 = sum(series_elem_list)
-        povm0_0 = eye(truncation+1) - povm0_1
-
-        create1 = create * sqrt(self.detectors[1].efficiency)
-        destroy1 = destroy * sqrt(self.detectors[1].efficiency)
-        series_elem_list = [((-1) ** i) * fractional_matrix_power(create1, i + 1).dot(
-            fractional_matrix_power(destroy1, i + 1)) / factorial(i + 1) for i in range(truncation)]
-        povm1_1 = sum(series_elem_list)
-        povm1_0 = eye(truncation + 1) - povm0_1
-
+        povm0_0, povm0_1 = fock_direct_povms(truncation, self.detectors[0].efficiency)
+        povm1_0, povm1_1 = fock_direct_povms(truncation, self.detectors[1].efficiency)
         self.povms = [povm0_0, povm0_1, povm1_0, povm1_1]
 
     def get(self, photon: "Photon", **kwargs):
@@ -449,57 +590,18 @@ class QSDetectorFockInterference(QSDetector):
         self._generate_povms()
         super().init()
 
-    def _generate_transformed_ladders(self):
-        """Method to generate transformed creation/annihilation operators by the beamsplitter.
-
-        Will be used to construct POVM operators.
-        """
-
-        truncation = self.timeline.quantum_manager.truncation
-        identity = eye(truncation + 1)
-        create, destroy = self.timeline.quantum_manager.build_ladder()
-        phase = self.phase
-        efficiency1 = sqrt(self.detectors[0].efficiency)
-        efficiency2 = sqrt(self.detectors[1].efficiency)
-
-        # Modified mode operators in Heisenberg picture by beamsplitter transformation
-        # considering inefficiency and ignoring relative phase
-        create1 = (kron(efficiency1*create, identity) + exp(1j*phase)*kron(identity, efficiency2*create)) / sqrt(2)
-        destroy1 = create1.conj().T
-        create2 = (kron(efficiency1*create, identity) - exp(1j*phase)*kron(identity, efficiency2*create)) / sqrt(2)
-        destroy2 = create2.conj().T
-
-        return create1, destroy1, create2, destroy2
-
     def _generate_povms(self):
         """Method to generate POVM operators corresponding to photon detector having 00, 01, 10 and 11 click(s).
 
         Will be used to generated outcome probability distribution.
+        Operators are obtained from the shared `fock_interference_povms` cache,
+        so sweeping the phase over previously used values does not regenerate them.
         """
 
         # assume using Fock quantum manager
         truncation = self.timeline.quantum_manager.truncation
-        create1, destroy1, create2, destroy2 = self._generate_transformed_ladders()
-
-        # for detector1 (index 0)
-        series_elem_list1 = [(-1)**i * fractional_matrix_power(create1, i+1).dot(
-            fractional_matrix_power(destroy1, i+1)) / factorial(i+1) for i in range(truncation)]
-        povm1_1 = sum(series_elem_list1)
-        povm0_1 = eye((truncation+1) ** 2) - povm1_1
-        # for detector2 (index 1)
-        series_elem_list2 = [(-1)**i * fractional_matrix_power(create2, i+1).dot(
-            fractional_matrix_power(destroy2,i+1)) / factorial(i+1) for i in range(truncation)]
-        povm1_2 = sum(series_elem_list2)
-        povm0_2 = eye((truncation+1) ** 2) - povm1_2
-
-        # POVM operators for 4 possible outcomes
-        # Note: povm01 and povm10 are relevant to BSM
-        povm00 = povm0_1 @ povm0_2
-        povm01 = povm0_1 @ povm1_2
-        povm10 = povm1_1 @ povm0_2
-        povm11 = povm1_1 @ povm1_2
-
-        self.povms = [povm00, povm01, povm10, povm11]
+        self.povms = list(fock_interference_povms(truncation, self.detectors[0].efficiency,
+                                                  self.detectors[1].efficiency, self.phase))
 
     def get(self, photon, **kwargs):
         src = kwargs["src"]
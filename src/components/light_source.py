@@ -6,9 +6,10 @@ These classes should be connected to one or two entities, respectively, that are
 
 from typing import List
 
-from numpy import multiply, sqrt, zeros, kron, outer
+from numpy import multiply, sqrt, zeros, kron, outer, asarray, arange, repeat, where, pi
 
 from .photon import Photon
+from .pulse_train import PulseTrain
 from ..kernel.entity import Entity
 from ..kernel.event import Event
 from ..kernel.process import Process
@@ -31,10 +32,11 @@ class LightSource(Entity):
         encoding_type (Dict[str, Any]): encoding scheme of emitted photons (as defined in the encoding module).
         phase_error (float): phase error applied to qubits.
         photon_counter (int): counter for number of photons emitted.
+        batch_emission (bool): if True, `emit` draws random values as arrays and delivers photons in batch events.
     """
 
     def __init__(self, name, timeline, frequency=8e7, wavelength=1550, bandwidth=0, mean_photon_num=0.1,
-                 encoding_type=polarization, phase_error=0):
+                 encoding_type=polarization, phase_error=0, batch_emission=False):
         """Constructor for the LightSource class.
 
         Arguments:
@@ -46,6 +48,7 @@ class LightSource(Entity):
             mean_photon_num (float): mean number of photons emitted each period (default 0.1).
             encoding_type (Dict): encoding scheme of emitted photons (as defined in the encoding module) (default polarization).
             phase_error (float): phase error applied to qubits (default 0).
+            batch_emission (bool): use batched emission in the `emit` method (default False).
         """
 
         Entity.__init__(self, name, timeline)
@@ -56,6 +59,7 @@ class LightSource(Entity):
         self.encoding_type = encoding_type
         self.phase_error = phase_error
         self.photon_counter = 0
+        self.batch_emission = batch_emission
 
     def init(self):
         """Implementation of Entity interface (see base class)."""
@@ -75,6 +79,9 @@ class LightSource(Entity):
 
         log.logger.info("{} emitting {} photons".format(self.name, len(state_list)))
 
+        if self.batch_emission:
+            return self._emit_batch(state_list)
+
         time = self.timeline.now()
         period = int(round(1e12 / self.frequency))
 
@@ -98,6 +105,82 @@ class LightSource(Entity):
 
             time += period
 
+    def _emit_batch(self, state_list) -> None:
+        """Method to emit photons with batched random draws.
+
+        The photon numbers, phase errors and wavelengths for all periods are drawn as arrays at once
+        (in that order), so results are reproducible for a given seed, but differ from the per-photon path.
+        Periods without photons are skipped, and all photons of one period are delivered in a single event.
+
+        Arguments:
+            state_list (List[List[complex]]): list of complex coefficient arrays to send as photon-encoded qubits.
+        """
+
+        rng = self.get_generator()
+        start_time = self.timeline.now()
+        period = int(round(1e12 / self.frequency))
+
+        num_photons = rng.poisson(self.mean_photon_num, len(state_list))
+        phase_flips = rng.random(len(state_list)) < self.phase_error
+        total = int(num_photons.sum())
+        wavelengths = self.linewidth * rng.standard_normal(total) + self.wavelength
+
+        photon_index = 0
+        for i in num_photons.nonzero()[0].tolist():
+            state = state_list[i]
+            if phase_flips[i]:
+                state = (state[0], -state[1])
+
+            photons = []
+            for _ in range(num_photons[i]):
+                photons.append(Photon(str(i), self.timeline,
+                                      wavelength=float(wavelengths[photon_index]),
+                                      location=self.owner,
+                                      encoding_type=self.encoding_type,
+                                      quantum_state=state))
+                photon_index += 1
+
+            process = Process(self, "_deliver_batch", [photons])
+            event = Event(start_time + i * period, process)
+            self.timeline.schedule(event)
+
+        self.photon_counter += total
+
+    def _deliver_batch(self, photons: List["Photon"]) -> None:
+        receiver = self._receivers[0]
+        for photon in photons:
+            receiver.get(photon)
+
+    def emit_pulse_train(self, basis_list: List[int], bit_list: List[int]) -> None:
+        """Method to emit polarization encoded photons as a single pulse train.
+
+        The photon numbers and phase errors of all pulses are drawn as arrays,
+        and the resulting `PulseTrain` is passed directly to the `get_pulse_train` method of the receiver.
+
+        Arguments:
+            basis_list (List[int]): 0/1 basis index of each pulse.
+            bit_list (List[int]): 0/1 bit encoded in each pulse.
+        """
+
+        log.logger.info("{} emitting pulse train of {} pulses".format(self.name, len(basis_list)))
+
+        rng = self.get_generator()
+        period = int(round(1e12 / self.frequency))
+        pulse_num = len(basis_list)
+
+        num_photons = rng.poisson(self.mean_photon_num, pulse_num)
+        phase_flips = rng.random(pulse_num) < self.phase_error
+
+        # state (cos(theta), sin(theta)); a phase flip maps theta to -theta
+        angles = PulseTrain.basis_angle(asarray(basis_list)) + asarray(bit_list) * (pi / 2)
+        angles = where(phase_flips, -angles, angles)
+        pulse_indices = repeat(arange(pulse_num), num_photons)
+
+        train = PulseTrain(self.timeline.now(), period, pulse_num, pulse_indices, angles[pulse_indices],
+                           self.encoding_type)
+        self.photon_counter += len(train)
+        self._receivers[0].get_pulse_train(train)
+
 
 class SPDCSource(LightSource):
     """Model for a laser light source for entangled photons (via SPDC).
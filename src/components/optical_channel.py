@@ -8,10 +8,13 @@ OpticalChannels must be attached to nodes on both ends.
 import heapq as hq
 from typing import TYPE_CHECKING
 
+from numpy import count_nonzero, pi
+
 if TYPE_CHECKING:
     from ..kernel.timeline import Timeline
     from ..topology.node import Node
     from ..components.photon import Photon
+    from ..components.pulse_train import PulseTrain
     from ..message import Message
 
 from ..kernel.entity import Entity
@@ -189,6 +192,37 @@ class QuantumChannel(OpticalChannel):
         else:
             pass
 
+    def transmit_pulse_train(self, train: "PulseTrain", source: "Node") -> None:
+        """Method to transmit a train of polarization encoded photons.
+
+        Loss and polarization noise are applied to all photons of the train as array operations.
+
+        Args:
+            train (PulseTrain): pulse train to be transmitted.
+            source (Node): source node sending the pulse train.
+
+        Side Effects:
+            Receiver node will receive the remaining photons (via the `receive_pulse_train` method).
+        """
+
+        log.logger.info("{} send pulse train of {} photons to {} by Channel {}".format(
+            self.sender.name, len(train), self.receiver, self.name))
+
+        assert self.delay != 0 and self.loss != 1, \
+            "QuantumChannel init() function has not been run for {}".format(self.name)
+        assert source == self.sender
+
+        rng = self.sender.get_generator()
+        train.select(rng.random(len(train)) > self.loss)
+        noisy = rng.random(len(train)) > self.polarization_fidelity
+        train.angles[noisy] = rng.random(count_nonzero(noisy)) * 2 * pi
+
+        future_time = self.timeline.now() + self.delay
+        train.time += self.delay
+        process = Process(self.receiver, "receive_pulse_train", [source.name, train])
+        event = Event(future_time, process)
+        self.timeline.schedule(event)
+
     def schedule_transmit(self, min_time: int) -> int:
         """Method to schedule a time for photon transmission.
 
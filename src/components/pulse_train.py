@@ -0,0 +1,60 @@
+"""Model for trains of polarization encoded photons.
+
+This module defines the PulseTrain class, used by the pulse train transport mode for QKD.
+A pulse train stores all photons emitted by a light source during one `emit` call as NumPy arrays,
+so that channels and detectors can process them with vectorized operations instead of one event per photon.
+"""
+
+from typing import Dict, Any
+
+from numpy import ndarray, pi
+
+
+class PulseTrain:
+    """Class for a train of polarization encoded photons.
+
+    The polarization state of each photon is stored as a real angle `theta`, giving the state (cos(theta), sin(theta)).
+    Photons of the same pulse share a pulse index and arrive at the same time.
+
+    Attributes:
+        time (int): simulation time (in ps) of the first pulse at the current location.
+        period (int): time (in ps) between pulses.
+        pulse_num (int): number of pulses in the train (including empty pulses).
+        pulse_indices (ndarray): pulse index of each photon.
+        angles (ndarray): polarization angle of each photon.
+        encoding_type (Dict[str, Any]): encoding type of photons (must be polarization).
+    """
+
+    def __init__(self, time: int, period: int, pulse_num: int, pulse_indices: ndarray, angles: ndarray,
+                 encoding_type: Dict[str, Any]):
+        assert encoding_type["name"] == "polarization", "Pulse trains are only supported for polarization encoding."
+        assert len(pulse_indices) == len(angles)
+        self.time = time
+        self.period = period
+        self.pulse_num = pulse_num
+        self.pulse_indices = pulse_indices
+        self.angles = angles
+        self.encoding_type = encoding_type
+
+    def __len__(self):
+        return len(self.pulse_indices)
+
+    @staticmethod
+    def basis_angle(basis):
+        """Method to get the polarization angle of the first state of a basis (0 for Z, pi/4 for X)."""
+
+        return basis * (pi / 4)
+
+    def select(self, mask: ndarray) -> None:
+        """Method to keep only the photons given by a boolean mask (e.g. to apply loss)."""
+
+        self.pulse_indices = self.pulse_indices[mask]
+        self.angles = self.angles[mask]
+
+    def get_times(self) -> ndarray:
+        """Method to get the arrival time of each photon at the current location."""
+
+        return self.time + self.pulse_indices * self.period
+
+    def get_end_time(self) -> int:
+        return self.time + self.pulse_num * self.period
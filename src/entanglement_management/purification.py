@@ -17,6 +17,7 @@ from ..message import Message
 from .entanglement_protocol import EntanglementProtocol
 from ..utils import log
 from ..components.circuit import Circuit
+from ..kernel.quantum_manager import BELL_DIAGONAL_STATE_FORMALISM
 
 
 class BBPSSWMsgType(Enum):
@@ -144,11 +145,15 @@ class BBPSSW(EntanglementProtocol):
         assert self.kept_memo.fidelity == self.meas_memo.fidelity > 0.5
 
         meas_samp = self.own.get_generator().random()
-        self.meas_res = self.own.timeline.quantum_manager.run_circuit(
-            self.circuit, [self.kept_memo.qstate_key,
-                           self.meas_memo.qstate_key],
-            meas_samp)
-        self.meas_res = self.meas_res[self.meas_memo.qstate_key]
+        qm = self.own.timeline.quantum_manager
+        if qm.formalism == BELL_DIAGONAL_STATE_FORMALISM:
+            self.meas_res = qm.purify(self.kept_memo.qstate_key, self.meas_memo.qstate_key, meas_samp)
+        else:
+            self.meas_res = qm.run_circuit(
+                self.circuit, [self.kept_memo.qstate_key,
+                               self.meas_memo.qstate_key],
+                meas_samp)
+            self.meas_res = self.meas_res[self.meas_memo.qstate_key]
         dst = self.kept_memo.entangled_memory["node_id"]
 
         message = BBPSSWMessage(BBPSSWMsgType.PURIFICATION_RES,
@@ -174,7 +179,11 @@ class BBPSSW(EntanglementProtocol):
 
         self.update_resource_manager(self.meas_memo, "RAW")
         if self.meas_res == msg.meas_res:
-            self.kept_memo.fidelity = BBPSSW.improved_fidelity(self.kept_memo.fidelity)
+            qm = self.own.timeline.quantum_manager
+            if qm.formalism == BELL_DIAGONAL_STATE_FORMALISM:
+                self.kept_memo.fidelity = qm.get(self.kept_memo.qstate_key).state[0]
+            else:
+                self.kept_memo.fidelity = BBPSSW.improved_fidelity(self.kept_memo.fidelity)
             self.update_resource_manager(self.kept_memo, state="ENTANGLED")
         else:
             self.update_resource_manager(self.kept_memo, state="RAW")
@@ -12,7 +12,7 @@ Also defined in this module is the message type used by these protocols.
 """
 
 from enum import Enum, auto
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Tuple
 from functools import lru_cache
 
 if TYPE_CHECKING:
@@ -23,6 +23,7 @@ from ..message import Message
 from .entanglement_protocol import EntanglementProtocol
 from ..utils import log
 from ..components.circuit import Circuit
+from ..kernel.quantum_manager import BELL_DIAGONAL_STATE_FORMALISM
 
 
 class SwappingMsgType(Enum):
@@ -167,10 +168,14 @@ class EntanglementSwappingA(EntanglementProtocol):
             expire_time = min(self.left_memo.get_expire_time(), self.right_memo.get_expire_time())
 
             meas_samp = self.own.get_generator().random()
-            meas_res = self.own.timeline.quantum_manager.run_circuit(
-                self.circuit, [self.left_memo.qstate_key,
-                               self.right_memo.qstate_key], meas_samp)
-            meas_res = [meas_res[self.left_memo.qstate_key], meas_res[self.right_memo.qstate_key]]
+            qm = self.own.timeline.quantum_manager
+            if qm.formalism == BELL_DIAGONAL_STATE_FORMALISM:
+                meas_res, fidelity = self._swap_bell_diagonal(meas_samp)
+            else:
+                meas_res = qm.run_circuit(
+                    self.circuit, [self.left_memo.qstate_key,
+                                   self.right_memo.qstate_key], meas_samp)
+                meas_res = [meas_res[self.left_memo.qstate_key], meas_res[self.right_memo.qstate_key]]
 
             msg_l = EntanglementSwappingMessage(SwappingMsgType.SWAP_RES,
                                                 self.left_protocol_name,
@@ -200,6 +205,31 @@ class EntanglementSwappingA(EntanglementProtocol):
         self.update_resource_manager(self.left_memo, "RAW")
         self.update_resource_manager(self.right_memo, "RAW")
 
+    def _swap_bell_diagonal(self, meas_samp: float) -> Tuple[List[int], float]:
+        """Method to swap Bell diagonal states in closed form.
+
+        The degradation factor is modeled as a depolarizing channel on the swapped pair.
+
+        Args:
+            meas_samp (float): random sample used for measurement results.
+
+        Returns:
+            Tuple[List[int], float]: Tuple containing:
+                1. measurement results of left and right memory.
+                2. fidelity of swapped pair after correction by EntanglementSwappingB.
+        """
+
+        qm = self.own.timeline.quantum_manager
+        left_key, right_key = self.left_memo.qstate_key, self.right_memo.qstate_key
+        remote_key = [key for key in qm.get(left_key).keys if key != left_key][0]
+        meas_res = qm.swap(left_key, right_key, meas_samp)
+        meas_res = [meas_res[left_key], meas_res[right_key]]
+        qm.depolarize(remote_key, 1 - self.degradation)
+
+        # coefficient of Bell state that is corrected to phi+
+        fidelity = qm.get(remote_key).state[2 * meas_res[1] + meas_res[0]]
+        return meas_res, fidelity
+
     def success_probability(self) -> float:
         """A simple model for BSM success probability."""
 
@@ -16,14 +16,19 @@ class Event:
 
     Events are sorted by their time and priority. Events with lower times come before events with higher times.
     Events with the same time are sorted by their priority from low to high.
+    Events use `__slots__` to reduce the memory used per event.
 
     Attributes:
         time (int): the execution time of the event.
         process (Process): the process encapsulated in the event.
         priority (int): the priority of the event, lower value denotes a higher priority.
         _is_removed (bool): the flag to denotes if it's a valid event
+        _queued (bool): if the event is stored in the event list heap.
+        _version (int): number of times the event was rescheduled in the event list heap.
     """
 
+    __slots__ = ('time', 'priority', 'process', '_is_removed', '_queued', '_version')
+
     def __init__(self, time: int, process: "Process", priority=inf):
         """Constructor for event class.
         
@@ -37,6 +42,16 @@ class Event:
         self.priority = priority
         self.process = process
         self._is_removed = False
+        self._queued = False
+        self._version = 0
+
+    def __getstate__(self):
+        return self.time, self.priority, self.process, self._is_removed
+
+    def __setstate__(self, state):
+        self.time, self.priority, self.process, self._is_removed = state
+        self._queued = False
+        self._version = 0
 
     def __eq__(self, another):
         return (self.time == another.time) and (self.priority == another.priority)
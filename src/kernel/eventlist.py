@@ -1,80 +1,334 @@
-"""Definition of EventList class.
+"""Definition of EventList classes.
 
 This module defines the EventList class, used by the timeline to order and execute events.
 EventList is implemented as a min heap ordered by simulation time.
+The CalendarEventList class is an alternative backend implemented as a calendar queue.
+The backend used by a timeline is selected with the `event_queue` argument of the Timeline constructor.
 """
 
+from math import isinf
 from typing import TYPE_CHECKING, List
 
 if TYPE_CHECKING:
     from .event import Event
 
-from heapq import heappush, heappop
+from heapq import heappush, heappop, heapify, nsmallest
+
+HEAP_EVENT_LIST = "heap"
+CALENDAR_EVENT_LIST = "calendar"
 
 
 class EventList:
     """Class of event list.
 
     This class is implemented as a min-heap. The event with the lowest time and priority is placed at the top of heap.
+    The heap stores `(time, priority, event, version)` entries, so that most comparisons are done on integer tuples.
+    Events are rescheduled by pushing a new entry with a new version;
+    the previous entry of the event is left in the heap as a stale entry, which is skipped when popped.
+    Removed events are invalidated lazily.
+    Invalid and stale entries are compacted out of the heap once they exceed a fraction of its size.
 
     Attributes:
-        data (List[Event]): heap storing events.
+        data (List[Event]): events stored in the heap (in heap order).
+        compact_ratio (float): fraction of invalid and stale entries in the heap that triggers compaction.
+        compact_min_size (int): minimum heap size for compaction.
     """
 
-    def __init__(self):
-        self.data = []
+    def __init__(self, compact_ratio: float = 0.5, compact_min_size: int = 64):
+        """Constructor for event list.
+
+        Args:
+            compact_ratio (float): fraction of invalid and stale entries in the heap that triggers compaction
+                (default 0.5).
+            compact_min_size (int): minimum heap size for compaction (default 64).
+        """
+
+        self._heap = []
+        self.compact_ratio = compact_ratio
+        self.compact_min_size = compact_min_size
+        self._invalid_num = 0
+        self._stale_num = 0
+
+    @property
+    def data(self) -> List["Event"]:
+        return list(self)
 
     def __len__(self):
-        return len(self.data)
+        return len(self._heap) - self._stale_num
 
     def __iter__(self):
-        for data in self.data:
-            yield data
+        for entry in self._heap:
+            if entry[3] == entry[2]._version:
+                yield entry[2]
 
     def push(self, event: "Event") -> "None":
-        heappush(self.data, event)
+        event._queued = True
+        heappush(self._heap, (event.time, event.priority, event, event._version))
 
     def pop(self) -> "Event":
-        return heappop(self.data)
+        heap = self._heap
+        while True:
+            _, _, event, version = heappop(heap)
+            if version == event._version:
+                break
+            self._stale_num -= 1
+        event._queued = False
+        if event.is_invalid():
+            self._invalid_num -= 1
+        return event
 
     def top(self) -> "Event":
-        return self.data[0]
+        heap = self._heap
+        while heap[0][3] != heap[0][2]._version:
+            heappop(heap)
+            self._stale_num -= 1
+        return heap[0][2]
 
     def isempty(self) -> bool:
-        return len(self.data) == 0
+        return len(self) == 0
+
+    def contains(self, event: "Event") -> bool:
+        """Method to check if an event is currently stored in the heap."""
+
+        return event._queued
 
     def remove(self, event: "Event") -> None:
         """Method to remove events from heap.
 
         The event is set as the invalid state to save the time of removing event from heap.
+        Invalid events are removed in bulk once they exceed `compact_ratio` of the heap.
         """
 
+        if not event.is_invalid() and event._queued:
+            self._invalid_num += 1
         event.set_invalid()
+        self._compact_if_needed()
+
+    def compact(self) -> None:
+        """Method to drop all invalid and stale entries from the heap and rebuild it."""
+
+        heap = []
+        for entry in self._heap:
+            event = entry[2]
+            if entry[3] != event._version:
+                continue
+            if event.is_invalid():
+                event._queued = False
+            else:
+                heap.append(entry)
+        heapify(heap)
+        self._heap = heap
+        self._invalid_num = 0
+        self._stale_num = 0
 
     def update_event_time(self, event: "Event", time: int):
         """Method to update the timestamp of event and maintain the min-heap structure.
+
+        A new entry is pushed for the event, and its previous entry becomes stale.
+        Events not stored in the heap (e.g. already executed) are not modified.
         """
-        if time == event.time:
+
+        if time == event.time or not event._queued:
             return
 
-        def _pop_updated_event(heap: "List", index: int):
-            parent_i = (index - 1) // 2
-            while index > 0 and event < self.data[parent_i]:
-                heap[index], heap[parent_i] = heap[parent_i], heap[index]
-                index = parent_i
-                parent_i = (parent_i - 1) // 2
-
-        for i, e in enumerate(self.data):
-            if id(e) == id(event):
-                if event.time > time:
-                    event.time = time
-                    _pop_updated_event(self.data, i)
-
-                elif event.time < time:
-                    event.time = -1
-                    _pop_updated_event(self.data, i)
-                    self.pop()
-                    event.time = time
-                    self.push(event)
+        event._version += 1
+        self._stale_num += 1
+        event.time = time
+        heappush(self._heap, (time, event.priority, event, event._version))
+        self._compact_if_needed()
+
+    def _compact_if_needed(self) -> None:
+        if len(self._heap) >= self.compact_min_size and \
+                self._invalid_num + self._stale_num > self.compact_ratio * len(self._heap):
+            self.compact()
+
+
+class CalendarEventList:
+    """Class of event list implemented as a calendar queue.
+
+    Events are hashed by time into an array of buckets ("days"), each covering `width` ps of simulation time.
+    Each bucket is a small heap of `(time, priority, seq, event)` tuples, so comparisons are done on integer tuples.
+    The `seq` counter breaks ties between events with equal time and priority in first-in-first-out order.
+    The number of buckets and the bucket width are adjusted as the queue grows and shrinks,
+    giving O(1) amortized enqueue and dequeue for most event time distributions.
+    Events with infinite time are kept in a separate overflow heap.
+    As with EventList, removed events are compacted out once they exceed a fraction of the queue.
+
+    Attributes:
+        buckets (List[List[tuple]]): list of bucket heaps.
+        width (int): time width (in ps) of each bucket.
+        compact_ratio (float): fraction of invalid events in the queue that triggers compaction.
+        compact_min_size (int): minimum queue size for compaction.
+    """
+
+    _MIN_BUCKETS = 2
+    _SAMPLE_SIZE = 25
+
+    def __init__(self, width: int = 1000, bucket_num: int = 2, compact_ratio: float = 0.5,
+                 compact_min_size: int = 64):
+        """Constructor for calendar event list.
+
+        Args:
+            width (int): initial time width of a bucket (default 1000).
+            bucket_num (int): initial number of buckets (default 2).
+            compact_ratio (float): fraction of invalid events in the queue that triggers compaction (default 0.5).
+            compact_min_size (int): minimum queue size for compaction (default 64).
+        """
+
+        assert width > 0 and bucket_num > 0
+        self.width = width
+        self.compact_ratio = compact_ratio
+        self.compact_min_size = compact_min_size
+        self._invalid_num = 0
+        self.buckets: List[List[tuple]] = [[] for _ in range(bucket_num)]
+        self._far: List[tuple] = []
+        self._size = 0
+        self._seq = 0
+        self._last_bucket = 0
+        self._bucket_top = width
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for bucket in self.buckets:
+            for entry in bucket:
+                yield entry[-1]
+        for entry in self._far:
+            yield entry[-1]
+
+    def push(self, event: "Event") -> None:
+        self._insert((event.time, event.priority, self._seq, event))
+        self._seq += 1
+        self._size += 1
+        if self._size > 2 * len(self.buckets):
+            self._resize(2 * len(self.buckets))
+
+    def pop(self) -> "Event":
+        bucket = self._locate()
+        entry = heappop(bucket)
+        self._size -= 1
+        if entry[-1].is_invalid():
+            self._invalid_num -= 1
+        if self._size < len(self.buckets) // 2 and len(self.buckets) > self._MIN_BUCKETS:
+            self._resize(len(self.buckets) // 2)
+        return entry[-1]
 
+    def top(self) -> "Event":
+        return self._locate()[0][-1]
+
+    def isempty(self) -> bool:
+        return self._size == 0
+
+    def remove(self, event: "Event") -> None:
+        """Method to remove events from calendar.
+
+        The event is set as the invalid state to save the time of removing event from the queue.
+        Invalid events are removed in bulk once they exceed `compact_ratio` of the queue.
+        """
+
+        if not event.is_invalid() and any(entry[-1] is event for entry in self._bucket_of(event.time)):
+            self._invalid_num += 1
+        event.set_invalid()
+        if self._size >= self.compact_min_size and self._invalid_num > self.compact_ratio * self._size:
+            self.compact()
+
+    def compact(self) -> None:
+        """Method to drop all invalid events from the calendar."""
+
+        self.buckets = [[entry for entry in bucket if not entry[-1].is_invalid()] for bucket in self.buckets]
+        self._far = [entry for entry in self._far if not entry[-1].is_invalid()]
+        heapify(self._far)
+        self._size = sum(len(bucket) for bucket in self.buckets) + len(self._far)
+        self._invalid_num = 0
+        self._resize(max(self._MIN_BUCKETS, len(self.buckets)))
+
+    def update_event_time(self, event: "Event", time: int):
+        """Method to update the timestamp of event and move it to the corresponding bucket.
+        """
+
+        if time == event.time:
+            return
+
+        bucket = self._bucket_of(event.time)
+        for i, entry in enumerate(bucket):
+            if entry[-1] is event:
+                bucket[i] = bucket[-1]
+                bucket.pop()
+                heapify(bucket)
+                event.time = time
+                self._insert((time, entry[1], entry[2], event))
                 break
+
+    def _bucket_of(self, time) -> List[tuple]:
+        if isinf(time):
+            return self._far
+        return self.buckets[int(time // self.width) % len(self.buckets)]
+
+    def _insert(self, entry: tuple) -> None:
+        time = entry[0]
+        heappush(self._bucket_of(time), entry)
+        # move the current position back if an event is scheduled before it
+        if time < self._bucket_top - self.width:
+            self._set_position(time)
+
+    def _set_position(self, time) -> None:
+        day = int(time // self.width)
+        self._last_bucket = day % len(self.buckets)
+        self._bucket_top = (day + 1) * self.width
+
+    def _locate(self) -> List[tuple]:
+        """Method to find the bucket holding the earliest event.
+
+        Scans at most one full year of buckets from the current position before falling back to a direct search.
+        """
+
+        if self._size == 0:
+            raise IndexError("pop from empty event list")
+
+        buckets = self.buckets
+        bucket_num = len(buckets)
+        i = self._last_bucket
+        top = self._bucket_top
+        for _ in range(bucket_num):
+            bucket = buckets[i]
+            if bucket and bucket[0][0] < top:
+                self._last_bucket = i
+                self._bucket_top = top
+                return bucket
+            i += 1
+            top += self.width
+            if i == bucket_num:
+                i = 0
+
+        # direct search for the minimum among bucket heads
+        heads = [bucket[0] for bucket in buckets if bucket]
+        if not heads:
+            return self._far
+        self._set_position(min(heads)[0])
+        return buckets[self._last_bucket]
+
+    def _resize(self, bucket_num: int) -> None:
+        entries = [entry for bucket in self.buckets for entry in bucket]
+        self.width = self._new_width(entries)
+        self.buckets = [[] for _ in range(bucket_num)]
+        for entry in entries:
+            self.buckets[int(entry[0] // self.width) % bucket_num].append(entry)
+        for bucket in self.buckets:
+            heapify(bucket)
+
+        if entries:
+            self._set_position(min(entries)[0])
+        else:
+            self._last_bucket = 0
+            self._bucket_top = self.width
+
+    def _new_width(self, entries: List[tuple]) -> int:
+        """Method to estimate bucket width from the average separation of the earliest events."""
+
+        sample = nsmallest(self._SAMPLE_SIZE, entries)
+        times = sorted(set(entry[0] for entry in sample))
+        if len(times) < 2:
+            return self.width
+        separation = (times[-1] - times[0]) / (len(times) - 1)
+        return max(1, int(3 * separation))
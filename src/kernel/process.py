@@ -2,25 +2,64 @@
 
 This module defines a process, which is performed when an event is executed.
 """
-from typing import Any, List
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional
+
+# shared read-only default for processes without keyword arguments
+_NO_KWARGS = MappingProxyType({})
 
 
 class Process:
     """Class of process.
 
     The process claims the object of process, the function of object, and the arguments for the function.
+    Processes use `__slots__`, and the bound method of the owner is resolved on the first run and cached.
+    Reassigning `owner` (e.g. when the timeline resolves an owner given by name) or `activation` clears the cached method.
 
     Attributes:
         owner (Any): the object of process.
-        activation_method (str): the function of object.
+        activation (str): the function of object.
         act_params (List[Any]): the arguments of object.
+        act_kwargs (Dict[str, Any]): the keyword arguments of object.
     """
 
-    def __init__(self, owner: Any, activation_method: str, act_params: List[Any], act_kwargs={}):
-        self.owner = owner
-        self.activation = activation_method
+    __slots__ = ('_owner', '_activation', 'act_params', 'act_kwargs', '_func')
+
+    def __init__(self, owner: Any, activation_method: str, act_params: List[Any],
+                 act_kwargs: Optional[Dict[str, Any]] = None):
+        self._owner = owner
+        self._activation = activation_method
         self.act_params = act_params
-        self.act_kwargs = act_kwargs
+        self.act_kwargs = _NO_KWARGS if act_kwargs is None else act_kwargs
+        self._func: Optional[Callable] = None
+
+    @property
+    def owner(self) -> Any:
+        return self._owner
+
+    @owner.setter
+    def owner(self, owner: Any) -> None:
+        self._owner = owner
+        self._func = None
+
+    @property
+    def activation(self) -> str:
+        return self._activation
+
+    @activation.setter
+    def activation(self, activation: str) -> None:
+        self._activation = activation
+        self._func = None
+
+    def __getstate__(self):
+        # the shared default is not picklable; restored on load
+        act_kwargs = None if self.act_kwargs is _NO_KWARGS else self.act_kwargs
+        return self._owner, self._activation, self.act_params, act_kwargs
+
+    def __setstate__(self, state):
+        self._owner, self._activation, self.act_params, act_kwargs = state
+        self.act_kwargs = _NO_KWARGS if act_kwargs is None else act_kwargs
+        self._func = None
 
     def run(self) -> None:
         """Method to execute process.
@@ -28,4 +67,9 @@ class Process:
         Will run the `activation_method` method of `owner` with `act_params` passed as args.
         """
 
-        return getattr(self.owner, self.activation)(*self.act_params, **self.act_kwargs)
+        func = self._func
+        if func is None:
+            func = self._func = getattr(self._owner, self._activation)
+        if self.act_kwargs:
+            return func(*self.act_params, **self.act_kwargs)
+        return func(*self.act_params)
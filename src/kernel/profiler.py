@@ -0,0 +1,119 @@
+"""Definition of the EventProfiler class.
+
+This module defines the EventProfiler class, used by the timeline to account for executed events.
+Profiling is opt-in and is enabled with the `Timeline.enable_profiling` method.
+Statistics are grouped by the class name of the process owner and the activation method of the process.
+"""
+
+import json
+from typing import Dict, Tuple, List, Any
+
+
+class EventProfiler:
+    """Class to record per-entity, per-method event statistics.
+
+    For each `(owner class name, activation method)` pair, the profiler records:
+        the number of executed events,
+        cumulative and maximum wall time of event execution (in ns),
+        the first and last simulation time of execution (in ps),
+        and a histogram of execution simulation times with bins of width `time_bin`.
+
+    Attributes:
+        time_bin (int): width (in ps) of the simulation time histogram bins.
+        stats (Dict[Tuple[str, str], List]): mapping of (owner class, method) pairs to recorded statistics.
+    """
+
+    def __init__(self, time_bin: int = int(1e9)):
+        """Constructor of event profiler.
+
+        Args:
+            time_bin (int): width (in ps) of simulation time histogram bins (default 1e9 ps, i.e. 1 ms).
+        """
+
+        assert time_bin > 0
+        self.time_bin = time_bin
+        self.stats: Dict[Tuple[str, str], List] = {}
+
+    def record(self, owner: Any, activation: str, sim_time: int, wall_time: int) -> None:
+        """Method to record one executed event.
+
+        Args:
+            owner (Any): owner of the executed process.
+            activation (str): name of the executed method.
+            sim_time (int): simulation time of execution (in ps).
+            wall_time (int): wall time spent executing the process (in ns).
+        """
+
+        key = (type(owner).__name__, activation)
+        stat = self.stats.get(key)
+        if stat is None:
+            # count, total wall time, max wall time, first sim time, last sim time, histogram
+            stat = self.stats[key] = [0, 0, 0, sim_time, sim_time, {}]
+        stat[0] += 1
+        stat[1] += wall_time
+        if wall_time > stat[2]:
+            stat[2] = wall_time
+        stat[4] = sim_time
+        hist = stat[5]
+        time_bin = int(sim_time // self.time_bin)
+        hist[time_bin] = hist.get(time_bin, 0) + 1
+
+    def reset(self) -> None:
+        self.stats.clear()
+
+    def to_dict(self) -> List[Dict[str, Any]]:
+        """Method to export statistics as a list of records, sorted by cumulative wall time (descending).
+
+        Returns:
+            List[Dict[str, Any]]: one record per (owner class, method) pair.
+        """
+
+        records = []
+        for (owner, activation), (count, total, max_time, first, last, hist) in self.stats.items():
+            records.append({"owner": owner,
+                            "activation": activation,
+                            "count": count,
+                            "total_wall_time": total,
+                            "mean_wall_time": total / count,
+                            "max_wall_time": max_time,
+                            "first_sim_time": first,
+                            "last_sim_time": last,
+                            "sim_time_histogram": {bin_index * self.time_bin: num
+                                                   for bin_index, num in sorted(hist.items())}})
+        records.sort(key=lambda record: record["total_wall_time"], reverse=True)
+        return records
+
+    def to_json(self, filename: str = None) -> str:
+        """Method to export statistics as JSON.
+
+        Args:
+            filename (str): if given, the JSON string is also written to this file (default None).
+
+        Returns:
+            str: JSON string of the records from `to_dict`.
+        """
+
+        output = json.dumps({"time_bin": self.time_bin, "events": self.to_dict()}, indent=2)
+        if filename is not None:
+            with open(filename, "w") as fh:
+                fh.write(output)
+        return output
+
+    def table(self, limit: int = None) -> str:
+        """Method to format statistics as a text table, sorted by cumulative wall time.
+
+        Args:
+            limit (int): maximum number of rows to show (default None for all rows).
+
+        Returns:
+            str: formatted table.
+        """
+
+        records = self.to_dict()[:limit]
+        header = ("owner", "activation", "count", "total (ms)", "mean (us)", "max (us)")
+        rows = [(r["owner"], r["activation"], str(r["count"]), "%.3f" % (r["total_wall_time"] / 1e6),
+                 "%.3f" % (r["mean_wall_time"] / 1e3), "%.3f" % (r["max_wall_time"] / 1e3)) for r in records]
+        widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+        lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in [header] + rows]
+        lines.insert(1, "  ".join("-" * width for width in widths))
+        return "\n".join(lines)
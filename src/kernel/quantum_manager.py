@@ -1,38 +1,47 @@
 """This module defines the quantum manager class, to track quantum states.
 
-The states may currently be defined in two possible ways:
+The states may currently be defined in the following ways:
     - KetState (with the QuantumManagerKet class)
     - DensityMatrix (with the QuantumManagerDensity class)
+    - DensityMatrix of Fock states (with the QuantumManagerDensityFock class)
+    - StabilizerState (with the QuantumManagerStabilizer class)
+    - BellDiagonalState (with the QuantumManagerBellDiagonal class)
 
 The manager defines an API for interacting with quantum states.
 """
 
 from __future__ import annotations
 from abc import abstractmethod
-from typing import List, Dict, TYPE_CHECKING
+from typing import List, Dict, Tuple, Set, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..components.circuit import Circuit
     from .quantum_state import State
 
-from qutip.qip.circuit import QubitCircuit, Gate
-from qutip.qip.operations import gate_sequence_product
-from numpy import log, array, cumsum, base_repr, zeros
+from numpy import log, array, cumsum
 from scipy.sparse import csr_matrix
-from scipy.special import binom
 
-from .quantum_state import KetState, DensityState
+from .quantum_state import KetState, DensityState, StabilizerState, BellDiagonalState
 from .quantum_utils import *
 
 KET_STATE_FORMALISM = "ket_vector"
 DENSITY_MATRIX_FORMALISM = "density_matrix"
 FOCK_DENSITY_MATRIX_FORMALISM = "fock_density"
+STABILIZER_FORMALISM = "stabilizer"
+BELL_DIAGONAL_STATE_FORMALISM = "bell_diagonal"
+
+_MEASURED_TABLEAUX = [array([[0, 1, 0]], dtype='uint8'), array([[0, 1, 1]], dtype='uint8')]  # tableaux of |0> and |1>
+_MEASURED_KETS = [(complex(1), complex(0)), (complex(0), complex(1))]
+COLLECT_MIN_THRESHOLD = 64  # minimum number of released keys before automatic collection
 
 
 class QuantumManager:
     """Class to track and manage quantum states (abstract).
 
     All states stored are of a single formalism (by default as a ket vector).
+    Keys are released with the `remove` method and recycled for new states.
+    A released key sharing a state with keys still in use is kept until the state no longer includes such keys;
+    these keys are reclaimed by the `collect` method, which also runs automatically as released keys accumulate.
 
     Attributes:
         states (Dict[int, State]): mapping of state keys to quantum state objects.
@@ -44,10 +53,22 @@ class QuantumManager:
     def __init__(self, formalism: str, truncation: int = 1):
         self.states: Dict[int, State] = {}
         self._least_available: int = 0
+        self._free_keys: List[int] = []
+        self._released: Set[int] = set()
+        self._collect_threshold: int = COLLECT_MIN_THRESHOLD
         self.formalism: str = formalism
         self.truncation = truncation
         self.dim = self.truncation + 1
 
+    def _new_key(self) -> int:
+        """Method to get an unused key, reusing keys reclaimed by `remove` or `collect`."""
+
+        if self._free_keys:
+            return self._free_keys.pop()
+        key = self._least_available
+        self._least_available += 1
+        return key
+
     @abstractmethod
     def new(self, state: any) -> int:
         """Method to create a new quantum state.
@@ -89,6 +110,22 @@ class QuantumManager:
             assert meas_samp, "must specify random sample when measuring qubits"
 
     def _prepare_circuit(self, circuit: Circuit, keys: List[int]):
+        """Method to prepare the compound state and circuit matrix for circuit application.
+
+        The circuit matrix is not padded with identity;
+        it should be applied to the first `circuit.size` subsystems of the returned state with tensor contraction.
+
+        Args:
+            circuit (Circuit): quantum circuit to apply.
+            keys (List[int]): list of keys for quantum states to apply circuit to.
+
+        Returns:
+            Tuple[array, List[int], array]: Tuple containing:
+                1. compound state, with subsystems of `keys` moved to the front (in order).
+                2. list of keys corresponding to the compound state.
+                3. unitary matrix of the circuit.
+        """
+
         old_states = []
         all_keys = []
 
@@ -104,30 +141,45 @@ class QuantumManager:
         for state in old_states:
             new_state = kron(new_state, state)
 
-        # get circuit matrix; expand if necessary
         circ_mat = circuit.get_unitary_matrix()
-        if circuit.size < len(all_keys):
-            # pad size of circuit matrix if necessary
-            diff = len(all_keys) - circuit.size
-            circ_mat = kron(circ_mat, identity(2 ** diff))
 
-        # apply any necessary swaps
+        # reorder qubits of the compound state if necessary
         if not all([all_keys.index(key) == i for i, key in enumerate(keys)]):
-            all_keys, swap_mat = self._swap_qubits(all_keys, keys)
-            circ_mat = circ_mat @ swap_mat
+            all_keys, perm = self._swap_qubits(all_keys, keys)
+            if new_state.ndim == 1:
+                new_state = permute_ket(new_state, perm)
+            else:
+                new_state = permute_density(new_state, perm)
 
         return new_state, all_keys, circ_mat
 
-    def _swap_qubits(self, all_keys, keys):
-        swap_circuit = QubitCircuit(N=len(all_keys))
-        for i, key in enumerate(keys):
-            j = all_keys.index(key)
+    @staticmethod
+    def _swap_qubits(all_keys: List[int], keys: List[int], start: int = 0):
+        """Method to compute the subsystem permutation moving `keys` to consecutive positions.
+
+        Keys are swapped one at a time into positions `start, start + 1, ...`.
+        The permutation can then be applied to a state as a single axis transpose
+        (see `quantum_utils.permute_ket` and `quantum_utils.permute_density`).
+
+        Args:
+            all_keys (List[int]): keys of the compound state (in current order).
+            keys (List[int]): keys to move.
+            start (int): position of the first moved key (default 0).
+
+        Returns:
+            Tuple[List[int], List[int]]: Tuple containing:
+                1. list of keys in new order.
+                2. permutation, where subsystem `i` of the new state is subsystem `perm[i]` of the old state.
+        """
+
+        new_keys = list(all_keys)
+        perm = list(range(len(all_keys)))
+        for i, key in enumerate(keys, start):
+            j = new_keys.index(key)
             if j != i:
-                gate = Gate("SWAP", targets=[i, j])
-                swap_circuit.add_gate(gate)
-                all_keys[i], all_keys[j] = all_keys[j], all_keys[i]
-        swap_mat = gate_sequence_product(swap_circuit.propagators()).full()
-        return all_keys, swap_mat
+                new_keys[i], new_keys[j] = new_keys[j], new_keys[i]
+                perm[i], perm[j] = perm[j], perm[i]
+        return new_keys, perm
 
     @abstractmethod
     def set(self, keys: List[int], amplitudes: any) -> None:
@@ -156,22 +208,103 @@ class QuantumManager:
         pass
 
     def remove(self, key: int) -> None:
-        """Method to remove state stored at key."""
-        del self.states[key]
+        """Method to release the state stored at key.
+
+        If no other key in use shares the state, the key (and any released key sharing the state) is reclaimed
+        and may be returned by `new`.
+        Otherwise, the key is marked as released and reclaimed later by `collect`.
+        The key should not be used after calling this method.
+
+        Args:
+            key (int): key to release.
+        """
+
+        qstate = self.states[key]
+        if self._has_live_partner(key, qstate):
+            self._released.add(key)
+            if len(self._released) >= self._collect_threshold:
+                self.collect()
+        else:
+            self._reclaim(key, qstate)
+
+    def collect(self) -> int:
+        """Method to reclaim released keys whose state is no longer shared with keys in use.
+
+        Returns:
+            int: number of reclaimed keys.
+        """
+
+        reclaimed = 0
+        for key in list(self._released):
+            if key not in self._released:
+                continue  # reclaimed with another key of its state
+            qstate = self.states[key]
+            if not self._has_live_partner(key, qstate):
+                reclaimed += self._reclaim(key, qstate)
+        self._collect_threshold = max(COLLECT_MIN_THRESHOLD, 2 * len(self._released))
+        return reclaimed
+
+    def _has_live_partner(self, key: int, qstate: "State") -> bool:
+        # a partner is a key of the state still mapped to the same state object and not released
+        for other in getattr(qstate, "keys", ()):
+            if other != key and other not in self._released and self.states.get(other) is qstate:
+                return True
+        return False
+
+    def _reclaim(self, key: int, qstate: "State") -> int:
+        group = [key] + [other for other in getattr(qstate, "keys", ())
+                         if other != key and other in self._released and self.states.get(other) is qstate]
+        for k in group:
+            del self.states[k]
+            self._released.discard(k)
+            self._free_keys.append(k)
+        return len(group)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Method to get counters describing the memory held by the quantum manager.
+
+        Returns:
+            Dict[str, int]: dictionary with the following counters:
+                `live_keys`: number of stored keys not released.
+                `released_keys`: number of released keys waiting to be reclaimed.
+                `free_keys`: number of reclaimed keys available for reuse.
+                `num_states`: number of distinct quantum state objects.
+                `largest_group`: largest number of keys sharing one state.
+                `bytes`: number of bytes held by the state arrays.
+        """
+
+        unique_states = {id(qstate): qstate for qstate in self.states.values() if qstate is not None}
+        largest_group = 0
+        num_bytes = 0
+        for qstate in unique_states.values():
+            largest_group = max(largest_group, len(getattr(qstate, "keys", ())))
+            num_bytes += getattr(getattr(qstate, "state", None), "nbytes", 0)
+
+        return {"live_keys": len(self.states) - len(self._released),
+                "released_keys": len(self._released),
+                "free_keys": len(self._free_keys),
+                "num_states": len(unique_states),
+                "largest_group": largest_group,
+                "bytes": num_bytes}
 
     def set_states(self, states: Dict):
         self.states = states
 
 
 class QuantumManagerKet(QuantumManager):
-    """Class to track and manage quantum states with the ket vector formalism."""
+    """Class to track and manage quantum states with the ket vector formalism.
 
-    def __init__(self):
+    Attributes:
+        factorize (bool): if True, the state remaining after a measurement is split into
+            independent groups of qubits when it is a product state (see `quantum_utils.ket_factorize`).
+    """
+
+    def __init__(self, factorize: bool = False):
         super().__init__(KET_STATE_FORMALISM)
+        self.factorize = factorize
 
     def new(self, state=(complex(1), complex(0))) -> int:
-        key = self._least_available
-        self._least_available += 1
+        key = self._new_key()
         self.states[key] = KetState(state, [key])
         return key
 
@@ -179,7 +312,10 @@ class QuantumManagerKet(QuantumManager):
         super().run_circuit(circuit, keys, meas_samp)
         new_state, all_keys, circ_mat = self._prepare_circuit(circuit, keys)
 
-        new_state = circ_mat @ new_state
+        # apply circuit to the first qubits only
+        num_qubits = len(all_keys)
+        new_state = apply_gate(new_state.reshape((2,) * num_qubits), circ_mat, list(range(circuit.size)))
+        new_state = new_state.reshape(2 ** num_qubits)
 
         if len(circuit.measured_qubits) == 0:
             # set state, return no measurement result
@@ -223,7 +359,7 @@ class QuantumManagerKet(QuantumManager):
 
         if len(keys) == 1:
             if len(all_keys) == 1:
-                prob_0 = measure_state_with_cache_ket(tuple(state))
+                prob_0 = measure_state_ket(state)
                 if meas_samp < prob_0:
                     result = 0
                 else:
@@ -233,12 +369,12 @@ class QuantumManagerKet(QuantumManager):
                 key = keys[0]
                 num_states = len(all_keys)
                 state_index = all_keys.index(key)
-                state_0, state_1, prob_0 = measure_entangled_state_with_cache_ket(tuple(state), state_index, num_states)
+                state_0, state_1, prob_0 = measure_entangled_state_ket(state, state_index, num_states)
                 if meas_samp < prob_0:
-                    new_state = array(state_0, dtype=complex)
+                    new_state = state_0
                     result = 0
                 else:
-                    new_state = array(state_1, dtype=complex)
+                    new_state = state_1
                     result = 1
 
             all_keys.remove(keys[0])
@@ -247,17 +383,16 @@ class QuantumManagerKet(QuantumManager):
             # swap states into correct position
             if not all(
                     [all_keys.index(key) == i for i, key in enumerate(keys)]):
-                all_keys, swap_mat = self._swap_qubits(all_keys, keys)
-                state = swap_mat @ state
+                all_keys, perm = self._swap_qubits(all_keys, keys)
+                state = permute_ket(state, perm)
 
             # calculate meas probabilities and projected states
             len_diff = len(all_keys) - len(keys)
-            new_states, probabilities = measure_multiple_with_cache_ket(
-                tuple(state), len(keys), len_diff)
+            new_states, probabilities = measure_multiple_ket(state, len(keys), len_diff)
 
             # choose result, set as new state
-            for i in range(int(2 ** len(keys))):
-                if meas_samp < sum(probabilities[:i + 1]):
+            for i, prob_sum in enumerate(cumsum(probabilities)):
+                if meas_samp < prob_sum:
                     result = i
                     new_state = new_states[i]
                     break
@@ -275,11 +410,18 @@ class QuantumManagerKet(QuantumManager):
             new_state_obj = KetState(result_states[res], [key])
             self.states[key] = new_state_obj
         
-        if len(all_keys) > 0:
+        if len(all_keys) > 1 and self.factorize:
+            for indices, ket in ket_factorize(new_state, len(all_keys)):
+                group_keys = [all_keys[i] for i in indices]
+                new_state_obj = KetState(ket, group_keys)
+                for key in group_keys:
+                    self.states[key] = new_state_obj
+
+        elif len(all_keys) > 0:
             new_state_obj = KetState(new_state, all_keys)
             for key in all_keys:
                 self.states[key] = new_state_obj
-        
+
         return dict(zip(keys, result_digits))
 
 
@@ -291,8 +433,7 @@ class QuantumManagerDensity(QuantumManager):
 
     def new(self,
             state=([complex(1), complex(0)], [complex(0), complex(0)])) -> int:
-        key = self._least_available
-        self._least_available += 1
+        key = self._new_key()
         self.states[key] = DensityState(state, [key])
         return key
 
@@ -300,7 +441,12 @@ class QuantumManagerDensity(QuantumManager):
         super().run_circuit(circuit, keys, meas_samp)
         new_state, all_keys, circ_mat = super()._prepare_circuit(circuit, keys)
 
-        new_state = circ_mat @ new_state @ circ_mat.conj().T
+        # apply circuit to the first qubits only (on both the row and column axes)
+        num_qubits = len(all_keys)
+        new_state = new_state.reshape((2,) * (2 * num_qubits))
+        new_state = apply_gate(new_state, circ_mat, list(range(circuit.size)))
+        new_state = apply_gate(new_state, circ_mat.conj(), list(range(num_qubits, num_qubits + circuit.size)))
+        new_state = new_state.reshape((2 ** num_qubits, 2 ** num_qubits))
 
         if len(circuit.measured_qubits) == 0:
             # set state, return no measurement result
@@ -355,7 +501,7 @@ class QuantumManagerDensity(QuantumManager):
 
         if len(keys) == 1:
             if len(all_keys) == 1:
-                prob_0 = measure_state_with_cache_density(tuple(map(tuple, state)))
+                prob_0 = measure_state_density(state)
                 if meas_samp < prob_0:
                     result = 0
                     new_state = [[1, 0], [0, 0]]
@@ -367,31 +513,28 @@ class QuantumManagerDensity(QuantumManager):
                 key = keys[0]
                 num_states = len(all_keys)
                 state_index = all_keys.index(key)
-                state_0, state_1, prob_0 =\
-                    measure_entangled_state_with_cache_density(tuple(map(tuple, state)), state_index, num_states)
+                state_0, state_1, prob_0 = measure_entangled_state_density(state, state_index, num_states)
                 if meas_samp < prob_0:
-                    new_state = array(state_0, dtype=complex)
+                    new_state = state_0
                     result = 0
                 else:
-                    new_state = array(state_1, dtype=complex)
+                    new_state = state_1
                     result = 1
 
         else:
             # swap states into correct position
             if not all(
                     [all_keys.index(key) == i for i, key in enumerate(keys)]):
-                all_keys, swap_mat = self._swap_qubits(all_keys, keys)
-                state = swap_mat @ state @ swap_mat.T
+                all_keys, perm = self._swap_qubits(all_keys, keys)
+                state = permute_density(state, perm)
 
             # calculate meas probabilities and projected states
             len_diff = len(all_keys) - len(keys)
-            state_to_measure = tuple(map(tuple, state))
-            new_states, probabilities = measure_multiple_with_cache_density(
-                state_to_measure, len(keys), len_diff)
+            new_states, probabilities = measure_multiple_density(state, len(keys), len_diff)
 
             # choose result, set as new state
-            for i in range(int(2 ** len(keys))):
-                if meas_samp < sum(probabilities[:i + 1]):
+            for i, prob_sum in enumerate(cumsum(probabilities)):
+                if meas_samp < prob_sum:
                     result = i
                     new_state = new_states[i]
                     break
@@ -407,6 +550,276 @@ class QuantumManagerDensity(QuantumManager):
         return dict(zip(keys, result_digits))
 
 
+class QuantumManagerStabilizer(QuantumManager):
+    """Class to track and manage states with the stabilizer formalism.
+
+    States are stored as stabilizer tableaux, so that circuits take polynomial time in the number of entangled qubits.
+    Only Clifford circuits (gates h, x, y, z, s, cx, swap and phase gates with angles that are multiples of pi/2)
+    and measurement in the computational basis are supported.
+    """
+
+    def __init__(self):
+        super().__init__(STABILIZER_FORMALISM)
+
+    def new(self, state=(complex(1), complex(0))) -> int:
+        key = self._new_key()
+        self.states[key] = StabilizerState(state, [key])
+        return key
+
+    def run_circuit(self, circuit: Circuit, keys: List[int], meas_samp=None) -> Dict[int, int]:
+        """See base class.
+
+        Raises:
+            NotImplementedError: if the circuit contains a non-Clifford gate (e.g. `t` or `ccx`).
+        """
+
+        super().run_circuit(circuit, keys, meas_samp)
+
+        # build compound tableau
+        old_states = []
+        all_keys = []
+        for key in keys:
+            qstate = self.states[key]
+            if qstate.keys[0] not in all_keys:
+                old_states.append(qstate.state)
+                all_keys += qstate.keys
+        tableau = stabilizer_combine(old_states)
+
+        # apply gates (states are unchanged if a gate is not supported)
+        indices = [all_keys.index(key) for key in keys]
+        for name, gate_indices, arg in circuit.gates:
+            stabilizer_apply_gate(tableau, name, [indices[i] for i in gate_indices], arg)
+
+        # measure qubits one at a time
+        results = {}
+        for i in circuit.measured_qubits:
+            key = keys[i]
+            result, tableau, meas_samp = stabilizer_measure(tableau, all_keys.index(key), meas_samp)
+            all_keys.remove(key)
+            self.states[key] = StabilizerState(_MEASURED_TABLEAUX[result], [key])
+            results[key] = result
+
+        if len(all_keys) > 0:
+            new_state = StabilizerState(tableau, all_keys)
+            for key in all_keys:
+                self.states[key] = new_state
+        return results
+
+    def set(self, keys: List[int], amplitudes: any) -> None:
+        """Method to set the quantum state at the given keys.
+
+        Args:
+            keys (List[int]): list of quantum manager keys to modify.
+            amplitudes: ket vector of a stabilizer state, or stabilizer tableau to set input keys to.
+        """
+
+        super().set(keys, amplitudes)
+        new_state = StabilizerState(amplitudes, keys)
+        for key in keys:
+            self.states[key] = new_state
+
+    def set_to_zero(self, key: int):
+        self.set([key], _MEASURED_TABLEAUX[0])
+
+    def set_to_one(self, key: int):
+        self.set([key], _MEASURED_TABLEAUX[1])
+
+
+class QuantumManagerBellDiagonal(QuantumManager):
+    """Class to track and manage entangled pairs as Bell diagonal states.
+
+    Entangled pairs are stored as the 4 coefficients of a Bell diagonal state,
+    and unentangled qubits are stored as single-qubit ket vectors.
+    Entanglement swapping, purification and decoherence are closed-form updates of the coefficients
+    (see the `swap`, `purify` and `apply_pauli_channel` methods).
+    Circuits are limited to single qubits; for entangled qubits, only Pauli gates and measurement are supported.
+
+    Attributes:
+        _pending_results (Dict[int, int]): measurement results of remote qubits determined by `purify`.
+    """
+
+    def __init__(self):
+        super().__init__(BELL_DIAGONAL_STATE_FORMALISM)
+        self._pending_results: Dict[int, int] = {}
+
+    def new(self, state=(complex(1), complex(0))) -> int:
+        key = self._new_key()
+        self.states[key] = KetState(state, [key])
+        self._pending_results.pop(key, None)  # key may be reused
+        return key
+
+    def run_circuit(self, circuit: Circuit, keys: List[int], meas_samp=None) -> Dict[int, int]:
+        """See base class.
+
+        Raises:
+            NotImplementedError: if the circuit acts on multiple qubits,
+                or applies a gate other than a Pauli gate to an entangled qubit.
+        """
+
+        super().run_circuit(circuit, keys, meas_samp)
+        if circuit.size != 1:
+            raise NotImplementedError("Bell diagonal formalism only supports single-qubit circuits; "
+                                      "use the swap and purify methods for entanglement operations")
+
+        key = keys[0]
+        qstate = self.states[key]
+
+        if isinstance(qstate, BellDiagonalState):
+            pauli = 0
+            for name, _, _ in circuit.gates:
+                if name not in BELL_DIAGONAL_PAULI_INDICES:
+                    raise NotImplementedError("gate {} on entangled qubit is not supported "
+                                              "by Bell diagonal formalism".format(name))
+                pauli ^= BELL_DIAGONAL_PAULI_INDICES[name]
+            coefficients = qstate.state[[i ^ pauli for i in range(4)]]
+
+            if len(circuit.measured_qubits) == 0:
+                self.set(qstate.keys, coefficients)
+                return {}
+
+            # reduced state is maximally mixed; other qubit is correlated (phi) or anti-correlated (psi)
+            result = 0 if meas_samp < 0.5 else 1
+            meas_samp = 2 * meas_samp - result
+            other_result = result if meas_samp < coefficients[0] + coefficients[1] else 1 - result
+            other_key = qstate.keys[1] if qstate.keys[0] == key else qstate.keys[0]
+            self.set([other_key], _MEASURED_KETS[other_result])
+
+        else:
+            state = circuit.get_unitary_matrix() @ qstate.state
+            if len(circuit.measured_qubits) == 0:
+                self.set([key], state)
+                return {}
+            result = 0 if meas_samp < measure_state_ket(state) else 1
+
+        self.set([key], _MEASURED_KETS[result])
+        return {key: result}
+
+    def set(self, keys: List[int], amplitudes: any) -> None:
+        """Method to set the quantum state at the given keys.
+
+        Args:
+            keys (List[int]): list of quantum manager keys to modify.
+            amplitudes: ket vector for a single key, or Bell diagonal coefficients for two keys.
+        """
+
+        super().set(keys, amplitudes)
+        if len(keys) == 1:
+            new_state = KetState(amplitudes, keys)
+        else:
+            new_state = BellDiagonalState(amplitudes, keys)
+        for key in keys:
+            self.states[key] = new_state
+            self._pending_results.pop(key, None)
+
+    def set_to_zero(self, key: int):
+        self.set([key], _MEASURED_KETS[0])
+
+    def set_to_one(self, key: int):
+        self.set([key], _MEASURED_KETS[1])
+
+    def swap(self, left_key: int, right_key: int, meas_samp: float) -> Dict[int, int]:
+        """Method to perform entanglement swapping with a Bell state measurement on two entangled qubits.
+
+        The measured qubits are set to the measured state, and the remaining qubits form the swapped pair.
+        The swapped pair is stored before the Pauli correction X^(right result) Z^(left result)
+        is applied to it (as in the circuit of `EntanglementSwappingA`).
+
+        Args:
+            left_key (int): key of qubit from first pair.
+            right_key (int): key of qubit from second pair.
+            meas_samp (float): random sample used for measurement result.
+
+        Returns:
+            Dict[int, int]: mapping of measured keys to measurement results.
+        """
+
+        left_state = self.states[left_key]
+        right_state = self.states[right_key]
+        assert isinstance(left_state, BellDiagonalState) and isinstance(right_state, BellDiagonalState)
+        assert left_state is not right_state
+
+        coefficients = bell_diagonal_swap(left_state.state, right_state.state)
+
+        # measurement results are uniformly distributed
+        outcome = min(int(meas_samp * 4), 3)
+        left_result, right_result = outcome >> 1, outcome & 1
+        pauli = 2 * right_result + left_result
+        coefficients = coefficients[[i ^ pauli for i in range(4)]]
+
+        new_keys = [k for k in left_state.keys if k != left_key] + [k for k in right_state.keys if k != right_key]
+        self.set(new_keys, coefficients)
+        self.set([left_key], _MEASURED_KETS[left_result])
+        self.set([right_key], _MEASURED_KETS[right_result])
+        return {left_key: left_result, right_key: right_result}
+
+    def purify(self, kept_key: int, meas_key: int, meas_samp: float) -> int:
+        """Method to perform one side of BBPSSW purification on two entangled pairs.
+
+        As in the BBPSSW protocol, both pairs are first twirled to Werner states (of the same fidelity),
+        so that the kept pair has the fidelity given by `BBPSSW.improved_fidelity` on success.
+        The method should be called by both sides of the protocol.
+        The first call determines the measurement results of both sides and updates the kept pair;
+        the second call returns the stored result for the other side.
+
+        Args:
+            kept_key (int): key of qubit from kept pair (control of CNOT gate).
+            meas_key (int): key of qubit from measured pair (target of CNOT gate).
+            meas_samp (float): random sample used for measurement result.
+
+        Returns:
+            int: measurement result for `meas_key`.
+        """
+
+        if meas_key in self._pending_results:
+            return self._pending_results.pop(meas_key)
+
+        kept_state = self.states[kept_key]
+        meas_state = self.states[meas_key]
+        assert isinstance(kept_state, BellDiagonalState) and isinstance(meas_state, BellDiagonalState)
+        assert kept_state is not meas_state
+
+        coefficients, prob_success = bell_diagonal_purify(bell_diagonal_twirl(kept_state.state),
+                                                          bell_diagonal_twirl(meas_state.state))
+        result = 0 if meas_samp < 0.5 else 1
+        meas_samp = 2 * meas_samp - result
+        if meas_samp < prob_success:
+            other_result = result
+            self.set(kept_state.keys, coefficients)
+        else:
+            other_result = 1 - result
+            for key in kept_state.keys:
+                self.set([key], _MEASURED_KETS[0])
+
+        other_key = meas_state.keys[1] if meas_state.keys[0] == meas_key else meas_state.keys[0]
+        self.set([meas_key], _MEASURED_KETS[result])
+        self.set([other_key], _MEASURED_KETS[other_result])
+        self._pending_results[other_key] = other_result
+        return result
+
+    def apply_pauli_channel(self, key: int, probs: Tuple[float, float, float]) -> None:
+        """Method to apply a Pauli channel (e.g. decoherence of a memory) to an entangled qubit.
+
+        Args:
+            key (int): key of qubit.
+            probs (Tuple[float, float, float]): probabilities of X, Y, and Z errors.
+        """
+
+        qstate = self.states[key]
+        assert isinstance(qstate, BellDiagonalState)
+        self.set(qstate.keys, bell_diagonal_pauli_channel(qstate.state, probs))
+
+    def depolarize(self, key: int, prob: float) -> None:
+        """Method to apply a depolarizing channel (replacing the qubit with a maximally mixed state with probability
+        `prob`) to an entangled qubit.
+
+        Args:
+            key (int): key of qubit.
+            prob (float): depolarizing probability.
+        """
+
+        self.apply_pauli_channel(key, (prob / 4, prob / 4, prob / 4))
+
+
 class QuantumManagerDensityFock(QuantumManager):
     """Class to track and manage Fock states with the density matrix formalism."""
 
@@ -423,9 +836,8 @@ class QuantumManagerDensityFock(QuantumManager):
                 Other inputs are passed to the constructor of `DensityState`.
         """
 
-        key = self._least_available
-        self._least_available += 1
-        if state == 'gnd':
+        key = self._new_key()
+        if isinstance(state, str) and state == 'gnd':
             gnd = [1] + [0]*self.truncation
             self.states[key] = DensityState(gnd, [key], truncation=self.truncation)
         else:
@@ -439,35 +851,42 @@ class QuantumManagerDensityFock(QuantumManager):
         """
         raise Exception("run_circuit method of class QuantumManagerDensityFock called")
 
-    def _generate_swap_operator(self, num_systems: int, i: int, j: int):
-        """Helper function to generate swapping unitary.
+    def _combine_states(self, keys: List[int]):
+        """Function to build the composite state containing the given keys (without reordering subsystems).
 
         Args:
-            num_systems (int): number of subsystems in state
-            i (int): index of first subsystem to swap
-            j (int): index of second subsystem to swap
+            keys (List[int]): keys for states to combine.
 
         Returns:
-            Array[int]: unitary swapping operator
+            Tuple(array, List[int]): Tuple containing:
+                1. composite density matrix.
+                2. list of keys corresponding to composite state.
         """
 
-        size = self.dim ** num_systems
-        swap_unitary = zeros((size, size))
+        old_states = []
+        all_keys = []
 
-        for old_index in range(size):
-            old_str = base_repr(old_index, self.dim)
-            old_str = old_str.zfill(num_systems)
-            new_str = ''.join((old_str[:i], old_str[j], old_str[i+1:j], old_str[i], old_str[j+1:]))
-            new_index = int(new_str, base=self.dim)
-            swap_unitary[new_index, old_index] = 1
+        # go through keys and get all unique qstate objects
+        for key in keys:
+            qstate = self.states[key]
+            if qstate.keys[0] not in all_keys:
+                old_states.append(qstate.state)
+                all_keys += qstate.keys
 
-        return swap_unitary
+        # construct compound state
+        if len(old_states) == 1:
+            return old_states[0], all_keys
+        new_state = [1]
+        for state in old_states:
+            new_state = kron(new_state, state)
+
+        return new_state, all_keys
 
     def _prepare_state(self, keys: List[int]):
         """Function to prepare states at given keys for operator application.
 
         Will take composite quantum state and swap subsystems to correspond with listed keys.
-        Should not be called directly, but from method to apply operator or measure state.
+        Operators and measurements of the manager act on subsystem axes directly and do not require this reordering.
 
         Args:
             keys (List[int]): keys for states to apply operator to.
@@ -478,20 +897,7 @@ class QuantumManagerDensityFock(QuantumManager):
                 2. list of keys corresponding to new state.
         """
 
-        old_states = []
-        all_keys = []
-
-        # go through keys and get all unique qstate objects
-        for key in keys:
-            qstate = self.states[key]
-            if qstate.keys[0] not in all_keys:
-                old_states.append(qstate.state)
-                all_keys += qstate.keys
-
-        # construct compound state
-        new_state = [1]
-        for state in old_states:
-            new_state = kron(new_state, state)
+        new_state, all_keys = self._combine_states(keys)
 
         # apply any necessary swaps to order keys
         if len(keys) > 1:
@@ -501,33 +907,25 @@ class QuantumManagerDensityFock(QuantumManager):
             if start_idx + len(keys) > len(all_keys):
                 start_idx = len(all_keys) - len(keys)
 
-            for i, key in enumerate(keys):
-                i = i + start_idx
-                j = all_keys.index(key)
-                if j != i:
-                    swap_unitary = self._generate_swap_operator(len(all_keys), i, j)
-                    new_state = swap_unitary @ new_state @ swap_unitary.T
-                    all_keys[i], all_keys[j] = all_keys[j], all_keys[i]
+            all_keys, perm = self._swap_qubits(all_keys, keys, start_idx)
+            if perm != sorted(perm):
+                new_state = permute_density(new_state, perm, self.dim)
 
         return new_state, all_keys
 
-    def _prepare_operator(self, all_keys: List[int], keys: List[int], operator) -> array:
-        # pad operator with identity
-        left_dim = self.dim ** all_keys.index(keys[0])
-        right_dim = self.dim ** (len(all_keys) - all_keys.index(keys[-1]) - 1)
-        prepared_operator = operator
+    def apply_operator(self, operator: array, keys: List[int]):
+        """Method to apply an operator to the subsystems at given keys.
 
-        if left_dim > 0:
-            prepared_operator = kron(identity(left_dim), prepared_operator)
-        if right_dim > 0:
-            prepared_operator = kron(prepared_operator, identity(right_dim))
+        The operator is contracted with the subsystem axes of the composite state and is not padded with identity.
 
-        return prepared_operator
+        Args:
+            operator (array): operator acting on `len(keys)` subsystems (in order of `keys`).
+            keys (List[int]): keys of subsystems to apply operator to.
+        """
 
-    def apply_operator(self, operator: array, keys: List[int]):
-        prepared_state, all_keys = self._prepare_state(keys)
-        prepared_operator = self._prepare_operator(all_keys, keys, operator)
-        new_state = prepared_operator @ prepared_state @ prepared_operator.conj().T
+        state, all_keys = self._combine_states(keys)
+        indices = [all_keys.index(key) for key in keys]
+        new_state = apply_channel_density(state, [operator], indices, len(all_keys), self.dim)
         self.set(all_keys, new_state)
 
     def set(self, keys: List[int], state: List[List[complex]]) -> None:
@@ -566,7 +964,9 @@ class QuantumManagerDensityFock(QuantumManager):
     def measure(self, keys: List[int], povms: List[array], meas_samp: float) -> int:
         """Method to measure subsystems at given keys in POVM formalism.
 
-        Serves as wrapper for private `_measure` method, performing quantum manager specific operations.
+        POVM operators act on the measured subsystems alone (in order of `keys`), which need not be consecutive.
+        Measured subsystems are destroyed, and the remaining subsystems of the composite state
+        are set to their post-measurement state.
 
         Args:
             keys (List[int]): list of keys to measure.
@@ -577,129 +977,41 @@ class QuantumManagerDensityFock(QuantumManager):
             int: measurement as index of matching POVM in supplied tuple.
         """
 
-        new_state, all_keys = self._prepare_state(keys)
-        return self._measure(new_state, keys, all_keys, povms, meas_samp)
-
-    def _measure(self, state: List[List[complex]], keys: List[int],
-                 all_keys: List[int], povms: List[array], meas_samp: float) -> int:
-        """Method to measure subsystems at given keys in POVM formalism.
-
-        Modifies quantum state of all qubits given by all_keys, post-measurement operator determined
-        by measurement operators which are chosen as square root of POVM operators.
-
-        Args:
-            state (List[List[complex]]): state to measure.
-            keys (List[int]): list of keys to measure.
-            all_keys (List[int]): list of all keys corresponding to state.
-            povms: (List[array]): list of POVM operators to use for measurement.
-            meas_samp (float): random measurement sample to use for computing resultant state.
-
-        Returns:
-            int: measurement as index of matching POVM in supplied tuple.
-        """
-
-        state_tuple = tuple(map(tuple, state))
-        povm_tuple = tuple([tuple(map(tuple, povm)) for povm in povms])
-        new_state = None
-        result = 0
-
-        # calculate meas probabilities and projected states
-        if len(keys) == 1:
-            if len(all_keys) == 1:
-                states, probs = measure_state_with_cache_fock_density(state_tuple, povm_tuple)
-
-            else:
-                key = keys[0]
-                num_states = len(all_keys)
-                state_index = all_keys.index(key)
-                states, probs = \
-                    measure_entangled_state_with_cache_fock_density(state_tuple, state_index, num_states, povm_tuple,
-                                                                    self.truncation)
-
-        else:
-            indices = tuple([all_keys.index(key) for key in keys])
-            states, probs = \
-                measure_multiple_with_cache_fock_density(state_tuple, indices, len(all_keys), povm_tuple,
-                                                         self.truncation)
+        state, all_keys = self._combine_states(keys)
+        indices = [all_keys.index(key) for key in keys]
+        grouped_state = density_group_subsystems(state, indices, len(all_keys), self.dim)
+        probs = povm_probabilities_density(grouped_state, povms)
 
         # calculate result based on measurement sample.
         prob_sum = cumsum(probs)
-        for i, (output_state, p) in enumerate(zip(states, prob_sum)):
+        result = 0
+        for i, p in enumerate(prob_sum):
             if meas_samp < p:
-                new_state = output_state
                 result = i
                 break
 
-        """
-        # for potential future work
-        result_digits = [int(x) for x in base_repr(result, base=self.dim)[2:]]
-        while len(result_digits) < len(keys):
-            result_digits.insert(0, 0)
-
-        # assign measured states
-        for key, result in zip(keys, result_digits):
-            state = [0] * self.dim
-            state[result] = 1
-            self.set([key], state)
-        """
-
         for key in keys:
             self.states[key] = None  # clear the stored state at key (particle destructively measured)
 
         # assign remaining state
         if len(keys) < len(all_keys):
-            indices = tuple([all_keys.index(key) for key in keys])
-            new_state_tuple = tuple(map(tuple, new_state))
-            remaining_state = density_partial_trace(new_state_tuple, indices, len(all_keys), self.truncation)
+            remaining_state = povm_remaining_density(grouped_state, povms[result])
             remaining_keys = [key for key in all_keys if key not in keys]
             self.set(remaining_keys, remaining_state)
 
         return result
 
-    def _build_loss_kraus_operators(self, loss_rate: float, all_keys: List[int], key: int) -> List[array]:
-        """Method to build Kraus operators of a generalized amplitude damping channel.
-
-        This represents the effect of photon loss.
-
-        Args:
-            loss_rate (float): loss rate for the quantum channel.
-            all_keys (List[int]): list of all keys in affected state.
-            key (int): key for subsystem experiencing loss.
-
-        Returns:
-            List[array]: list of generated Kraus operators.
-        """
-
-        assert 0 <= loss_rate <= 1
-        kraus_ops = []
-
-        for k in range(self.dim):
-            total_kraus_op = zeros((self.dim ** len(all_keys), self.dim ** len(all_keys)))
-
-            for n in range(k, self.dim):
-                coeff = sqrt(binom(n, k)) * sqrt(((1-loss_rate) ** (n-k)) * (loss_rate ** k))
-                single_op = zeros((self.dim, self.dim))
-                single_op[n-k, n] = 1
-                total_op = self._prepare_operator(all_keys, [key], single_op)
-                total_kraus_op += coeff * total_op
-
-            kraus_ops.append(total_kraus_op)
-
-        return kraus_ops
-
     def add_loss(self, key, loss_rate):
         """Method to apply generalized amplitude damping channel on a *single* subspace corresponding to `key`.
 
+        Kraus operators of the channel are cached per `(loss_rate, truncation)`.
+
         Args:
             key (int): key for the subspace experiencing loss.
             loss_rate (float): loss rate for the quantum channel.
         """
 
-        prepared_state, all_keys = self._prepare_state([key])
-        kraus_ops = self._build_loss_kraus_operators(loss_rate, all_keys, key)
-        output_state = zeros(prepared_state.shape, dtype=complex)
-
-        for kraus_op in kraus_ops:
-            output_state += kraus_op @ prepared_state @ kraus_op.conj().T
-
+        state, all_keys = self._combine_states([key])
+        kraus_ops = loss_kraus_operators(loss_rate, self.truncation)
+        output_state = apply_channel_density(state, kraus_ops, [all_keys.index(key)], len(all_keys), self.dim)
         self.set(all_keys, output_state)
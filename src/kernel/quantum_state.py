@@ -1,11 +1,13 @@
 """Definition of the quantum state classes.
 
 This module defines the classes used to track quantum states in SeQUeNCe.
-These include 2 classes used by a quantum manager, and one used for individual photons:
+These include 4 classes used by a quantum manager, and one used for individual photons:
 
 1. The `KetState` class represents the ket vector formalism and is used by a quantum manager.
 2. The `DensityState` class represents the density matrix formalism and is also used by a quantum manager.
-3. The `FreeQuantumState` class uses the ket vector formalism, and is used by individual photons (not the quantum manager).
+3. The `StabilizerState` class represents the stabilizer formalism and is also used by a quantum manager.
+4. The `BellDiagonalState` class represents entangled pairs by Bell diagonal coefficients and is also used by a quantum manager.
+5. The `FreeQuantumState` class uses the ket vector formalism, and is used by individual photons (not the quantum manager).
 """
 
 from abc import ABC
@@ -174,6 +176,76 @@ class DensityState(State):
         self.keys = keys
 
 
+class StabilizerState(State):
+    """Class to represent an individual quantum state as a stabilizer tableau.
+
+    Only stabilizer states are supported.
+    The tableau has one row per stabilizer generator, holding the x bits, z bits, and sign bit of the generator
+    (see `quantum_utils.stabilizer_rowsum`).
+
+    Attributes:
+        state (np.array): stabilizer tableau, of shape (n, 2n + 1) with n = len(keys).
+        keys (List[int]): list of keys (subsystems) associated with this state.
+    """
+
+    def __init__(self, state, keys: List[int]):
+        """Constructor for stabilizer state class.
+
+        Args:
+            state: stabilizer tableau (2-dimensional), or ket vector of a stabilizer state (1-dimensional).
+            keys (List[int]): list of keys to this state in quantum manager.
+        """
+
+        super().__init__()
+        state = array(state)
+        if state.ndim == 1:
+            state = ket_to_stabilizer(state)
+
+        assert state.shape == (len(keys), 2 * len(keys) + 1), \
+            "Tableau should have shape (n, 2n + 1), where n is the number of keys. " \
+            "Tableau shape: {}, num keys: {}".format(state.shape, len(keys))
+
+        self.state = state.astype('uint8')
+        self.keys = keys
+
+    def to_ket(self) -> array:
+        """Method to get the ket vector of the state (up to global phase).
+
+        Uses dense matrices, so should only be used for states of few qubits.
+        """
+
+        return stabilizer_to_ket(self.state)
+
+
+class BellDiagonalState(State):
+    """Class to represent an entangled pair of qubits as a Bell diagonal state.
+
+    Attributes:
+        state (np.array): coefficients of the Bell states, in order (phi+, phi-, psi+, psi-).
+        keys (List[int]): list of keys (subsystems) associated with this state (length 2).
+    """
+
+    def __init__(self, coefficients: List[float], keys: List[int]):
+        """Constructor for Bell diagonal state class.
+
+        Args:
+            coefficients (List[float]): coefficients of the Bell states, in order (phi+, phi-, psi+, psi-).
+            keys (List[int]): list of keys to this state in quantum manager.
+        """
+
+        super().__init__()
+        coefficients = array(coefficients, dtype=float)
+
+        # check formatting
+        assert len(keys) == 2, "Bell diagonal states should have 2 keys"
+        assert len(coefficients) == 4, "Bell diagonal states should have 4 coefficients"
+        assert all(coefficients >= -1e-9), "Bell diagonal coefficients must be non-negative"
+        assert abs(coefficients.sum() - 1) < 1e-5, "Bell diagonal coefficients must sum to 1"
+
+        self.state = coefficients
+        self.keys = keys
+
+
 class FreeQuantumState(State):
     """Class used by photons to track internal quantum states.
 
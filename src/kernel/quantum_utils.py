@@ -1,6 +1,7 @@
 """This module defines functions and objects to manipulate quantum states.
 
-This includes cached measurement of quantum states, and certain useful operators.
+This includes measurement kernels for quantum states, certain useful operators,
+and helpers to apply gates and subsystem permutations as tensor operations.
 These should not be used directly, but accessed by a QuantumManager instance or by a quantum state.
 """
 
@@ -8,8 +9,10 @@ from functools import lru_cache
 from typing import List, Tuple
 from math import sqrt
 
-from numpy import array, kron, identity, zeros, trace, outer, eye
-from scipy.linalg import sqrtm
+from numpy import array, asarray, kron, identity, zeros, trace, outer, eye, tensordot, moveaxis, ndarray, vdot, clip,\
+    diagonal, pi, log2, einsum, allclose
+from numpy.linalg import svd
+from scipy.special import binom
 
 
 a = array([[0, 1], [0, 0]])
@@ -19,6 +22,62 @@ povm_0 = (1/2) * (kron(a_dag @ a, eye(2)) - 1j*kron(a, a_dag) + 1j*kron(a_dag, a
 povm_1 = (1/2) * (kron(a_dag @ a, eye(2)) + 1j*kron(a, a_dag) - 1j*kron(a_dag, a) + kron(eye(2), a_dag @ a))
 
 
+def apply_gate(tensor: ndarray, gate: ndarray, indices: List[int], dim: int = 2) -> ndarray:
+    """Applies a gate to the given axes of a state tensor by tensor contraction.
+
+    The tensor should have one axis of length `dim` per subsystem (e.g. a ket of n qubits reshaped to (2,) * n).
+    Axes not listed in `indices` are left untouched, so no padding with identity matrices is required.
+
+    Args:
+        tensor (ndarray): state tensor.
+        gate (ndarray): gate matrix of shape (dim ** k, dim ** k) acting on k subsystems.
+        indices (List[int]): axes of the tensor the gate acts on (in order of the gate's subsystems).
+        dim (int): dimension of each subsystem (default 2).
+
+    Returns:
+        ndarray: tensor with the same shape as the input after applying the gate.
+    """
+
+    k = len(indices)
+    gate = gate.reshape((dim,) * (2 * k))
+    output = tensordot(gate, tensor, axes=(list(range(k, 2 * k)), list(indices)))
+    return moveaxis(output, list(range(k)), list(indices))
+
+
+def permute_ket(state: ndarray, perm: List[int], dim: int = 2) -> ndarray:
+    """Reorders the subsystems of a ket vector with an axis transpose.
+
+    Args:
+        state (ndarray): ket vector of `len(perm)` subsystems.
+        perm (List[int]): new subsystem order; subsystem `i` of the output is subsystem `perm[i]` of the input.
+        dim (int): dimension of each subsystem (default 2).
+
+    Returns:
+        ndarray: permuted ket vector.
+    """
+
+    num = len(perm)
+    return array(state).reshape((dim,) * num).transpose(perm).reshape(dim ** num)
+
+
+def permute_density(state: ndarray, perm: List[int], dim: int = 2) -> ndarray:
+    """Reorders the subsystems of a density matrix with an axis transpose of both rows and columns.
+
+    Args:
+        state (ndarray): density matrix of `len(perm)` subsystems.
+        perm (List[int]): new subsystem order; subsystem `i` of the output is subsystem `perm[i]` of the input.
+        dim (int): dimension of each subsystem (default 2).
+
+    Returns:
+        ndarray: permuted density matrix.
+    """
+
+    num = len(perm)
+    axes = list(perm) + [num + p for p in perm]
+    size = dim ** num
+    return array(state).reshape((dim,) * (2 * num)).transpose(axes).reshape((size, size))
+
+
 @lru_cache(maxsize=1000)
 def measure_state_with_cache(state: Tuple[complex, complex], basis: Tuple[Tuple[complex]]) -> float:
 
@@ -97,320 +156,692 @@ def measure_multiple_with_cache(state: Tuple[complex], basis: Tuple[Tuple[comple
     return return_states, probabilities
 
 
-@lru_cache(maxsize=1000)
-def measure_state_with_cache_ket(state: Tuple[complex, complex]) -> float:
+def measure_state_ket(state: ndarray) -> float:
+    """Computes the probability of measuring a single qubit ket in the |0> state.
 
-    state = array(state)
-    M0 = array([[1, 0], [0, 0]], dtype=complex)
+    Args:
+        state (ndarray): ket vector of one qubit.
 
-    # probability of measuring basis[0]
-    prob_0 = (state.conj().T @ M0 @ state).real
-    return prob_0
+    Returns:
+        float: probability of measuring 0.
+    """
 
+    return abs(state[0]) ** 2
 
-@lru_cache(maxsize=1000)
-def measure_entangled_state_with_cache_ket(state: Tuple[complex], state_index: int, num_states: int) \
-        -> Tuple[array, array, float]:
 
-    state = array(state)
+def measure_entangled_state_ket(state: ndarray, state_index: int, num_states: int) \
+        -> Tuple[ndarray, ndarray, float]:
+    """Measures one qubit of a multi-qubit ket in the computational basis.
 
-    # generate projectors
-    projector0 = [1]
-    projector1 = [1]
-    for i in range(num_states):
-        if i == state_index:
-            projector0 = kron(projector0, [1, 0])
-            projector1 = kron(projector1, [0, 1])
-        else:
-            projector0 = kron(projector0, identity(2))
-            projector1 = kron(projector1, identity(2))
+    The measured qubit is projected out of the returned states.
 
-    # probability of measuring basis[0]
-    prob_0 = (state.conj().T @ projector0.T @ projector0 @ state).real
+    Args:
+        state (ndarray): ket vector of `num_states` qubits.
+        state_index (int): index of the measured qubit.
+        num_states (int): number of qubits in the state.
+
+    Returns:
+        Tuple[ndarray, ndarray, float]: Tuple containing:
+            1. normalized state of remaining qubits for result 0 (None if impossible).
+            2. normalized state of remaining qubits for result 1 (None if impossible).
+            3. probability of result 0.
+    """
+
+    state = asarray(state).reshape((2 ** state_index, 2, 2 ** (num_states - state_index - 1)))
+    projected_0 = state[:, 0, :].reshape(-1)
+    projected_1 = state[:, 1, :].reshape(-1)
+    prob_0 = vdot(projected_0, projected_0).real
 
     if prob_0 >= 1:
         state1 = None
     else:
-        state1 = (projector1 @ state) / sqrt(1 - prob_0)
+        state1 = projected_1 / sqrt(1 - prob_0)
 
     if prob_0 <= 0:
         state0 = None
     else:
-        state0 = (projector0 @ state) / sqrt(prob_0)
+        state0 = projected_0 / sqrt(prob_0)
 
     return state0, state1, prob_0
 
 
-@lru_cache(maxsize=1000)
-def measure_multiple_with_cache_ket(state: Tuple[complex], num_states: int, length_diff: int) \
-        -> Tuple[List[array], List[float]]:
+def measure_multiple_ket(state: ndarray, num_states: int, length_diff: int) -> Tuple[List[ndarray], ndarray]:
+    """Measures the first qubits of a ket in the computational basis.
 
-    state = array(state)
-    basis_count = 2 ** num_states
+    The measured qubits are projected out of the returned states.
 
-    # construct measurement operators, projectors, and probabilities of measurement
-    projectors = [None] * basis_count
-    probabilities = [0] * basis_count
-    for i in range(basis_count):
-        M = zeros((1, basis_count), dtype=complex)  # measurement operator
-        M[0, i] = 1
-        projectors[i] = kron(M, identity(2 ** length_diff))  # projector
-        probabilities[i] = (state.conj().T @ projectors[i].T @ projectors[i] @ state).real
-        if probabilities[i] < 0:
-            probabilities[i] = 0
-        if probabilities[i] > 1:
-            probabilities[i] = 1
+    Args:
+        state (ndarray): ket vector of `num_states + length_diff` qubits.
+        num_states (int): number of measured qubits (at the front of the state).
+        length_diff (int): number of unmeasured qubits.
 
-    return_states = [None] * len(projectors)
-    for i, proj in enumerate(projectors):
-        # project to new state
-        if probabilities[i] > 0:
-            new_state = (proj @ state) / sqrt(probabilities[i])
-            new_state = tuple(new_state)
-            return_states[i] = new_state
+    Returns:
+        Tuple[List[ndarray], ndarray]: Tuple containing:
+            1. normalized state of remaining qubits for each result (None if impossible).
+            2. probability of each result.
+    """
 
+    state = asarray(state).reshape((2 ** num_states, 2 ** length_diff))
+    probabilities = clip((state.real ** 2 + state.imag ** 2).sum(axis=1), 0, 1)
+    return_states = [row / sqrt(prob) if prob > 0 else None for row, prob in zip(state, probabilities)]
     return return_states, probabilities
 
 
-@lru_cache(maxsize=1000)
-def measure_state_with_cache_density(state: Tuple[Tuple[complex, complex]]) -> float:
+def ket_factorize(state: ndarray, num_qubits: int, atol: float = 1e-9) -> List[Tuple[List[int], ndarray]]:
+    """Splits a ket vector into a product of kets of independent groups of qubits.
 
-    state = array(state)
-    M0 = array([[1, 0], [0, 0]], dtype=complex)
+    Qubits with correlated two-qubit reduced states must belong to the same group,
+    which gives candidate groups as connected components.
+    Each candidate group is split from the state only if it has Schmidt rank 1 across the cut;
+    candidate groups that cannot be split are merged into a single group.
 
-    # probability of measuring basis[0]
-    prob_0 = trace(state @ M0).real
-    return prob_0
+    Args:
+        state (ndarray): ket vector of `num_qubits` qubits.
+        num_qubits (int): number of qubits in the state.
+        atol (float): absolute tolerance for reduced states and singular values (default 1e-9).
 
+    Returns:
+        List[Tuple[List[int], ndarray]]: list of (qubit indices, ket) pairs.
+            The state is the tensor product of the kets (up to qubit order);
+            a single pair is returned if the state cannot be split.
+    """
 
-@lru_cache(maxsize=1000)
-def measure_entangled_state_with_cache_density(state: Tuple[Tuple[complex]], state_index: int, num_states: int) \
-        -> Tuple[array, array, float]:
+    tensor = asarray(state).reshape((2,) * num_qubits)
+    groups = list(range(num_qubits))  # union-find parents
+
+    def find(i):
+        while groups[i] != i:
+            groups[i] = groups[groups[i]]
+            i = groups[i]
+        return i
+
+    # single-qubit reduced states; qubits with pure reduced states are unentangled
+    singles = [tensordot(tensor, tensor.conj(), axes=([j for j in range(num_qubits) if j != i],) * 2)
+               for i in range(num_qubits)]
+    mixed = [i for i in range(num_qubits) if trace(singles[i] @ singles[i]).real < 1 - atol]
+
+    for n, i in enumerate(mixed):
+        for j in mixed[n + 1:]:
+            if find(i) == find(j):
+                continue
+            others = [k for k in range(num_qubits) if k != i and k != j]
+            pair = tensordot(tensor, tensor.conj(), axes=(others, others)).reshape((4, 4))
+            if not allclose(pair, kron(singles[i], singles[j]), atol=atol):
+                groups[find(j)] = find(i)
+
+    components = {}
+    for i in range(num_qubits):
+        components.setdefault(find(i), []).append(i)
+    if len(components) == 1:
+        return [(list(range(num_qubits)), asarray(state))]
+
+    # split candidate groups from the remaining state
+    factors = []
+    remaining = list(range(num_qubits))
+    candidates = list(components.values())
+    for indices in candidates[:-1]:
+        axes = [remaining.index(i) for i in indices]
+        rest = [k for k in range(len(remaining)) if k not in axes]
+        matrix = tensor.transpose(axes + rest).reshape((2 ** len(indices), -1))
+        u, s, vh = svd(matrix, full_matrices=False)
+        if s.size > 1 and s[1] > atol:
+            continue
+        factors.append((indices, u[:, 0]))
+        remaining = [remaining[k] for k in rest]
+        tensor = (s[0] * vh[0]).reshape((2,) * len(remaining))
+
+    # remaining state holds the last candidate group and groups that could not be split
+    factors.append((remaining, tensor.reshape(2 ** len(remaining))))
+    return factors
+
+
+def measure_state_density(state: ndarray) -> float:
+    """Computes the probability of measuring a single qubit density matrix in the |0> state.
 
-    state = array(state)
+    Args:
+        state (ndarray): density matrix of one qubit.
 
-    # generate projectors
-    projector0 = [1]
-    projector1 = [1]
-    for i in range(num_states):
-        if i == state_index:
-            projector0 = kron(projector0, [[1, 0], [0, 0]])
-            projector1 = kron(projector1, [[0, 0], [0, 1]])
-        else:
-            projector0 = kron(projector0, identity(2))
-            projector1 = kron(projector1, identity(2))
+    Returns:
+        float: probability of measuring 0.
+    """
 
-    # probability of measuring basis[0]
-    prob_0 = trace(state @ projector0).real
+    return asarray(state)[0, 0].real
+
+
+def measure_entangled_state_density(state: ndarray, state_index: int, num_states: int) \
+        -> Tuple[ndarray, ndarray, float]:
+    """Measures one qubit of a multi-qubit density matrix in the computational basis.
+
+    The returned states keep all qubits, with the measured qubit projected to the result.
+
+    Args:
+        state (ndarray): density matrix of `num_states` qubits.
+        state_index (int): index of the measured qubit.
+        num_states (int): number of qubits in the state.
+
+    Returns:
+        Tuple[ndarray, ndarray, float]: Tuple containing:
+            1. normalized post-measurement state for result 0 (None if impossible).
+            2. normalized post-measurement state for result 1 (None if impossible).
+            3. probability of result 0.
+    """
+
+    state = asarray(state)
+    left = 2 ** state_index
+    right = 2 ** (num_states - state_index - 1)
+    tensor = state.reshape((left, 2, right, left, 2, right))
+    prob_0 = diagonal(state).real.reshape((left, 2, right))[:, 0, :].sum()
+
+    def project(result, prob):
+        output = zeros(tensor.shape, dtype=complex)
+        output[:, result, :, :, result, :] = tensor[:, result, :, :, result, :] / prob
+        return output.reshape(state.shape)
 
     if prob_0 >= 1:
         state1 = None
     else:
-        state1 = (projector1 @ state @ projector1) / (1 - prob_0)
+        state1 = project(1, 1 - prob_0)
 
     if prob_0 <= 0:
         state0 = None
     else:
-        state0 = (projector0 @ state @ projector0) / prob_0
+        state0 = project(0, prob_0)
 
     return state0, state1, prob_0
 
 
-@lru_cache(maxsize=1000)
-def measure_multiple_with_cache_density(state: Tuple[Tuple[complex]], num_states: int, length_diff: int) \
-        -> Tuple[List[array], List[float]]:
+def measure_multiple_density(state: ndarray, num_states: int, length_diff: int) -> Tuple[List[ndarray], ndarray]:
+    """Measures the first qubits of a density matrix in the computational basis.
 
-    state = array(state)
-    basis_count = 2 ** num_states
+    The returned states keep all qubits, with the measured qubits projected to the result.
 
-    # construct measurement operators, projectors, and probabilities of measurement
-    projectors = [None] * basis_count
-    probabilities = [0] * basis_count
-    for i in range(basis_count):
-        M = zeros((basis_count, basis_count), dtype=complex)  # measurement operator
-        M[i, i] = 1
-        projectors[i] = kron(M, identity(2 ** length_diff))  # projector
-        probabilities[i] = trace(state @ projectors[i]).real
-        if probabilities[i] < 0:
-            probabilities[i] = 0
-        if probabilities[i] > 1:
-            probabilities[i] = 1
+    Args:
+        state (ndarray): density matrix of `num_states + length_diff` qubits.
+        num_states (int): number of measured qubits (at the front of the state).
+        length_diff (int): number of unmeasured qubits.
 
-    return_states = [None] * len(projectors)
-    for i, proj in enumerate(projectors):
-        # project to new state
-        if probabilities[i] > 0:
-            new_state = (proj @ state @ proj) / probabilities[i]
-            new_state = tuple(new_state)
-            return_states[i] = new_state
+    Returns:
+        Tuple[List[ndarray], ndarray]: Tuple containing:
+            1. normalized post-measurement state for each result (None if impossible).
+            2. probability of each result.
+    """
+
+    state = asarray(state)
+    basis_count = 2 ** num_states
+    remaining = 2 ** length_diff
+    tensor = state.reshape((basis_count, remaining, basis_count, remaining))
+    probabilities = clip(diagonal(state).real.reshape((basis_count, remaining)).sum(axis=1), 0, 1)
+
+    return_states = [None] * basis_count
+    for i, prob in enumerate(probabilities):
+        if prob > 0:
+            output = zeros(tensor.shape, dtype=complex)
+            output[i, :, i, :] = tensor[i, :, i, :] / prob
+            return_states[i] = output.reshape(state.shape)
 
     return return_states, probabilities
 
 
 @lru_cache(maxsize=1000)
-def measure_state_with_cache_fock_density(state: Tuple[Tuple[complex]], povms: Tuple[Tuple[Tuple[complex]]]) \
-        -> Tuple[List[array], List[float]]:
-    state = array(state)
-    povms = [array(povm) for povm in povms]
+def loss_kraus_operators(loss_rate: float, truncation: int = 1) -> Tuple[ndarray, ...]:
+    """Builds Kraus operators of a generalized amplitude damping channel on a single Fock subsystem.
 
-    # probabilities of getting different outcomes according to POVM operators
-    prob_list = [trace(state @ povm).real for povm in povms]
-    state_list = []
+    This represents the effect of photon loss.
+    The operators act on the subsystem alone (of dimension `truncation + 1`) and are cached per input;
+    the returned arrays are read-only.
 
-    # get output states
-    for i in range(len(prob_list)):
-        if prob_list[i] <= 0:
-            state_post_meas = None
-        else:
-            measure_op = sqrtm(povms[i])
-            state_post_meas = (measure_op @ state @ measure_op) / prob_list[i]
+    Args:
+        loss_rate (float): loss rate for the quantum channel.
+        truncation (int): fock space truncation, 1 for qubit system (default 1).
 
-        state_list.append(state_post_meas)
+    Returns:
+        Tuple[ndarray, ...]: Kraus operator for the loss of each number of photons.
+    """
 
-    return state_list, prob_list
+    assert 0 <= loss_rate <= 1
+    dim = truncation + 1
+    kraus_ops = []
 
+    for k in range(dim):
+        kraus_op = zeros((dim, dim))
+        for n in range(k, dim):
+            kraus_op[n - k, n] = sqrt(binom(n, k)) * sqrt(((1 - loss_rate) ** (n - k)) * (loss_rate ** k))
+        kraus_op.setflags(write=False)
+        kraus_ops.append(kraus_op)
 
-@lru_cache(maxsize=1000)
-def measure_entangled_state_with_cache_fock_density(state: Tuple[Tuple[complex]], system_index: int, num_systems: int,
-                                                    povms: Tuple[Tuple[Tuple[complex]]], truncation: int = 1) \
-        -> Tuple[List[array], List[float]]:
+    return tuple(kraus_ops)
 
-    """Measure one subsystem of a larger composite system.
 
-    The measurement SHOULD NOT be entangling measurement, and thus POVM operators should be precisely consisted of
-    operators on the subsystem's Hilbert space alone.
+def apply_channel_density(state: ndarray, kraus_ops: List[ndarray], indices: List[int], num_systems: int,
+                          dim: int = 2) -> ndarray:
+    """Applies a quantum channel to the given subsystems of a density matrix by tensor contraction.
+
+    Each Kraus operator K is contracted with the row axes (K) and column axes (K^*) of the listed subsystems,
+    so operators are never padded with identity matrices.
 
     Args:
-        state (Tuple[Tuple[complex]]): state to measure
-        system_index (int): index of measured subsystem within state.
-        num_systems (int): number of total systems in the state.
-        povms (Tuple[Tuple[Tuple[complex]]]): tuple listing all POVM operators to use for measurement
-        truncation (int): fock space truncation, 1 for qubit system (default 1).
+        state (ndarray): density matrix of `num_systems` subsystems.
+        kraus_ops (List[ndarray]): Kraus operators acting on `len(indices)` subsystems.
+        indices (List[int]): subsystems the channel acts on (in order of the operators' subsystems).
+        num_systems (int): number of total subsystems in the state.
+        dim (int): dimension of each subsystem (default 2).
 
     Returns:
-        Tuple[List[array], List[float]]: tuple with two sub-lists.
-            The first lists each output state, corresponding with the measurement of each POVM.
-            The second lists the probability for each measurement.
+        ndarray: density matrix after the channel.
     """
 
-    state = array(state)
-    povms = [array(povm) for povm in povms]
-
-    # generate POVM operators on total Hilbert space
-    povm_list = []
-    left_dim = (truncation + 1) ** system_index
-    right_dim = (truncation + 1) ** (num_systems - system_index - 1)
-    for povm in povms:
-        povm_tot = kron(kron(identity(left_dim), povm), identity(right_dim))
-        povm_list.append(povm_tot)
-
-    # list of probabilities of getting different outcomes from POVM
-    prob_list = [trace(state @ povm).real for povm in povm_list]
-    state_list = []
-
-    for i in range(len(prob_list)):
-        if prob_list[i] <= 0:
-            state_post_meas = None
-        else:
-            measure_op = sqrtm(povm_list[i])
-            state_post_meas = (measure_op @ state @ measure_op) / prob_list[i]
+    size = dim ** num_systems
+    tensor = asarray(state).reshape((dim,) * (2 * num_systems))
+    col_indices = [num_systems + i for i in indices]
+    output = zeros(tensor.shape, dtype=complex)
+    for kraus_op in kraus_ops:
+        kraus_op = asarray(kraus_op)
+        output += apply_gate(apply_gate(tensor, kraus_op, indices, dim), kraus_op.conj(), col_indices, dim)
+    return output.reshape((size, size))
+
 
-        state_list.append(state_post_meas)
+def density_group_subsystems(state: ndarray, indices: List[int], num_systems: int, dim: int = 2) -> ndarray:
+    """Reshapes a density matrix to separate the given subsystems from the rest.
 
-    return state_list, prob_list
+    Args:
+        state (ndarray): density matrix of `num_systems` subsystems.
+        indices (List[int]): subsystems to group (in order).
+        num_systems (int): number of total subsystems in the state.
+        dim (int): dimension of each subsystem (default 2).
 
+    Returns:
+        ndarray: 4-dimensional tensor with axes (grouped row, remaining row, grouped column, remaining column).
+    """
 
-@lru_cache(maxsize=1000)
-def measure_multiple_with_cache_fock_density(state: Tuple[Tuple[complex]], indices: Tuple[int], num_systems: int,
-                                             povms: Tuple[Tuple[Tuple[complex]]], truncation: int = 1) \
-        -> Tuple[List[array], List[float]]:
+    order = list(indices) + [i for i in range(num_systems) if i not in indices]
+    axes = order + [num_systems + i for i in order]
+    group_dim = dim ** len(indices)
+    remaining_dim = dim ** (num_systems - len(indices))
+    tensor = asarray(state).reshape((dim,) * (2 * num_systems)).transpose(axes)
+    return tensor.reshape((group_dim, remaining_dim, group_dim, remaining_dim))
 
-    """Measure multiple subsystems of a larger composite system.
 
-    Should be called by Quantum Managers.
-    This function will facilitate entangling measurement, e.g. BSM with two photon detectors behind a beamsplitter.
-    Such measurement operators are consisted of mixed operators on different subsystems' Hilbert spaces.
-    For current implementation, the Hilbert space on which those mixed operators act on is separated from the rest of
-    the total Hilbert space, and we assume that the involved subsystems have already been moved close in terms of keys.
-    i.e., elements in `indices` argument are no less than 0 and no greater than `num_systems`
-    (relative indices w.r.t. the measured state), and the elements MUST BE consecutive.
+def povm_probabilities_density(grouped_state: ndarray, povms: List[ndarray]) -> ndarray:
+    """Computes outcome probabilities of a POVM measurement on grouped subsystems.
 
-    E.g. For a total system consisted of 4 subsystems (0, 1, 2, 3) each with dimension d,
-    if the entangling measurement happens on (1, 2), then measurement operators on total space will be constructed as
-        O_tot = kron(kron(identity(d), O), identity(d)),
-    where the measurement operator on (1, 2) subspace needs to be generated beforehand to feed in the function.
+    Only the reduced state of the measured subsystems is formed,
+    so POVM operators are never padded with identity matrices.
 
     Args:
-        state (Tuple[Tuple[complex]]): state to measure.
-        indices (Tuple[int]): indices within combined state to measure.
-        num_systems (int): number of total systems in the state.
-        povms (Tuple[Tuple[Tuple[complex]]]): tuple listing all POVM operators to use for measurement.
-        truncation (int): fock space truncation, 1 for qubit system (default 1).
+        grouped_state (ndarray): state tensor from `density_group_subsystems` (measured subsystems grouped).
+        povms (List[ndarray]): POVM operators acting on the grouped subsystems.
 
     Returns:
-        Tuple[List[array], List[float]]: tuple with two sub-lists.
-            The first lists each output state, corresponding with the measurement of each POVM.
-            The second lists the probability for each measurement.
+        ndarray: probability of each outcome.
     """
 
-    state = array(state)
-    povms = [array(povm) for povm in povms]
-
-    # judge if elements in `indices` are consecutive
-    init_meas_sys_idx = min(indices)
-    fin_meas_sys_idx = max(indices)
-    num = len(indices)
-    if (fin_meas_sys_idx - init_meas_sys_idx + 1 != num) or (list(indices) != sorted(indices)):
-        raise ValueError("Indices should be consecutive; got {}".format(indices))
-
-    povm_list = []
-    left_dim = (truncation + 1) ** init_meas_sys_idx
-    right_dim = (truncation + 1) ** (num_systems - fin_meas_sys_idx - 1)
-    for povm in povms:
-        povm_tot = kron(kron(identity(left_dim), povm), identity(right_dim))
-        povm_list.append(povm_tot)
-
-    # list of probabilities of getting different outcomes from POVM
-    prob_list = [trace(state @ povm).real for povm in povm_list]
-    state_list = []
-
-    for i in range(len(prob_list)):
-        if prob_list[i] <= 0:
-            state_post_meas = None
-        else:
-            measure_op = sqrtm(povm_list[i])
-            state_post_meas = (measure_op @ state @ measure_op) / prob_list[i]
+    reduced_state = einsum('iaja->ij', grouped_state)
+    return array([einsum('ij,ji->', reduced_state, povm).real for povm in povms])
 
-        state_list.append(state_post_meas)
 
-    # return post-measurement states and measurement outcome probabilities in the order of fed-in POVM operators
-    return state_list, prob_list
+def povm_remaining_density(grouped_state: ndarray, povm: ndarray) -> ndarray:
+    """Computes the state of unmeasured subsystems after a POVM measurement on grouped subsystems.
 
+    The measured subsystems are traced out; by cyclicity of the partial trace,
+    Tr_m[(M x I) rho (M^dag x I)] = Tr_m[(E x I) rho] for measurement operator M and POVM element E = M^dag M,
+    so no matrix square root is required.
+
+    Args:
+        grouped_state (ndarray): state tensor from `density_group_subsystems` (measured subsystems grouped).
+        povm (ndarray): POVM operator of the measurement outcome.
+
+    Returns:
+        ndarray: normalized density matrix of the remaining subsystems.
+    """
+
+    output = einsum('ji,iajb->ab', povm, grouped_state)
+    return output / trace(output).real
 
-@lru_cache(maxsize=1000)
-def density_partial_trace(state: Tuple[Tuple[complex]], indices: Tuple[int], num_systems: int, truncation: int = 1) \
-        -> array:
 
-    """Traces out subsystems systems at given indices.
+# stabilizer tableau functions
+# a tableau for n qubits is an (n, 2n + 1) array of 0/1 values (dtype uint8),
+# where row i holds the x bits, z bits, and sign bit r of stabilizer generator i:
+# (-1) ** r * P_0 P_1 ... P_{n-1}, with P_j = I, X, Z, Y for (x_j, z_j) = (0, 0), (1, 0), (0, 1), (1, 1).
+
+_PAULI_MATRICES = {(0, 0): eye(2), (1, 0): array([[0, 1], [1, 0]]),
+                   (0, 1): array([[1, 0], [0, -1]]), (1, 1): array([[0, -1j], [1j, 0]])}
+_CLIFFORD_PHASES = {0: [], 1: ['s'], 2: ['z'], 3: ['s', 'z']}  # phase gate angle (in units of pi/2) to Clifford gates
+
+
+def stabilizer_rowsum(tableau: ndarray, targets, source: int) -> None:
+    """Multiplies rows of a tableau by another row in place (the rowsum operation of Aaronson and Gottesman).
 
     Args:
-        state (Tuple[Tuple[complex]]: input state.
-        indices (Tuple[int]): indices of subsystems to trace out of state.
-            should be sorted in increasing order.
-        num_systems (int): number of total subsystems in the state.
-        truncation (int): fock space truncation, 1 for qubit system (default 1).
+        tableau (ndarray): stabilizer tableau.
+        targets: row index (or array of row indices) to multiply.
+        source (int): row index to multiply by.
+    """
+
+    n = tableau.shape[1] // 2
+    x1 = tableau[source, :n].astype(int)
+    z1 = tableau[source, n:2 * n].astype(int)
+    x2 = tableau[targets, :n].astype(int)
+    z2 = tableau[targets, n:2 * n].astype(int)
+
+    # exponent of i contributed by each qubit of the product
+    g = (x1 & z1) * (z2 - x2) + (x1 & (1 - z1)) * z2 * (2 * x2 - 1) + ((1 - x1) & z1) * x2 * (1 - 2 * z2)
+    phase = 2 * tableau[source, 2 * n].astype(int) + 2 * tableau[targets, 2 * n].astype(int) + g.sum(axis=-1)
+
+    tableau[targets, :2 * n] ^= tableau[source, :2 * n]
+    tableau[targets, 2 * n] = (phase % 4 == 2)
+
+
+def stabilizer_apply_gate(tableau: ndarray, name: str, indices: List[int], arg: float = None) -> None:
+    """Applies a Clifford gate to a tableau in place.
+
+    Args:
+        tableau (ndarray): stabilizer tableau.
+        name (str): name of gate (as stored in `Circuit.gates`).
+        indices (List[int]): qubits the gate acts on.
+        arg (float): argument of parameterized gates (angle of phase gate).
+
+    Raises:
+        NotImplementedError: if the gate is not a Clifford gate (e.g. `t`, `ccx`, or a phase gate with an angle
+            that is not a multiple of pi/2).
+    """
+
+    n = tableau.shape[1] // 2
+    r = tableau[:, 2 * n]
+    a = indices[0]
+    x_a = tableau[:, a]
+    z_a = tableau[:, n + a]
+
+    if name == 'h':
+        r ^= x_a & z_a
+        tableau[:, [a, n + a]] = tableau[:, [n + a, a]]
+    elif name == 's':
+        r ^= x_a & z_a
+        z_a ^= x_a
+    elif name == 'x':
+        r ^= z_a
+    elif name == 'z':
+        r ^= x_a
+    elif name == 'y':
+        r ^= x_a ^ z_a
+    elif name == 'cx':
+        b = indices[1]
+        x_b = tableau[:, b]
+        z_b = tableau[:, n + b]
+        r ^= x_a & z_b & (x_b ^ z_a ^ 1)
+        x_b ^= x_a
+        z_a ^= z_b
+    elif name == 'swap':
+        b = indices[1]
+        tableau[:, [a, b, n + a, n + b]] = tableau[:, [b, a, n + b, n + a]]
+    elif name == 'phase':
+        quarter_turns = arg / (pi / 2)
+        if abs(quarter_turns - round(quarter_turns)) > 1e-9:
+            raise NotImplementedError("phase gate with angle {} is not a Clifford gate".format(arg))
+        for gate in _CLIFFORD_PHASES[int(round(quarter_turns)) % 4]:
+            stabilizer_apply_gate(tableau, gate, indices)
+    else:
+        raise NotImplementedError("gate {} is not a supported Clifford gate".format(name))
+
+
+def stabilizer_canonicalize(tableau: ndarray) -> ndarray:
+    """Brings a tableau to reduced row echelon form, using rowsum so the stabilizer group is unchanged.
+
+    The canonical form is unique for a given stabilizer state.
+
+    Args:
+        tableau (ndarray): stabilizer tableau.
 
     Returns:
-        array: output state with reduced number of subsystems `num_systems - len(indices)`.
+        ndarray: canonical tableau (the input tableau is modified in place).
     """
 
-    temp = array(state)
+    n = tableau.shape[0]
+    row = 0
+    for col in range(2 * n):
+        candidates = tableau[row:, col].nonzero()[0]
+        if len(candidates) == 0:
+            continue
+        pivot = candidates[0] + row
+        if pivot != row:
+            tableau[[row, pivot]] = tableau[[pivot, row]]
+        others = tableau[:, col].nonzero()[0]
+        others = others[others != row]
+        if len(others) > 0:
+            stabilizer_rowsum(tableau, others, row)
+        row += 1
+        if row == n:
+            break
+    return tableau
+
+
+def stabilizer_measure(tableau: ndarray, index: int, meas_samp: float) -> Tuple[int, ndarray, float]:
+    """Measures one qubit of a tableau in the computational basis and removes it from the state.
+
+    If the result is random, it is 0 for `meas_samp < 0.5` and 1 otherwise.
+    The sample is then rescaled to [0, 1), so that it may be reused for further measurements.
+
+    Args:
+        tableau (ndarray): stabilizer tableau of n qubits (modified in place).
+        index (int): index of qubit to measure.
+        meas_samp (float): random sample used for measurement result.
+
+    Returns:
+        Tuple[int, ndarray, float]: Tuple containing:
+            1. measurement result.
+            2. tableau of the remaining n - 1 qubits.
+            3. rescaled random sample.
+    """
+
+    n = tableau.shape[0]
+    anticommuting = tableau[:, index].nonzero()[0]
+
+    if len(anticommuting) > 0:
+        # random result; replace one generator with +/- Z
+        pivot = anticommuting[0]
+        if len(anticommuting) > 1:
+            stabilizer_rowsum(tableau, anticommuting[1:], pivot)
+        result = 0 if meas_samp < 0.5 else 1
+        meas_samp = 2 * meas_samp - result
+        tableau[pivot] = 0
+        tableau[pivot, n + index] = 1
+        tableau[pivot, 2 * n] = result
+    else:
+        # deterministic result; +/- Z is the generator with pivot at z bit of the qubit
+        stabilizer_canonicalize(tableau)
+        pivot = ((tableau[:, n + index] == 1) & (tableau[:, :2 * n].sum(axis=1) == 1)).nonzero()[0][0]
+        result = int(tableau[pivot, 2 * n])
+
+    # remove qubit from other generators, then from tableau
+    others = tableau[:, n + index].nonzero()[0]
+    others = others[others != pivot]
+    if len(others) > 0:
+        stabilizer_rowsum(tableau, others, pivot)
+    rows = [i for i in range(n) if i != pivot]
+    cols = [i for i in range(2 * n + 1) if i != index and i != n + index]
+    return result, tableau[rows][:, cols], meas_samp
+
+
+def stabilizer_combine(tableaux: List[ndarray]) -> ndarray:
+    """Builds the tableau of the tensor product of stabilizer states.
+
+    Args:
+        tableaux (List[ndarray]): tableaux of states (in order).
+
+    Returns:
+        ndarray: tableau of the compound state.
+    """
+
+    sizes = [t.shape[0] for t in tableaux]
+    n = sum(sizes)
+    output = zeros((n, 2 * n + 1), dtype='uint8')
+    start = 0
+    for t, size in zip(tableaux, sizes):
+        rows = slice(start, start + size)
+        output[rows, start:start + size] = t[:, :size]
+        output[rows, n + start:n + start + size] = t[:, size:2 * size]
+        output[rows, 2 * n] = t[:, 2 * size]
+        start += size
+    return output
+
 
-    for i, idx in enumerate(indices):
-        offset = num_systems - i
-        temp = temp.reshape((truncation+1,) * offset * 2)
-        temp = trace(temp, axis1=(idx-i), axis2=(offset+idx-i))
+def _pauli_matrix(row: ndarray) -> ndarray:
+    n = len(row) // 2
+    mat = array([[1]])
+    for j in range(n):
+        mat = kron(mat, _PAULI_MATRICES[(int(row[j]), int(row[n + j]))])
+    return mat
+
+
+def ket_to_stabilizer(amplitudes) -> ndarray:
+    """Finds the stabilizer tableau of a ket vector.
+
+    The search checks all Pauli strings, so it should only be used for states of few qubits.
+
+    Args:
+        amplitudes: ket vector of n qubits.
+
+    Returns:
+        ndarray: stabilizer tableau with n generators.
+
+    Raises:
+        ValueError: if the ket vector is not a stabilizer state.
+    """
+
+    state = array(amplitudes, dtype=complex)
+    n = int(round(log2(len(state))))
+    tableau = zeros((n, 2 * n + 1), dtype='uint8')
+    basis = {}  # pivot bit -> reduced bit vector of found generators
+    num_found = 0
+
+    for pauli in range(1, 4 ** n):
+        row = array([(pauli >> (2 * n - 1 - j)) & 1 for j in range(2 * n)], dtype='uint8')
+        expectation = vdot(state, _pauli_matrix(row) @ state)
+        if abs(abs(expectation) - 1) > 1e-6:
+            continue
+
+        # check independence of found generators
+        vector = pauli
+        while vector:
+            pivot = vector.bit_length() - 1
+            if pivot not in basis:
+                basis[pivot] = vector
+                break
+            vector ^= basis[pivot]
+        if not vector:
+            continue
+
+        tableau[num_found, :2 * n] = row
+        tableau[num_found, 2 * n] = expectation.real < 0
+        num_found += 1
+        if num_found == n:
+            return tableau
+
+    raise ValueError("state {} is not a stabilizer state".format(amplitudes))
+
+
+def stabilizer_to_ket(tableau: ndarray) -> ndarray:
+    """Computes the ket vector of a stabilizer tableau (up to global phase).
+
+    The computation uses dense matrices, so it should only be used for states of few qubits.
+
+    Args:
+        tableau (ndarray): stabilizer tableau.
+
+    Returns:
+        ndarray: ket vector, with the first nonzero amplitude real and positive.
+    """
+
+    n = tableau.shape[0]
+    projector = identity(2 ** n, dtype=complex)
+    for row in tableau:
+        sign = -1 if row[2 * n] else 1
+        projector = projector @ (identity(2 ** n) + sign * _pauli_matrix(row[:2 * n])) / 2
+
+    column = abs(projector).sum(axis=0).argmax()
+    state = projector[:, column]
+    state = state / sqrt(vdot(state, state).real)
+    first = state[abs(state) > 1e-9][0]
+    return state * (abs(first) / first)
+
+
+# Bell diagonal state functions
+# coefficients are ordered as (phi+, phi-, psi+, psi-), so that the index 2x + z of a coefficient gives the
+# Pauli error X^x Z^z (on one qubit) that maps the phi+ state to the corresponding Bell state.
+
+BELL_DIAGONAL_PAULI_INDICES = {'x': 2, 'y': 3, 'z': 1}
+
+
+def bell_diagonal_swap(coeffs_1: ndarray, coeffs_2: ndarray) -> ndarray:
+    """Computes the Bell diagonal state obtained by entanglement swapping of two Bell diagonal states.
+
+    Pauli errors of the two pairs compose, so the output is the XOR convolution of the inputs.
+    The output is given after Pauli correction of the measurement result.
+
+    Args:
+        coeffs_1 (ndarray): coefficients of first pair.
+        coeffs_2 (ndarray): coefficients of second pair.
+
+    Returns:
+        ndarray: coefficients of swapped pair.
+    """
+
+    return array([sum(coeffs_1[i] * coeffs_2[i ^ k] for i in range(4)) for k in range(4)])
+
+
+def bell_diagonal_twirl(coeffs: ndarray) -> ndarray:
+    """Computes the Werner state obtained by random bilateral rotations (twirling) of a Bell diagonal state.
+
+    Twirling keeps the phi+ coefficient (the fidelity), and spreads the remaining weight equally over the other states.
+
+    Args:
+        coeffs (ndarray): coefficients of pair.
+
+    Returns:
+        ndarray: coefficients of twirled pair.
+    """
+
+    fidelity = coeffs[0]
+    error = (1 - fidelity) / 3
+    return array([fidelity, error, error, error])
+
+
+def bell_diagonal_purify(coeffs_kept: ndarray, coeffs_meas: ndarray) -> Tuple[ndarray, float]:
+    """Computes the result of BBPSSW purification (bilateral CNOT, then measurement of target pair) on Bell diagonal states.
+
+    A bilateral CNOT copies the X error of the control pair to the target pair, and the Z error of the target pair to the
+    control pair. Purification succeeds if the measured X error of the target pair is zero.
+
+    Args:
+        coeffs_kept (ndarray): coefficients of kept (control) pair.
+        coeffs_meas (ndarray): coefficients of measured (target) pair.
+
+    Returns:
+        Tuple[ndarray, float]: Tuple containing:
+            1. coefficients of kept pair on success.
+            2. probability of success.
+    """
+
+    output = zeros(4)
+    for x in (0, 2):
+        for z in (0, 1):
+            output[x + z] = coeffs_kept[x] * coeffs_meas[x + z] + coeffs_kept[x + 1] * coeffs_meas[x + 1 - z]
+    prob = output.sum()
+    return output / prob, prob
+
+
+def bell_diagonal_pauli_channel(coeffs: ndarray, probs: Tuple[float, float, float]) -> ndarray:
+    """Applies a Pauli channel to one qubit of a Bell diagonal state.
+
+    Args:
+        coeffs (ndarray): coefficients of pair.
+        probs (Tuple[float, float, float]): probabilities of X, Y, and Z errors.
+
+    Returns:
+        ndarray: coefficients of pair after the channel.
+    """
 
-    output_dim = (truncation + 1) ** (num_systems - len(indices))
-    output_state = temp.reshape((output_dim, output_dim))
-    return output_state
+    p_x, p_y, p_z = probs
+    output = (1 - p_x - p_y - p_z) * coeffs
+    for p, pauli in zip(probs, (2, 3, 1)):
+        output += p * coeffs[[i ^ pauli for i in range(4)]]
+    return output
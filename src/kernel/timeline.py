@@ -8,7 +8,7 @@ from _thread import start_new_thread
 from datetime import timedelta
 from math import inf
 from sys import stdout
-from time import time_ns, sleep
+from time import time_ns, sleep, perf_counter_ns
 from typing import TYPE_CHECKING, Optional, Dict, Union
 
 from numpy import random
@@ -17,14 +17,19 @@ if TYPE_CHECKING:
     from .event import Event
     from .entity import Entity
 
-from .eventlist import EventList
+from .eventlist import EventList, CalendarEventList, HEAP_EVENT_LIST, CALENDAR_EVENT_LIST
+from .profiler import EventProfiler
 from ..utils import log
 from .quantum_manager import (QuantumManagerKet,
                               QuantumManagerDensity,
                               QuantumManagerDensityFock,
+                              QuantumManagerStabilizer,
+                              QuantumManagerBellDiagonal,
                               KET_STATE_FORMALISM,
                               DENSITY_MATRIX_FORMALISM,
-                              FOCK_DENSITY_MATRIX_FORMALISM)
+                              FOCK_DENSITY_MATRIX_FORMALISM,
+                              STABILIZER_FORMALISM,
+                              BELL_DIAGONAL_STATE_FORMALISM)
 
 CARRIAGE_RETURN = '\r'
 SLEEP_SECONDS = 3
@@ -47,9 +52,10 @@ class Timeline:
     The simulation stops if the timestamp on popped event is equal or larger than the stop time, or if the eventlist is empty.
 
     To monitor the progress of simulation, the Timeline.show_progress attribute can be modified to show/hide a progress bar.
+    To find where execution time is spent, profiling of executed events can be enabled with Timeline.enable_profiling.
 
     Attributes:
-        events (EventList): the event list of timeline.
+        events (Union[EventList, CalendarEventList]): the event list of timeline.
         entities (List[Entity]): the entity list of timeline used for initialization.
         time (int): current simulation time (picoseconds).
         stop_time (int): the stop (simulation) time of the simulation.
@@ -58,17 +64,28 @@ class Timeline:
         is_running (bool): records if the simulation has stopped executing events.
         show_progress (bool): show/hide the progress bar of simulation.
         quantum_manager (QuantumManager): quantum state manager.
+        profiler (EventProfiler): profiler of executed events (None if profiling is disabled).
     """
 
-    def __init__(self, stop_time=inf, formalism=KET_STATE_FORMALISM, truncation=1):
+    def __init__(self, stop_time=inf, formalism=KET_STATE_FORMALISM, truncation=1, event_queue=HEAP_EVENT_LIST,
+                 factorize=False):
         """Constructor for timeline.
 
         Args:
             stop_time (int): stop time (in ps) of simulation (default inf).
-            formalism (str): formalism of quantum state representation.
+            formalism (str): formalism of quantum state representation
+                ('ket_vector', 'density_matrix', 'fock_density', 'stabilizer' or 'bell_diagonal').
             truncation (int): truncation of Hilbert space (currently only for Fock representation).
+            event_queue (str): backend of the event list, either 'heap' or 'calendar' (default 'heap').
+            factorize (bool): if measured ket vector states are split into product states (default False).
+                Only used for the ket vector formalism (see `QuantumManagerKet`).
         """
-        self.events: EventList = EventList()
+        if event_queue == HEAP_EVENT_LIST:
+            self.events = EventList()
+        elif event_queue == CALENDAR_EVENT_LIST:
+            self.events = CalendarEventList()
+        else:
+            raise ValueError(f"Invalid event queue {event_queue}")
         self.entities: Dict[str, "Entity"] = {}
         self.time: Union[int, float] = 0
         self.stop_time: Union[int, float] = stop_time
@@ -76,13 +93,18 @@ class Timeline:
         self.run_counter: int = 0
         self.is_running: bool = False
         self.show_progress: bool = False
+        self.profiler: Optional[EventProfiler] = None
 
         if formalism == KET_STATE_FORMALISM:
-            self.quantum_manager = QuantumManagerKet()
+            self.quantum_manager = QuantumManagerKet(factorize=factorize)
         elif formalism == DENSITY_MATRIX_FORMALISM:
             self.quantum_manager = QuantumManagerDensity()
         elif formalism == FOCK_DENSITY_MATRIX_FORMALISM:
             self.quantum_manager = QuantumManagerDensityFock(truncation=truncation)
+        elif formalism == STABILIZER_FORMALISM:
+            self.quantum_manager = QuantumManagerStabilizer()
+        elif formalism == BELL_DIAGONAL_STATE_FORMALISM:
+            self.quantum_manager = QuantumManagerBellDiagonal()
         else:
             raise ValueError(f"Invalid formalism {formalism}")
 
@@ -119,24 +141,74 @@ class Timeline:
         if self.show_progress:
             self.progress_bar()
 
-        while len(self.events) > 0:
-            event = self.events.pop()
+        if self.profiler is None:
+            self._run_events()
+        else:
+            self._run_events_profiled()
+
+        self.is_running = False
+        time_elapsed = time_ns() - tick
+        log.logger.info("Timeline end simulation. Execution Time: %d ns; Scheduled Event: %d; Executed Event: %d" %
+                        (time_elapsed, self.schedule_counter, self.run_counter))
+
+    def _run_events(self) -> None:
+        events = self.events
+        while len(events) > 0:
+            event = events.pop()
+            time = event.time
 
-            if event.time >= self.stop_time:
+            if time >= self.stop_time:
                 self.schedule(event)  # return to event list
                 break
-            assert self.time <= event.time, f"invalid event time for process scheduled on {event.process.owner}"
+            assert self.time <= time, f"invalid event time for process scheduled on {event.process.owner}"
             if event.is_invalid():
                 continue
 
-            self.time = event.time
+            self.time = time
             event.process.run()
             self.run_counter += 1
 
-        self.is_running = False
-        time_elapsed = time_ns() - tick
-        log.logger.info("Timeline end simulation. Execution Time: %d ns; Scheduled Event: %d; Executed Event: %d" %
-                        (time_elapsed, self.schedule_counter, self.run_counter))
+    def _run_events_profiled(self) -> None:
+        """Same as `_run_events`, but records the execution of each event with the profiler."""
+
+        events = self.events
+        record = self.profiler.record
+        while len(events) > 0:
+            event = events.pop()
+            time = event.time
+
+            if time >= self.stop_time:
+                self.schedule(event)  # return to event list
+                break
+            assert self.time <= time, f"invalid event time for process scheduled on {event.process.owner}"
+            if event.is_invalid():
+                continue
+
+            self.time = time
+            process = event.process
+            tick = perf_counter_ns()
+            process.run()
+            record(process.owner, process.activation, time, perf_counter_ns() - tick)
+            self.run_counter += 1
+
+    def enable_profiling(self, time_bin: int = int(1e9)) -> EventProfiler:
+        """Method to enable profiling of executed events.
+
+        Profiling records event counts, wall time and simulation time distribution per owner class and method.
+        When profiling is not enabled, the main simulation loop is unaffected.
+
+        Args:
+            time_bin (int): width (in ps) of simulation time histogram bins (default 1e9 ps).
+
+        Returns:
+            EventProfiler: the profiler used by the timeline.
+        """
+
+        self.profiler = EventProfiler(time_bin)
+        return self.profiler
+
+    def disable_profiling(self) -> None:
+        self.profiler = None
 
     def stop(self) -> None:
         """Method to stop simulation."""
@@ -6,14 +6,15 @@ Also included is the definition of the message type used by the reservation prot
 """
 
 from enum import Enum, auto
-from typing import List, TYPE_CHECKING, Any, Dict
+from heapq import nsmallest
+from typing import List, TYPE_CHECKING, Any, Dict, Tuple
 
 if TYPE_CHECKING:
     from ..topology.node import QuantumRouter
     from ..resource_management.memory_manager import MemoryInfo, MemoryManager
     from ..entanglement_management.entanglement_protocol import EntanglementProtocol
 
-from ..resource_management.rule_manager import Rule, Arguments
+from ..resource_management.rule_manager import Rule, Arguments, memory_states
 from ..entanglement_management.generation import EntanglementGenerationA
 from ..entanglement_management.purification import BBPSSW
 from ..entanglement_management.swapping import EntanglementSwappingA, EntanglementSwappingB
@@ -21,6 +22,7 @@ from ..message import Message
 from ..protocol import StackProtocol
 from ..kernel.event import Event
 from ..kernel.process import Process
+from ..utils.interval_tree import IntervalTree
 
 
 class RSVPMsgType(Enum):
@@ -62,6 +64,7 @@ class ResourceReservationMessage(Message):
                f"\n\treservation={self.reservation}"
 
 
+@memory_states("RAW")
 def eg_rule_condition(memory_info: "MemoryInfo",
                       manager: "MemoryManager",
                       args: Arguments) -> List["MemoryInfo"]:
@@ -121,6 +124,7 @@ def eg_rule_action2(memories_info: List["MemoryInfo"], args: Arguments):
     return protocol, [path[index + 1]], [eg_req_func], [req_args]
 
 
+@memory_states("ENTANGLED")
 def ep_rule_condition1(memory_info: "MemoryInfo", manager: "MemoryManager",
                        args: Arguments):
     """Condition function used by BBPSSW protocol on nodes except the initiator
@@ -131,10 +135,8 @@ def ep_rule_condition1(memory_info: "MemoryInfo", manager: "MemoryManager",
     if (memory_info.index in memory_indices
             and memory_info.state == "ENTANGLED"
             and memory_info.fidelity < reservation.fidelity):
-        for info in manager:
+        for info in manager.get_entangled_infos(memory_info.remote_node):
             if (info != memory_info and info.index in memory_indices
-                    and info.state == "ENTANGLED"
-                    and info.remote_node == memory_info.remote_node
                     and info.fidelity == memory_info.fidelity):
                 assert memory_info.remote_memo != info.remote_memo
                 return [memory_info, info]
@@ -190,6 +192,7 @@ def ep_rule_action1(memories_info: List["MemoryInfo"], args: Arguments):
     return protocol, dsts, req_funcs, req_args
 
 
+@memory_states("ENTANGLED")
 def ep_rule_condition2(memory_info: "MemoryInfo", manager: "MemoryManager",
                        args: Arguments) -> List["MemoryInfo"]:
     """Condition function used by BBPSSW protocol on nodes except the responder
@@ -225,6 +228,7 @@ def es_rule_actionB(memories_info: List["MemoryInfo"], args: Arguments):
     return protocol, [None], [None], [None]
 
 
+@memory_states("ENTANGLED")
 def es_rule_conditionB1(memory_info: "MemoryInfo", manager: "MemoryManager", args: Arguments):
     """Condition function used by EntanglementSwappingB protocol on nodes of either responder or initiator
     """
@@ -242,6 +246,7 @@ def es_rule_conditionB1(memory_info: "MemoryInfo", manager: "MemoryManager", arg
         return []
 
 
+@memory_states("ENTANGLED")
 def es_rule_conditionA(memory_info: "MemoryInfo", manager: "MemoryManager", args: Arguments):
     """Condition function used by EntanglementSwappingA protocol on nodes
     """
@@ -253,20 +258,16 @@ def es_rule_conditionA(memory_info: "MemoryInfo", manager: "MemoryManager", args
             and memory_info.index in memory_indices
             and memory_info.remote_node == left
             and memory_info.fidelity >= fidelity):
-        for info in manager:
-            if (info.state == "ENTANGLED"
-                    and info.index in memory_indices
-                    and info.remote_node == right
+        for info in manager.get_entangled_infos(right):
+            if (info.index in memory_indices
                     and info.fidelity >= fidelity):
                 return [memory_info, info]
     elif (memory_info.state == "ENTANGLED"
           and memory_info.index in memory_indices
           and memory_info.remote_node == right
           and memory_info.fidelity >= fidelity):
-        for info in manager:
-            if (info.state == "ENTANGLED"
-                    and info.index in memory_indices
-                    and info.remote_node == left
+        for info in manager.get_entangled_infos(left):
+            if (info.index in memory_indices
                     and info.fidelity >= fidelity):
                 return [memory_info, info]
     return []
@@ -301,6 +302,7 @@ def es_rule_actionA(memories_info: List["MemoryInfo"], args: Arguments):
     return protocol, dsts, req_funcs, req_args
 
 
+@memory_states("ENTANGLED")
 def es_rule_conditionB2(memory_info: "MemoryInfo", manager: "MemoryManager", args: Arguments) -> List["MemoryInfo"]:
     """Condition function used by EntanglementSwappingB protocol on intermediate nodes of path
     """
@@ -333,6 +335,8 @@ class ResourceReservationProtocol(StackProtocol):
         es_succ_prob (float): sets `success_probability` of `EntanglementSwappingA` protocols created by rules.
         es_degradation (float): sets `degradation` of `EntanglementSwappingA` protocols created by rules.
         accepted_reservation (List[Reservation]): list of all approved reservation requests.
+        reservation_index (IntervalTree): index of reserved intervals of all memories (with memory indices as values).
+        placement (str): memory placement policy for new reservations (`"first_fit"` or `"best_fit"`).
     """
 
     def __init__(self, own: "QuantumRouter", name: str, memory_array_name: str):
@@ -346,10 +350,12 @@ class ResourceReservationProtocol(StackProtocol):
 
         super().__init__(own, name)
         self.memo_arr = own.components[memory_array_name]
-        self.timecards = [MemoryTimeCard(i) for i in range(len(self.memo_arr))]
+        self.reservation_index = IntervalTree()
+        self.timecards = [MemoryTimeCard(i, self.reservation_index) for i in range(len(self.memo_arr))]
         self.es_succ_prob = 1
         self.es_degradation = 0.95
         self.accepted_reservation = []
+        self.placement = "first_fit"
 
     def push(self, responder: str, start_time: int, end_time: int, memory_size: int, target_fidelity: float):
         """Method to receive reservation requests from higher level protocol.
@@ -424,8 +430,8 @@ class ResourceReservationProtocol(StackProtocol):
                                                      msg.reservation)
                 self._push(dst=msg.reservation.initiator, msg=new_msg)
         elif msg.msg_type == RSVPMsgType.REJECT:
-            for card in self.timecards:
-                card.remove(msg.reservation)
+            for index in self.get_memory_indices(msg.reservation):
+                self.timecards[index].remove(msg.reservation)
             if msg.reservation.initiator == self.own.name:
                 self._pop(msg=msg)
             else:
@@ -443,6 +449,12 @@ class ResourceReservationProtocol(StackProtocol):
     def schedule(self, reservation: "Reservation") -> bool:
         """Method to attempt reservation request.
 
+        Memories free during the reservation are found with one query of the reservation index.
+        Memories are then chosen according to the `placement` policy:
+
+        * "first_fit": free memories with the lowest indices.
+        * "best_fit": free memories where the reservation fits most tightly (to reduce fragmentation).
+
         Args:
             reservation (Reservation): reservation to approve or reject.
 
@@ -454,21 +466,50 @@ class ResourceReservationProtocol(StackProtocol):
             counter = reservation.memory_size
         else:
             counter = reservation.memory_size * 2
-        cards = []
-        for card in self.timecards:
-            if card.add(reservation):
-                counter -= 1
-                cards.append(card)
-            if counter == 0:
-                break
-
-        if counter > 0:
-            for card in cards:
-                card.remove(reservation)
+
+        busy = set(self.reservation_index.overlap(reservation.start_time, reservation.end_time))
+        if len(self.timecards) - len(busy) < counter:
             return False
 
+        if self.placement == "best_fit":
+            free = [card for card in self.timecards if card.memory_index not in busy]
+            cards = nsmallest(counter, free, key=lambda card: (card.get_fit(reservation), card.memory_index))
+        else:
+            cards = []
+            for card in self.timecards:
+                if card.memory_index not in busy:
+                    cards.append(card)
+                    if len(cards) == counter:
+                        break
+
+        for card in cards:
+            card.add(reservation)
         return True
 
+    def get_memory_indices(self, reservation: "Reservation") -> List[int]:
+        """Method to get the memories reserved for a reservation.
+
+        Args:
+            reservation (Reservation): reservation to look up.
+
+        Returns:
+            List[int]: sorted indices of memories with the reservation on their timecard.
+        """
+
+        candidates = set(self.reservation_index.overlap(reservation.start_time, reservation.end_time))
+        return sorted(index for index in candidates if self.timecards[index].has_reservation(reservation))
+
+    def set_placement(self, placement: str) -> None:
+        """Method to set the memory placement policy for new reservations.
+
+        Args:
+            placement (str): placement policy (`"first_fit"` or `"best_fit"`).
+        """
+
+        if placement not in ["first_fit", "best_fit"]:
+            raise ValueError("Unknown placement policy '{}'".format(placement))
+        self.placement = placement
+
     def create_rules(self, path: List[str], reservation: "Reservation") -> List["Rule"]:
         """Method to create rules for a successful request.
 
@@ -483,10 +524,7 @@ class ResourceReservationProtocol(StackProtocol):
         """
 
         rules = []
-        memory_indices = []
-        for card in self.timecards:
-            if reservation in card.reservations:
-                memory_indices.append(card.memory_index)
+        memory_indices = self.get_memory_indices(reservation)
 
         # create rules for entanglement generation
         index = path.index(self.own.name)
@@ -589,12 +627,11 @@ class ResourceReservationProtocol(StackProtocol):
         """
 
         self.accepted_reservation.append(reservation)
-        for card in self.timecards:
-            if reservation in card.reservations:
-                process = Process(self.own.resource_manager, "update",
-                                  [None, self.memo_arr[card.memory_index], "RAW"])
-                event = Event(reservation.end_time, process, 1)
-                self.own.timeline.schedule(event)
+        for index in self.get_memory_indices(reservation):
+            process = Process(self.own.resource_manager, "update",
+                              [None, self.memo_arr[index], "RAW"])
+            event = Event(reservation.end_time, process, 1)
+            self.own.timeline.schedule(event)
 
         for rule in rules:
             process = Process(self.own.resource_manager, "load", [rule])
@@ -675,18 +712,21 @@ class MemoryTimeCard:
 
     Attributes:
         memory_index (int): index of memory being tracked (in memory array).
-        reservations (List[Reservation]): list of reservations for the memory.
+        reservations (List[Reservation]): list of reservations for the memory (sorted by time).
+        interval_tree (IntervalTree): node-level index updated with the reservations of the card (if any).
     """
 
-    def __init__(self, memory_index: int):
+    def __init__(self, memory_index: int, interval_tree: "IntervalTree" = None):
         """Constructor for time card class.
 
         Args:
             memory_index (int): index of memory to track.
+            interval_tree (IntervalTree): node-level reservation index to update (default None).
         """
 
         self.memory_index = memory_index
         self.reservations = []
+        self.interval_tree = interval_tree
 
     def add(self, reservation: "Reservation") -> bool:
         """Method to add reservation.
@@ -703,6 +743,8 @@ class MemoryTimeCard:
         pos = self.schedule_reservation(reservation)
         if pos >= 0:
             self.reservations.insert(pos, reservation)
+            if self.interval_tree is not None:
+                self.interval_tree.insert(reservation.start_time, reservation.end_time, self.memory_index)
             return True
         else:
             return False
@@ -717,12 +759,56 @@ class MemoryTimeCard:
             bool: if reservation was already on the memory or not.
         """
 
-        try:
-            pos = self.reservations.index(reservation)
-            self.reservations.pop(pos)
-            return True
-        except ValueError:
+        pos = self._find(reservation)
+        if pos < 0:
             return False
+        self.reservations.pop(pos)
+        if self.interval_tree is not None:
+            self.interval_tree.remove(reservation.start_time, reservation.end_time, self.memory_index)
+        return True
+
+    def has_reservation(self, reservation: "Reservation") -> bool:
+        """Method to check if a reservation is on the memory."""
+
+        return self._find(reservation) >= 0
+
+    def get_fit(self, reservation: "Reservation") -> Tuple[int, int]:
+        """Method to measure how tightly a reservation fits between the reservations of the memory.
+
+        Args:
+            reservation (Reservation): reservation to insert (should not conflict with the card).
+
+        Returns:
+            Tuple[int, int]: number of missing neighbouring reservations (before and after),
+                and idle time between the reservation and existing neighbours (smaller is tighter).
+        """
+
+        pos = self.schedule_reservation(reservation)
+        missing, idle = 0, 0
+        if pos > 0:
+            idle += reservation.start_time - self.reservations[pos - 1].end_time
+        else:
+            missing += 1
+        if pos < len(self.reservations):
+            idle += self.reservations[pos].start_time - reservation.end_time
+        else:
+            missing += 1
+        return missing, idle
+
+    def _find(self, reservation: "Reservation") -> int:
+        # reservations do not overlap, so start times are unique and sorted
+        start, end = 0, len(self.reservations) - 1
+        while start <= end:
+            mid = (start + end) // 2
+            if self.reservations[mid].start_time < reservation.start_time:
+                start = mid + 1
+            elif self.reservations[mid].start_time > reservation.start_time:
+                end = mid - 1
+            elif self.reservations[mid] == reservation:
+                return mid
+            else:
+                return -1
+        return -1
 
     def schedule_reservation(self, resv: "Reservation") -> int:
         """Method to add reservation to a memory.
@@ -6,10 +6,13 @@ Also included is the message type used by the routing protocol.
 """
 
 from enum import Enum
-from typing import Dict, TYPE_CHECKING
+from math import inf, isclose
+from typing import Dict, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from ..topology.node import Node
 
+from networkx import Graph, single_source_dijkstra
+
 from ..message import Message
 from ..protocol import StackProtocol
 
@@ -38,11 +41,15 @@ class StaticRoutingProtocol(StackProtocol):
 
     The `StaticRoutingProtocol` class uses a static routing table to direct the flow of reservation requests.
     This is usually defined based on the shortest quantum channel length.
+    If a routing graph is set, the table may be updated after link changes with `handle_link_change`.
 
     Attributes:
         own (Node): node that protocol instance is attached to.
         name (str): label for protocol instance.
         forwarding_table (Dict[str, str]): mapping of destination node names to name of node for next hop.
+        graph (Graph): weighted graph of routers used to compute the forwarding table (if set).
+        distances (Dict[str, float]): mapping of destination node names to shortest path length (None if unknown).
+        on_demand (bool): if the forwarding table is computed from the graph when first used.
     """
     
     def __init__(self, own: "Node", name: str, forwarding_table: Dict):
@@ -56,6 +63,9 @@ class StaticRoutingProtocol(StackProtocol):
 
         super().__init__(own, name)
         self.forwarding_table = forwarding_table
+        self.graph: Optional[Graph] = None
+        self.distances: Optional[Dict[str, float]] = None
+        self.on_demand = False
 
     def add_forwarding_rule(self, dst: str, next_node: str):
         """Adds mapping {dst: next_node} to forwarding table."""
@@ -68,6 +78,97 @@ class StaticRoutingProtocol(StackProtocol):
 
         self.forwarding_table[dst] = next_node
 
+    def set_graph(self, graph: Graph, distances: Dict[str, float] = None, on_demand: bool = False) -> None:
+        """Method to set the routing graph.
+
+        The graph may be shared by the routing protocols of several nodes.
+
+        Args:
+            graph (Graph): weighted graph of routers (edge attribute `weight` gives link length).
+            distances (Dict[str, float]): shortest path lengths from own node in graph, if known (default None).
+            on_demand (bool): if the forwarding table should be computed when first used (default False).
+        """
+
+        self.graph = graph
+        self.distances = distances
+        self.on_demand = on_demand
+
+    def compute_forwarding_table(self) -> None:
+        """Method to recompute the forwarding table from the shortest path tree of own node in the routing graph."""
+
+        assert self.graph is not None, "routing graph is not set."
+        self.distances, paths = single_source_dijkstra(self.graph, self.own.name)
+        self.forwarding_table.clear()
+        for dst, path in paths.items():
+            if dst != self.own.name:
+                self.forwarding_table[dst] = path[1]
+
+    def handle_link_change(self, node1: str, node2: str, old_distance: Optional[float]) -> bool:
+        """Method to update the forwarding table after a link of the routing graph changed.
+
+        Should be called after the graph is modified.
+        The forwarding table is only recomputed if the change may affect shortest paths from own node
+        (see `link_change_affects`).
+        The table is recomputed from the shortest path tree of own node,
+        so the path to a destination may differ from the path of the destination to own node;
+        `RouterNetTopo.update_link` keeps both directions on the same path.
+
+        Args:
+            node1 (str): name of first router of the link.
+            node2 (str): name of second router of the link.
+            old_distance (float): length of the link before the change (None if the link was added).
+
+        Returns:
+            bool: if the forwarding table was recomputed.
+        """
+
+        assert self.graph is not None, "routing graph is not set."
+        if self.on_demand and self.distances is None:
+            # table not computed yet; will use the modified graph
+            return False
+
+        if self.graph.has_edge(node1, node2):
+            new_distance = self.graph[node1][node2]["weight"]
+        else:
+            new_distance = None
+
+        if self.distances is not None:
+            d1 = self.distances.get(node1, inf)
+            d2 = self.distances.get(node2, inf)
+            if not self.link_change_affects(d1, d2, old_distance, new_distance):
+                return False
+
+        self.compute_forwarding_table()
+        return True
+
+    @staticmethod
+    def link_change_affects(d1: float, d2: float, old_distance: Optional[float],
+                            new_distance: Optional[float]) -> bool:
+        """Method to check if a change of link length may affect shortest paths from a node.
+
+        A removed or longer link must lie on a shortest path, and an added or shorter link must create a shorter path.
+
+        Args:
+            d1 (float): shortest path length from the node to the first router of the link before the change.
+            d2 (float): shortest path length from the node to the second router of the link before the change.
+            old_distance (float): length of the link before the change (None if the link was added).
+            new_distance (float): length of the link after the change (None if the link was removed).
+
+        Returns:
+            bool: if shortest paths from the node may be affected.
+        """
+
+        if old_distance is not None and (new_distance is None or new_distance > old_distance):
+            return min(d1, d2) < inf and (isclose(d1 + old_distance, d2) or isclose(d2 + old_distance, d1))
+        elif new_distance is not None and (old_distance is None or new_distance < old_distance):
+            return StaticRoutingProtocol._shorter(d1 + new_distance, d2) or \
+                StaticRoutingProtocol._shorter(d2 + new_distance, d1)
+        return False
+
+    @staticmethod
+    def _shorter(length: float, other: float) -> bool:
+        return length < other and not isclose(length, other)
+
     def push(self, dst: str, msg: "Message"):
         """Method to receive message from upper protocols.
 
@@ -82,6 +183,8 @@ class StaticRoutingProtocol(StackProtocol):
         """
 
         assert dst != self.own.name
+        if self.on_demand and self.distances is None:
+            self.compute_forwarding_table()
         dst = self.forwarding_table[dst]
         new_msg = StaticRoutingMessage(Enum, self.name, msg)
         self._push(dst=dst, msg=new_msg)
@@ -1,11 +1,12 @@
 """Definition of abstract protocol type.
 
 This module defines the protocol type inherited by all protocol code implementations.
-Also defined is the stack protocol, which adds push and pop functionality.
+Also defined is the stack protocol, which adds push and pop functionality,
+and the protocol registry, which is used by nodes and resource managers to store protocols.
 """
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List
 
 if TYPE_CHECKING:
     from .topology.node import Node
@@ -86,3 +87,80 @@ class StackProtocol(Protocol):
         """Method to receive messages from distant nodes."""
 
         pass
+
+
+class ProtocolRegistry:
+    """Ordered collection of protocols indexed by name and type.
+
+    The registry behaves like a list of protocols (supporting `append`, `remove`, membership tests, iteration and indexing),
+    with constant time `append`, `remove`, membership tests, and lookup by name or type.
+    Each protocol is stored at most once, and is indexed under its name at the time it is added.
+    Iteration is performed over a snapshot, so protocols may be added or removed during iteration.
+    """
+
+    def __init__(self, protocols: Iterable["Protocol"] = ()):
+        """Constructor for protocol registry.
+
+        Args:
+            protocols (Iterable[Protocol]): initial protocols (default empty).
+        """
+
+        self._protocols: Dict["Protocol", str] = {}  # mapping of protocols to indexed names (ordered)
+        self._by_name: Dict[str, Dict["Protocol", None]] = {}
+        self._by_type: Dict[type, Dict["Protocol", None]] = {}
+        for protocol in protocols:
+            self.append(protocol)
+
+    def append(self, protocol: "Protocol") -> None:
+        """Method to add a protocol (no effect if protocol already stored)."""
+
+        if protocol in self._protocols:
+            return
+        self._protocols[protocol] = protocol.name
+        self._by_name.setdefault(protocol.name, {})[protocol] = None
+        self._by_type.setdefault(type(protocol), {})[protocol] = None
+
+    def remove(self, protocol: "Protocol") -> None:
+        """Method to remove a protocol.
+
+        Raises:
+            ValueError: if the protocol is not stored.
+        """
+
+        if protocol not in self._protocols:
+            raise ValueError("protocol {} not in registry".format(protocol))
+        name = self._protocols.pop(protocol)
+        self._unindex(self._by_name, name, protocol)
+        self._unindex(self._by_type, type(protocol), protocol)
+
+    def get_by_name(self, name: str) -> List["Protocol"]:
+        """Method to get stored protocols with a name (in insertion order)."""
+
+        return list(self._by_name.get(name, ()))
+
+    def get_by_type(self, protocol_type: type) -> List["Protocol"]:
+        """Method to get stored protocols of an exact type (in insertion order)."""
+
+        return list(self._by_type.get(protocol_type, ()))
+
+    @staticmethod
+    def _unindex(index: Dict, key, protocol: "Protocol") -> None:
+        protocols = index[key]
+        del protocols[protocol]
+        if len(protocols) == 0:
+            del index[key]
+
+    def __contains__(self, protocol) -> bool:
+        return protocol in self._protocols
+
+    def __iter__(self) -> Iterator["Protocol"]:
+        return iter(list(self._protocols))
+
+    def __len__(self) -> int:
+        return len(self._protocols)
+
+    def __getitem__(self, item):
+        return list(self._protocols)[item]
+
+    def __repr__(self) -> str:
+        return repr(list(self._protocols))
@@ -235,7 +235,7 @@ class BB84(StackProtocol):
 
         Side Effects:
             Will set destination of photons for local node.
-            Will invoke emit method of node lightsource.
+            Will invoke emit method of node lightsource (or `emit_pulse_train` if the node uses pulse trains).
             Will schedule another `begin_photon_pulse` event after the emit period.
         """
         
@@ -251,12 +251,15 @@ class BB84(StackProtocol):
 
             # control hardware
             lightsource = self.own.components[self.ls_name]
-            encoding_type = lightsource.encoding_type
-            state_list = []
-            for i, bit in enumerate(bit_list):
-                state = (encoding_type["bases"][basis_list[i]])[bit]
-                state_list.append(state)
-            lightsource.emit(state_list)
+            if self.own.pulse_train:
+                lightsource.emit_pulse_train(basis_list, bit_list)
+            else:
+                encoding_type = lightsource.encoding_type
+                state_list = []
+                for i, bit in enumerate(bit_list):
+                    state = (encoding_type["bases"][basis_list[i]])[bit]
+                    state_list.append(state)
+                lightsource.emit(state_list)
 
             self.basis_lists.append(basis_list)
             self.bit_lists.append(bit_list)
@@ -8,9 +8,11 @@ There are three states of quantum memory represented by the string: "RAW", "OCCU
 * "ENTANGLED" denotes a free memory that is entangling with other memories. 
 
 This is done through instances of the MemoryInfo class, which track a single memory.
+The memory manager also indexes memories by state (and entangled memories by remote node),
+so that rule conditions can find candidate memories without scanning the whole memory array.
 """
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, List, Set, Optional
 if TYPE_CHECKING:
     from .resource_manager import ResourceManager
     from ..components.memory import Memory, MemoryArray
@@ -24,7 +26,10 @@ class MemoryManager():
     Attributes:
         memory_array (MemoryArray): memory array object to be tracked.
         memory_map (List[MemoryInfo]): array of memory info objects corresponding to memory array.
+        memory_to_index (Dict[Memory, int]): mapping of memories to their index in the memory array.
         resource_manager (ResourceManager): resource manager object using the memory manager.
+        state_index (Dict[str, Set[int]]): mapping of memory states to indices of memories in the state.
+        entangled_index (Dict[str, Set[int]]): mapping of remote nodes to indices of memories entangled with the node.
     """
 
     def __init__(self, memory_array: "MemoryArray"):
@@ -37,7 +42,13 @@ class MemoryManager():
         self.memory_array = memory_array
         self.memory_array.attach(self)
         self.memory_map = [MemoryInfo(memory, index) for index, memory in enumerate(self.memory_array)]
+        self.memory_to_index = {memory: index for index, memory in enumerate(self.memory_array)}
         self.resource_manager = None
+        self.state_index: Dict[str, Set[int]] = {"RAW": set(), "OCCUPIED": set(), "ENTANGLED": set()}
+        self.entangled_index: Dict[str, Set[int]] = {}
+        for info in self.memory_map:
+            info.memory_manager = self
+            self.state_index[info.state].add(info.index)
 
     def set_resource_manager(self, resource_manager: "ResourceManager") -> None:
         """Method to set the resource manager."""
@@ -64,6 +75,53 @@ class MemoryManager():
         else:
             raise Exception("Unknown state '%s'" % state)
 
+    def reindex(self, info: "MemoryInfo", prev_state: str, prev_remote_node: Optional[str]) -> None:
+        """Method to update the state indices after a change of memory info.
+
+        Called by memory info objects after each state transition.
+
+        Args:
+            info (MemoryInfo): updated memory info.
+            prev_state (str): state of memory before the update.
+            prev_remote_node (str): remote node of memory before the update.
+        """
+
+        self.state_index[prev_state].discard(info.index)
+        if prev_state == "ENTANGLED":
+            indices = self.entangled_index[prev_remote_node]
+            indices.discard(info.index)
+            if len(indices) == 0:
+                del self.entangled_index[prev_remote_node]
+
+        self.state_index[info.state].add(info.index)
+        if info.state == "ENTANGLED":
+            self.entangled_index.setdefault(info.remote_node, set()).add(info.index)
+
+    def get_infos_by_state(self, state: str) -> List["MemoryInfo"]:
+        """Method to get memory info objects of memories in a state.
+
+        Args:
+            state (str): desired state.
+
+        Returns:
+            List[MemoryInfo]: memory info objects in the state (ordered by memory index).
+        """
+
+        return [self.memory_map[index] for index in sorted(self.state_index[state])]
+
+    def get_entangled_infos(self, remote_node: str) -> List["MemoryInfo"]:
+        """Method to get memory info objects of memories entangled with a remote node.
+
+        Args:
+            remote_node (str): name of the remote node.
+
+        Returns:
+            List[MemoryInfo]: memory info objects in the `"ENTANGLED"` state (ordered by memory index).
+        """
+
+        indices = self.entangled_index.get(remote_node, ())
+        return [self.memory_map[index] for index in sorted(indices)]
+
     def __len__(self):
         return len(self.memory_map)
 
@@ -73,8 +131,7 @@ class MemoryManager():
     def get_info_by_memory(self, memory: "Memory") -> "MemoryInfo":
         """Gets memory info object for a desired memory."""
 
-        index = self.memory_array.memories.index(memory)
-        return self.memory_map[index]
+        return self.memory_map[self.memory_to_index[memory]]
 
 
 class MemoryInfo():
@@ -97,6 +154,7 @@ class MemoryInfo():
         fidelity (int): fidelity of entanglement for memory.
         expire_event (Event): expiration event for the memory.
         entangle_time (int): time at which most recent entanglement is achieved.
+        memory_manager (MemoryManager): memory manager indexing the memory info (if any).
     """
 
     def __init__(self, memory: "Memory", index: int, state="RAW"):
@@ -116,28 +174,39 @@ class MemoryInfo():
         self.fidelity = 0
         self.expire_event = None
         self.entangle_time = -1
+        self.memory_manager = None
 
     def to_raw(self) -> None:
         """Method to set memory to raw (unentangled) state."""
 
+        prev_state, prev_remote_node = self.state, self.remote_node
         self.state = "RAW"
         self.memory.reset()
         self.remote_node = None
         self.remote_memo = None
         self.fidelity = 0
         self.entangle_time = -1
+        self._reindex(prev_state, prev_remote_node)
 
     def to_occupied(self) -> None:
         """Method to set memory to occupied state."""
 
         assert self.state != "OCCUPIED"
+        prev_state = self.state
         self.state = "OCCUPIED"
+        self._reindex(prev_state, self.remote_node)
 
     def to_entangled(self) -> None:
         """Method to set memory to entangled state."""
 
+        prev_state, prev_remote_node = self.state, self.remote_node
         self.state = "ENTANGLED"
         self.remote_node = self.memory.entangled_memory["node_id"]
         self.remote_memo = self.memory.entangled_memory["memo_id"]
         self.fidelity = self.memory.fidelity
         self.entangle_time = self.memory.timeline.now()
+        self._reindex(prev_state, prev_remote_node)
+
+    def _reindex(self, prev_state: str, prev_remote_node: str) -> None:
+        if self.memory_manager is not None:
+            self.memory_manager.reindex(self, prev_state, prev_remote_node)
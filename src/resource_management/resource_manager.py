@@ -15,6 +15,7 @@ if TYPE_CHECKING:
 
 from ..entanglement_management.entanglement_protocol import EntanglementProtocol
 from ..message import Message
+from ..protocol import ProtocolRegistry
 from ..utils import log
 from .rule_manager import RuleManager
 from .memory_manager import MemoryManager
@@ -85,8 +86,8 @@ class ResourceManager():
         owner (QuantumRouter): node that resource manager is attached to.
         memory_manager (MemoryManager): internal memory manager object.
         rule_manager (RuleManager): internal rule manager object.
-        pending_protocols (List[Protocol]): list of protocols awaiting a response for a remote resource request.
-        waiting_protocols (List[Protocol]): list of protocols awaiting a request from a remote protocol.
+        pending_protocols (ProtocolRegistry): protocols awaiting a response for a remote resource request.
+        waiting_protocols (ProtocolRegistry): protocols awaiting a request from a remote protocol.
     """
 
     def __init__(self, owner: "QuantumRouter", memory_array_name: str):
@@ -103,9 +104,9 @@ class ResourceManager():
         self.rule_manager = RuleManager()
         self.rule_manager.set_resource_manager(self)
         # protocols that are requesting remote resource
-        self.pending_protocols = []
+        self.pending_protocols = ProtocolRegistry()
         # protocols that are waiting request from remote resource
-        self.waiting_protocols = []
+        self.waiting_protocols = ProtocolRegistry()
         self.memory_to_protocol_map = {}
 
     def load(self, rule: "Rule") -> bool:
@@ -124,7 +125,11 @@ class ResourceManager():
         log.logger.info('load rule {}'.format(rule))
         self.rule_manager.load(rule)
 
-        for memory_info in self.memory_manager:
+        if rule.index_keys is None:
+            candidates = self.memory_manager
+        else:
+            candidates = [self.memory_manager[index] for index in rule.get_memory_indices()]
+        for memory_info in candidates:
             memories_info = rule.is_valid(memory_info)
             if len(memories_info) > 0:
                 rule.do(memories_info)
@@ -189,7 +194,7 @@ class ResourceManager():
 
         # check if any rules have been met
         memo_info = self.memory_manager.get_info_by_memory(memory)
-        for rule in self.rule_manager:
+        for rule in self.rule_manager.get_candidate_rules(memo_info):
             memories_info = rule.is_valid(memo_info)
             if len(memories_info) > 0:
                 rule.do(memories_info)
@@ -281,15 +286,12 @@ class ResourceManager():
         elif msg.msg_type is ResourceManagerMsgType.RESPONSE:
             protocol_name = msg.ini_protocol_name
 
-            protocol: Optional[EntanglementProtocol] = None
-            for p in self.pending_protocols:
-                if p.name == protocol_name:
-                    protocol = p
-                    break
-            else:
+            matching = self.pending_protocols.get_by_name(protocol_name)
+            if len(matching) == 0:
                 if msg.is_approved:
                     self.release_remote_protocol(src, msg.paired_protocol)
                 return
+            protocol: Optional[EntanglementProtocol] = matching[0]
 
             if msg.is_approved:
                 protocol.set_others(msg.paired_protocol, msg.paired_node, msg.paired_memories)
@@ -311,9 +313,8 @@ class ResourceManager():
                 self.pending_protocols.remove(protocol)
 
         elif msg.msg_type is ResourceManagerMsgType.RELEASE_PROTOCOL:
-            for p in self.owner.protocols:
-                if p.name == msg.protocol:
-                    p.release()
+            for p in self.owner.protocols.get_by_name(msg.protocol):
+                p.release()
 
         elif msg.msg_type is ResourceManagerMsgType.RELEASE_MEMORY:
             target_id = msg.memory
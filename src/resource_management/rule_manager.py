@@ -4,7 +4,9 @@ This module defines the rule manager, which is used by the resource manager to i
 This is achieved through rules (also defined in this module), which if met define a set of actions to take.
 """
 
-from typing import Callable, TYPE_CHECKING, List, Tuple, Any, Dict
+from bisect import insort
+from heapq import merge
+from typing import Callable, TYPE_CHECKING, List, Tuple, Any, Dict, Iterator, Optional
 from ..utils import log
 if TYPE_CHECKING:
     from ..entanglement_management.entanglement_protocol import EntanglementProtocol
@@ -23,15 +25,37 @@ ConditionFunc = Callable[["MemoryInfo", "MemoryManager", Dict[str, Any]],
 Arguments = Dict[str, Any]
 
 
+def memory_states(*states: str) -> Callable[[Callable], Callable]:
+    """Decorator to declare the memory states for which a condition function may be met.
+
+    Rules using a decorated condition, with the `"memory_indices"` condition argument,
+    are only evaluated by the rule manager for memories with a listed index and state.
+
+    Args:
+        states (str): memory states (`"RAW"`, `"OCCUPIED"` or `"ENTANGLED"`).
+    """
+
+    def decorator(condition: Callable) -> Callable:
+        condition.memory_states = states
+        return condition
+
+    return decorator
+
+
 class RuleManager:
     """Class to manage and follow installed rules.
 
     The RuleManager checks available rules when the state of a memory is updated.
     Rules that are met have their action executed by the rule manager.
+    Rules declaring the memories they may fire on (see `memory_states`) are indexed by memory index and state;
+    other rules are checked for all memories.
 
     Attributes:
         rules (List[Rules]): List of installed rules.
         resource_manager (ResourceManager): reference to the resource manager using this rule manager.
+        indexed_rules (Dict[Tuple[int, str], List[Tuple[Tuple, Rule]]]): mapping of memory indices and states
+            to (order, rule) pairs of rules which may fire on them.
+        unindexed_rules (List[Tuple[Tuple, Rule]]): (order, rule) pairs of rules which may fire on any memory.
     """
 
     def __init__(self):
@@ -39,6 +63,9 @@ class RuleManager:
 
         self.rules = []
         self.resource_manager = None
+        self.indexed_rules: Dict[Tuple[int, str], List[Tuple[Tuple, "Rule"]]] = {}
+        self.unindexed_rules: List[Tuple[Tuple, "Rule"]] = []
+        self._load_counter = 0
 
     def set_resource_manager(self, resource_manager: "ResourceManager"):
         """Method to set overseeing resource manager.
@@ -71,6 +98,16 @@ class RuleManager:
             else:
                 right = mid - 1
         self.rules.insert(left, rule)
+
+        # newer rules precede older rules of the same priority (as in `rules`)
+        self._load_counter += 1
+        rule.order = (rule.priority, -self._load_counter)
+        rule.index_keys = rule.get_index_keys()
+        if rule.index_keys is None:
+            insort(self.unindexed_rules, (rule.order, rule))
+        else:
+            for key in rule.index_keys:
+                insort(self.indexed_rules.setdefault(key, []), (rule.order, rule))
         return True
 
     def expire(self, rule: "Rule") -> List["EntanglementProtocol"]:
@@ -84,8 +121,30 @@ class RuleManager:
         """
 
         self.rules.remove(rule)
+        if rule.index_keys is None:
+            self.unindexed_rules.remove((rule.order, rule))
+        else:
+            for key in rule.index_keys:
+                bucket = self.indexed_rules[key]
+                bucket.remove((rule.order, rule))
+                if len(bucket) == 0:
+                    del self.indexed_rules[key]
         return rule.protocols
 
+    def get_candidate_rules(self, memory_info: "MemoryInfo") -> Iterator["Rule"]:
+        """Method to get the rules which may be met by a memory.
+
+        Args:
+            memory_info (MemoryInfo): memory info object to test.
+
+        Returns:
+            Iterator[Rule]: rules which may be met (in the order of `rules`).
+        """
+
+        indexed = self.indexed_rules.get((memory_info.index, memory_info.state), [])
+        for _, rule in merge(indexed, self.unindexed_rules):
+            yield rule
+
     def get_memory_manager(self):
         return self.resource_manager.get_memory_manager()
 
@@ -114,6 +173,8 @@ class Rule:
         protocols (List[Protocols]): protocols created by rule.
         rule_manager (RuleManager): reference to rule manager object where rule is installed.
         reservation (Reservation): associated reservation.
+        order (Tuple): sort key of rule in the rule manager.
+        index_keys (List[Tuple[int, str]]): memory indices and states the rule is indexed under (None if not indexed).
     """
 
     def __init__(self, priority: int, action: ActionFunc, condition: ConditionFunc,
@@ -128,6 +189,8 @@ class Rule:
         self.protocols: List[EntanglementProtocol] = []
         self.rule_manager = None
         self.reservation = None
+        self.order = None
+        self.index_keys = None
 
     def set_rule_manager(self, rule_manager: "RuleManager") -> None:
         """Method to assign rule to a rule manager.
@@ -170,6 +233,30 @@ class Rule:
         manager = self.rule_manager.get_memory_manager()
         return self.condition(memory_info, manager, self.condition_args)
 
+    def get_memory_indices(self) -> Optional[List[int]]:
+        """Method to get the indices of memories the rule may fire on.
+
+        Returns:
+            List[int]: sorted memory indices (None if the rule may fire on any memory).
+        """
+
+        if self.condition_args is None or "memory_indices" not in self.condition_args:
+            return None
+        return sorted(set(self.condition_args["memory_indices"]))
+
+    def get_index_keys(self) -> Optional[List[Tuple[int, str]]]:
+        """Method to get the memory indices and states the rule may fire on.
+
+        Returns:
+            List[Tuple[int, str]]: (memory index, state) pairs (None if the rule may fire on any memory).
+        """
+
+        states = getattr(self.condition, "memory_states", None)
+        indices = self.get_memory_indices()
+        if states is None or indices is None:
+            return None
+        return [(index, state) for index in indices for state in states]
+
     def set_reservation(self, reservation: "Reservation") -> None:
         self.reservation = reservation
 
@@ -18,9 +18,11 @@ if TYPE_CHECKING:
     from ..components.optical_channel import QuantumChannel, ClassicalChannel
     from ..components.memory import Memory
     from ..components.photon import Photon
+    from ..components.pulse_train import PulseTrain
     from ..app.random_request import RandomRequestApp
 
 from ..kernel.entity import Entity
+from ..protocol import ProtocolRegistry
 from ..components.memory import MemoryArray
 from ..components.bsm import SingleAtomBSM
 from ..components.light_source import LightSource
@@ -43,7 +45,7 @@ class Node(Entity):
         timeline (Timeline): timeline for simulation.
         cchannels (Dict[str, ClassicalChannel]): mapping of destination node names to classical channel instances.
         qchannels (Dict[str, QuantumChannel]): mapping of destination node names to quantum channel instances.
-        protocols (List[Protocol]): list of attached protocols.
+        protocols (ProtocolRegistry): attached protocols (indexed by name and type).
         generator (np.random.Generator): random number generator used by node.
         components (Dict[str, Entity]): mapping of local component names to objects.
         first_component_name (str): name of component that first receives incoming qubits.
@@ -62,7 +64,7 @@ class Node(Entity):
         self.owner = self
         self.cchannels = {}  # mapping of destination node names to classical channels
         self.qchannels = {}  # mapping of destination node names to quantum channels
-        self.protocols = []
+        self.protocols = ProtocolRegistry()
         self.generator = np.random.default_rng(seed)
         self.components = {}
         self.first_component_name = None
@@ -140,12 +142,11 @@ class Node(Entity):
             "{} receive message {} from {}".format(self.name, msg, src))
         # signal to protocol that we've received a message
         if msg.receiver is not None:
-            for protocol in self.protocols:
-                if protocol.name == msg.receiver and protocol.received_message(src, msg):
+            for protocol in self.protocols.get_by_name(msg.receiver):
+                if protocol.received_message(src, msg):
                     return
         else:
-            matching = [p for p in self.protocols if type(p) == msg.protocol_type]
-            for p in matching:
+            for p in self.protocols.get_by_type(msg.protocol_type):
                 p.received_message(src, msg)
 
     def schedule_qubit(self, dst: str, min_time: int) -> int:
@@ -170,6 +171,23 @@ class Node(Entity):
 
         self.components[self.first_component_name].get(qubit)
 
+    def send_pulse_train(self, dst: str, train: "PulseTrain") -> None:
+        """Interface for quantum channel `transmit_pulse_train` method."""
+
+        self.qchannels[dst].transmit_pulse_train(train, self)
+
+    def receive_pulse_train(self, src: str, train: "PulseTrain") -> None:
+        """Method to receive pulse trains from quantum channel.
+
+        By default, forwards the pulse train to hardware element designated by field `first_component_name`.
+
+        Args:
+            src (str): name of node where pulse train was sent from.
+            train (PulseTrain): transmitted pulse train.
+        """
+
+        self.components[self.first_component_name].get_pulse_train(train)
+
     def get_components_by_type(self, component_type: str) -> List[Entity]:
         return [comp for comp in self.components.values() if type(comp).__name__ == component_type]
 
@@ -215,10 +233,9 @@ class BSMNode(Node):
 
     def receive_message(self, src: str, msg: "Message") -> None:
         # signal to protocol that we've received a message
-        for protocol in self.protocols:
-            if type(protocol) == msg.protocol_type:
-                if protocol.received_message(src, msg):
-                    return
+        for protocol in self.protocols.get_by_type(msg.protocol_type):
+            if protocol.received_message(src, msg):
+                return
 
         # if we reach here, we didn't successfully receive the message in any protocol
         print(src, msg)
@@ -280,14 +297,12 @@ class QuantumRouter(Node):
             self.network_manager.received_message(src, msg)
         else:
             if msg.receiver is None:
-                matching = [p for p in self.protocols if type(p) == msg.protocol_type]
-                for p in matching:
+                for p in self.protocols.get_by_type(msg.protocol_type):
                     p.received_message(src, msg)
             else:
-                for protocol in self.protocols:
-                    if protocol.name == msg.receiver:
-                        protocol.received_message(src, msg)
-                        break
+                matching = self.protocols.get_by_name(msg.receiver)
+                if len(matching) > 0:
+                    matching[0].received_message(src, msg)
 
     def init(self):
         """Method to initialize quantum router node.
@@ -387,9 +402,10 @@ class QKDNode(Node):
         encoding (Dict[str, Any]): encoding type for qkd qubits (from encoding module).
         destination (str): name of destination node for photons
         protocol_stack (List[StackProtocol]): protocols for QKD process.
+        pulse_train (bool): if True, photons are sent and measured as vectorized pulse trains.
     """
 
-    def __init__(self, name: str, timeline: "Timeline", encoding=polarization, stack_size=5):
+    def __init__(self, name: str, timeline: "Timeline", encoding=polarization, stack_size=5, pulse_train=False):
         """Constructor for the qkd node class.
 
         Args:
@@ -397,11 +413,15 @@ class QKDNode(Node):
             timeline (Timeline): simulation timeline.
             encoding (Dict[str, Any]): encoding scheme for qubits (from encoding module) (default polarization).
             stack_size (int): number of qkd protocols to include in the protocol stack (default 5).
+            pulse_train (bool): use the pulse train transport mode (polarization encoding only) (default False).
         """
 
         super().__init__(name, timeline)
         self.encoding = encoding
         self.destination = None
+        self.pulse_train = pulse_train
+        if pulse_train and encoding["name"] != "polarization":
+            raise ValueError("pulse train mode is only supported for polarization encoding")
 
         # hardware setup
         ls_name = name + ".lightsource"
@@ -415,6 +435,8 @@ class QKDNode(Node):
             qsdetector = QSDetectorTimeBin(qsd_name, timeline)
         else:
             raise Exception("invalid encoding {} given for QKD node {}".format(encoding["name"], name))
+        if pulse_train:
+            qsdetector.set_pulse_train_mode(True)
         self.add_component(qsdetector)
         self.set_first_component(qsd_name)
 
@@ -589,10 +611,10 @@ class QKDNode(Node):
 
     def receive_message(self, src: str, msg: "Message") -> None:
         # signal to protocol that we've received a message
-        for protocol in self.protocols:
-            if type(protocol) == msg.protocol_type:
-                protocol.received_message(src, msg)
-                return
+        matching = self.protocols.get_by_type(msg.protocol_type)
+        if len(matching) > 0:
+            matching[0].received_message(src, msg)
+            return
 
         # if we reach here, we didn't successfully receive the message in any protocol
         print(self.protocols)
@@ -600,3 +622,6 @@ class QKDNode(Node):
 
     def get(self, photon: "Photon", **kwargs):
         self.send_qubit(self.destination, photon)
+
+    def get_pulse_train(self, train: "PulseTrain"):
+        self.send_pulse_train(self.destination, train)
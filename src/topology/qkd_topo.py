@@ -1,5 +1,3 @@
-import json
-
 from .topology import Topology as Topo
 from .node import QKDNode
 from ..kernel.timeline import Timeline
@@ -21,7 +19,7 @@ class QKDTopo(Topo):
     QKD_NODE = "QKDNode"
 
     def _load(self, filename):
-        topo_config = json.load(open(filename))
+        topo_config = self._read_config(filename)
         self._add_timeline(topo_config)
         self._add_nodes(topo_config)
         self._add_qchannels(topo_config)
@@ -1,10 +1,18 @@
-from json import load
-from networkx import Graph, dijkstra_path, exception
+from collections import defaultdict
+from hashlib import sha256
+from math import inf
+from json import load, dump, dumps
+import os
+from typing import Dict, List, Optional, Tuple
+
+from networkx import Graph, single_source_dijkstra, single_source_dijkstra_path_length
 from numpy import mean
 
 from .topology import Topology as Topo
 from ..kernel.timeline import Timeline
+from ..kernel.quantum_manager import KET_STATE_FORMALISM
 from .node import BSMNode, QuantumRouter
+from ..network_management.routing import StaticRoutingProtocol
 
 
 class RouterNetTopo(Topo):
@@ -22,6 +30,13 @@ class RouterNetTopo(Topo):
         qchannels (List[QuantumChannel]): list of quantum channel objects in network.
         cchannels (List[ClassicalChannel]): list of classical channel objects in network.
         tl (Timeline): the timeline used for simulation
+        routing_graph (Graph): weighted graph of quantum routers used to generate forwarding tables.
+
+    If the `routing_cache` directory is given in the configuration file,
+    forwarding tables are stored in (and loaded from) the directory, keyed by a hash of the routing graph.
+    If `on_demand_routing` is true in the configuration file, forwarding tables are not generated when loading;
+    each router computes its table from its own shortest path tree when the table is first used
+    (for large networks, where all forwarding tables do not fit in memory).
     """
     ALL_GROUP = "groups"
     ASYNC = "async"
@@ -32,17 +47,20 @@ class RouterNetTopo(Topo):
     LOOKAHEAD = "lookahead"
     MEET_IN_THE_MID = "meet_in_the_middle"
     MEMO_ARRAY_SIZE = "memo_size"
+    ON_DEMAND_ROUTING = "on_demand_routing"
     PORT = "port"
     PROC_NUM = "process_num"
     QUANTUM_ROUTER = "QuantumRouter"
+    ROUTING_CACHE = "routing_cache"
+    ROUTING_CACHE_VERSION = 2
 
     def __init__(self, conf_file_name: str):
         self.bsm_to_router_map = {}
+        self.routing_graph: Optional[Graph] = None
         super().__init__(conf_file_name)
 
     def _load(self, filename):
-        with open(filename, 'r') as fh:
-            config = load(fh)
+        config = self._read_config(filename)
         # quantum connections are only supported by sequential simulation so far
         if not config[self.IS_PARALLEL]:
             self._add_qconnections(config)
@@ -60,7 +78,7 @@ class RouterNetTopo(Topo):
         if config.get(self.IS_PARALLEL, False):
             raise Exception("Please install 'psequence' package for parallel simulations.")
         else:
-            self.tl = Timeline(stop_time)
+            self.tl = Timeline(stop_time, config.get(Topo.FORMALISM, KET_STATE_FORMALISM))
 
     def _map_bsm_routers(self, config):
         for qc in config[Topo.ALL_Q_CHANNEL]:
@@ -105,29 +123,40 @@ class RouterNetTopo(Topo):
             if r1 is not None:
                 r1.add_bsm_node(bsm, r0_str)
 
+    def _index_cc_delays(self, config) -> Dict[Tuple[str, str], List[float]]:
+        """Method to index delays of classical channels and connections by (unordered) pair of node names.
+
+        Returns:
+            Dict[Tuple[str, str], List[float]]: mapping of sorted pairs of node names to delays (in ps),
+                with delays of classical channels before delays of classical connections.
+        """
+
+        cc_delays = defaultdict(list)
+        for cc in config.get(self.ALL_C_CHANNEL, []):
+            pair = tuple(sorted((cc[self.SRC], cc[self.DST])))
+            cc_delays[pair].append(cc.get(self.DELAY, cc.get(self.DISTANCE, 1000) / 2e-4))
+        for cc in config.get(self.ALL_CC_CONNECT, []):
+            pair = tuple(sorted((cc[self.CONNECT_NODE_1], cc[self.CONNECT_NODE_2])))
+            cc_delays[pair].append(cc.get(self.DELAY, cc.get(self.DISTANCE, 1000) / 2e-4))
+        return cc_delays
+
     def _add_qconnections(self, config):
-        for q_connect in config.get(Topo.ALL_QC_CONNECT, []):
+        q_connects = config.get(Topo.ALL_QC_CONNECT, [])
+        if len(q_connects) == 0:
+            return
+
+        cc_delays = self._index_cc_delays(config)
+        all_nodes = config[self.ALL_NODE]
+        all_qchannels = config.setdefault(self.ALL_Q_CHANNEL, [])
+        all_cchannels = config.setdefault(self.ALL_C_CHANNEL, [])
+        for q_connect in q_connects:
             node1 = q_connect[Topo.CONNECT_NODE_1]
             node2 = q_connect[Topo.CONNECT_NODE_2]
             attenuation = q_connect[Topo.ATTENUATION]
             distance = q_connect[Topo.DISTANCE] // 2
             channel_type = q_connect[Topo.TYPE]
-            cc_delay = []
-            for cc in config.get(self.ALL_C_CHANNEL, []):
-                if cc[self.SRC] == node1 and cc[self.DST] == node2:
-                    cc_delay.append(cc.delay)
-                elif cc[self.SRC] == node2 and cc[self.DST] == node1:
-                    cc_delay.append(cc.delay)
-
-            for cc in config.get(self.ALL_CC_CONNECT, []):
-                if (cc[self.CONNECT_NODE_1] == node1
-                    and cc[self.CONNECT_NODE_2] == node2) \
-                        or (cc[self.CONNECT_NODE_1] == node2
-                            and cc[self.CONNECT_NODE_2] == node1):
-                    delay = cc.get(self.DELAY,
-                                   cc.get(self.DISTANCE, 1000) / 2e-4)
-                    cc_delay.append(delay)
-            if len(cc_delay) == 0:
+            cc_delay = cc_delays.get(tuple(sorted((node1, node2))))
+            if not cc_delay:
                 assert 0, q_connect
             cc_delay = mean(cc_delay) // 2
             if channel_type == self.MEET_IN_THE_MID:
@@ -135,7 +164,7 @@ class RouterNetTopo(Topo):
                 bsm_info = {self.NAME: bsm_name,
                             self.TYPE: self.BSM_NODE,
                             self.SEED: 0}
-                config[self.ALL_NODE].append(bsm_info)
+                all_nodes.append(bsm_info)
 
                 for src in [node1, node2]:
                     qc_name = "QC.{}.{}".format(src, bsm_name)
@@ -144,9 +173,7 @@ class RouterNetTopo(Topo):
                                self.DST: bsm_name,
                                self.DISTANCE: distance,
                                self.ATTENUATION: attenuation}
-                    if self.ALL_Q_CHANNEL not in config:
-                        config[self.ALL_Q_CHANNEL] = []
-                    config[self.ALL_Q_CHANNEL].append(qc_info)
+                    all_qchannels.append(qc_info)
 
                     cc_name = "CC.{}.{}".format(src, bsm_name)
                     cc_info = {self.NAME: cc_name,
@@ -154,9 +181,7 @@ class RouterNetTopo(Topo):
                                self.DST: bsm_name,
                                self.DISTANCE: distance,
                                self.DELAY: cc_delay}
-                    if self.ALL_C_CHANNEL not in config:
-                        config[self.ALL_C_CHANNEL] = []
-                    config[self.ALL_C_CHANNEL].append(cc_info)
+                    all_cchannels.append(cc_info)
 
                     cc_name = "CC.{}.{}".format(bsm_name, src)
                     cc_info = {self.NAME: cc_name,
@@ -164,11 +189,11 @@ class RouterNetTopo(Topo):
                                self.DST: src,
                                self.DISTANCE: distance,
                                self.DELAY: cc_delay}
-                    config[self.ALL_C_CHANNEL].append(cc_info)
+                    all_cchannels.append(cc_info)
             else:
                 raise NotImplementedError("Unknown type of quantum connection")
 
-    def _generate_forwarding_table(self, config):
+    def _build_routing_graph(self, config) -> Graph:
         graph = Graph()
         for node in config[Topo.ALL_NODE]:
             if node[Topo.TYPE] == self.QUANTUM_ROUTER:
@@ -193,18 +218,131 @@ class RouterNetTopo(Topo):
                     costs[bsm][-1] += qc.distance
 
         graph.add_weighted_edges_from(costs.values())
+        return graph
+
+    @staticmethod
+    def _compute_next_hops(graph: Graph, sources, roots=None) \
+            -> Tuple[Dict[str, Dict[str, str]], Dict[str, Dict[str, float]]]:
+        """Method to compute next hops between pairs of routers.
+
+        One shortest path tree is computed per router.
+        The path between two routers is taken from the tree of the router with the smaller name
+        (so both directions use the same path).
+
+        Args:
+            graph (Graph): routing graph.
+            sources (Set[str]): routers for which shortest path lengths are returned.
+            roots (List[str]): routers for which shortest path trees are computed (default None for all routers);
+                only next hops between a root and routers with greater names are returned.
+
+        Returns:
+            Tuple[Dict[str, Dict[str, str]], Dict[str, Dict[str, float]]]: mapping of router names to forwarding tables,
+                and mapping of names of `sources` routers (that are roots) to shortest path lengths.
+        """
+
+        next_hops = {name: {} for name in graph.nodes}
+        distances = {}
+        for src in (graph.nodes if roots is None else roots):
+            dist, paths = single_source_dijkstra(graph, src)
+            if src in sources:
+                distances[src] = dist
+            for dst, path in paths.items():
+                if dst > src:
+                    next_hops[src][dst] = path[1]
+                    next_hops[dst][src] = path[-2]
+        return next_hops, distances
+
+    @classmethod
+    def _routing_cache_file(cls, cache_dir: str, graph: Graph) -> str:
+        edges = sorted([min(n1, n2), max(n1, n2), weight] for n1, n2, weight in graph.edges.data("weight"))
+        content = dumps({"version": cls.ROUTING_CACHE_VERSION, "nodes": sorted(graph.nodes), "edges": edges})
+        return os.path.join(cache_dir, "routing_{}.json".format(sha256(content.encode()).hexdigest()))
+
+    def _generate_forwarding_table(self, config):
+        self.routing_graph = graph = self._build_routing_graph(config)
+        if config.get(self.ON_DEMAND_ROUTING, False):
+            for src in self.nodes[self.QUANTUM_ROUTER]:
+                src.network_manager.protocol_stack[0].set_graph(graph, on_demand=True)
+            return
+
+        local_routers = {router.name for router in self.nodes[self.QUANTUM_ROUTER]}
+
+        cache_dir = config.get(self.ROUTING_CACHE)
+        cache_file = None if cache_dir is None else self._routing_cache_file(cache_dir, graph)
+        if cache_file is not None and os.path.exists(cache_file):
+            with open(cache_file, 'r') as fh:
+                cached = load(fh)
+            next_hops, distances = cached["next_hops"], cached["distances"]
+        elif cache_file is not None:
+            # shortest path lengths of all routers are stored, as processes may have different local routers
+            next_hops, distances = self._compute_next_hops(graph, set(graph.nodes))
+            os.makedirs(cache_dir, exist_ok=True)
+            # write and rename so that concurrent processes never read a partial file
+            tmp_file = "{}.{}.tmp".format(cache_file, os.getpid())
+            with open(tmp_file, 'w') as fh:
+                dump({"next_hops": next_hops, "distances": distances}, fh)
+            os.replace(tmp_file, cache_file)
+        else:
+            next_hops, distances = self._compute_next_hops(graph, local_routers)
+
         for src in self.nodes[self.QUANTUM_ROUTER]:
+            # routing protocol locates at the bottom of the stack
+            routing_protocol = src.network_manager.protocol_stack[0]
+            table = next_hops[src.name]
             for dst_name in graph.nodes:
-                if src.name == dst_name:
+                if dst_name in table:
+                    routing_protocol.add_forwarding_rule(dst_name, table[dst_name])
+            routing_protocol.set_graph(graph, distances.get(src.name))
+
+    def update_link(self, node1: str, node2: str, distance: Optional[float] = None) -> None:
+        """Method to change the length of a link between routers in the routing graph.
+
+        Forwarding tables of local routers are updated incrementally:
+        shortest path trees are only recomputed for routers whose shortest paths may be affected,
+        and the path between two routers is still taken from the tree of the router with the smaller name.
+
+        Args:
+            node1 (str): name of first router.
+            node2 (str): name of second router.
+            distance (float): new length of the link (default None to remove the link).
+        """
+
+        graph = self.routing_graph
+        old_distance = graph[node1][node2]["weight"] if graph.has_edge(node1, node2) else None
+        # shortest path lengths of all routers to the ends of the link before the change
+        dist1 = single_source_dijkstra_path_length(graph, node1)
+        dist2 = single_source_dijkstra_path_length(graph, node2)
+        if distance is None:
+            if old_distance is not None:
+                graph.remove_edge(node1, node2)
+        else:
+            graph.add_edge(node1, node2, weight=distance)
+
+        affected = [name for name in graph.nodes
+                    if StaticRoutingProtocol.link_change_affects(dist1.get(name, inf), dist2.get(name, inf),
+                                                                 old_distance, distance)]
+        if len(affected) == 0:
+            return
+
+        local_routers = {router.name for router in self.nodes[self.QUANTUM_ROUTER]}
+        next_hops, distances = self._compute_next_hops(graph, local_routers, affected)
+        for router in self.nodes[self.QUANTUM_ROUTER]:
+            routing_protocol = router.network_manager.protocol_stack[0]
+            if routing_protocol.on_demand and routing_protocol.distances is None:
+                # table not computed yet; will use the modified graph
+                continue
+            table = next_hops[router.name]
+            for root in affected:
+                if root == router.name:
+                    dsts = [name for name in graph.nodes if name > root]
+                elif root < router.name:
+                    dsts = [root]
+                else:
                     continue
-                try:
-                    if dst_name > src.name:
-                        path = dijkstra_path(graph, src.name, dst_name)
+                for dst in dsts:
+                    if dst in table:
+                        routing_protocol.update_forwarding_rule(dst, table[dst])
                     else:
-                        path = dijkstra_path(graph, dst_name, src.name)[::-1]
-                    next_hop = path[1]
-                    # routing protocol locates at the bottom of the stack
-                    routing_protocol = src.network_manager.protocol_stack[0]
-                    routing_protocol.add_forwarding_rule(dst_name, next_hop)
-                except exception.NetworkXNoPath:
-                    pass
+                        routing_protocol.forwarding_table.pop(dst, None)
+            if router.name in distances:
+                routing_protocol.distances = distances[router.name]
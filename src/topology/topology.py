@@ -6,6 +6,8 @@ Topology instances automatically perform many useful network functions.
 """
 from abc import abstractmethod
 from collections import defaultdict
+import gzip
+import json
 from typing import TYPE_CHECKING, Dict, Optional
 
 if TYPE_CHECKING:
@@ -21,6 +23,8 @@ class Topology:
     The topology class provides a simple interface for managing the nodes
     and connections in a network.
     A network may also be generated using an external json file.
+    Configuration files may be compressed with gzip (`.gz` suffix),
+    or encoded with msgpack (`.msgpack` suffix, requires the `msgpack` package).
 
     Attributes:
         nodes (Dict[str, List[Node]]): mapping of type of node to a list of same type node.
@@ -40,6 +44,7 @@ class Topology:
     DELAY = "delay"
     DISTANCE = "distance"
     DST = "destination"
+    FORMALISM = "formalism"
     NAME = "name"
     SEED = "seed"
     SRC = "source"
@@ -67,6 +72,33 @@ class Topology:
         """
         pass
 
+    @staticmethod
+    def _read_config(filename: str) -> Dict:
+        """Method to read a configuration file.
+
+        Args:
+            filename (str): the name of configuration file (json, or msgpack if the name ends with `.msgpack`).
+                Files with names ending with `.gz` are decompressed with gzip.
+
+        Returns:
+            Dict: the parsed configuration.
+        """
+
+        compressed = filename.endswith(".gz")
+        name = filename[:-len(".gz")] if compressed else filename
+        opener = gzip.open if compressed else open
+
+        if name.endswith(".msgpack"):
+            try:
+                import msgpack
+            except ImportError:
+                raise ImportError("Please install 'msgpack' package to load msgpack configuration files.")
+            with opener(filename, 'rb') as fh:
+                return msgpack.unpack(fh, raw=False)
+
+        with opener(filename, 'rt') as fh:
+            return json.load(fh)
+
     def _add_qchannels(self, config: Dict) -> None:
         for qc in config.get(self.ALL_Q_CHANNEL, []):
             src_str, dst_str = qc[self.SRC], qc[self.DST]
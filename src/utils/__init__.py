@@ -1,4 +1,4 @@
-__all__ = ['encoding', 'log']
+__all__ = ['encoding', 'interval_tree', 'log']
 
 def __dir__():
     return sorted(__all__)
@@ -0,0 +1,178 @@
+"""Definition of an interval tree.
+
+This module defines a dynamic interval tree, used to find stored closed intervals overlapping a query interval.
+The tree is a treap (randomized binary search tree) ordered by interval start,
+where each node is augmented with the maximum interval end of its subtree.
+Insertion, removal, and overlap queries take O(log n) expected time (plus the number of reported intervals).
+"""
+
+from random import Random
+from typing import Any, List, Optional
+
+
+class _TreeNode:
+    __slots__ = ("key", "start", "end", "value", "priority", "max_end", "left", "right")
+
+    def __init__(self, start, end, value: Any, priority: float):
+        self.key = (start, end, value)
+        self.start = start
+        self.end = end
+        self.value = value
+        self.priority = priority
+        self.max_end = end
+        self.left: Optional["_TreeNode"] = None
+        self.right: Optional["_TreeNode"] = None
+
+    def update(self) -> None:
+        max_end = self.end
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+class IntervalTree:
+    """Class for a dynamic interval tree.
+
+    Intervals are closed (`[start, end]`) and carry a value.
+    Values of intervals with the same start and end should be comparable (e.g. integer indices).
+
+    Attributes:
+        root (_TreeNode): root of the treap.
+    """
+
+    def __init__(self, seed: int = 0):
+        """Constructor for interval tree.
+
+        Args:
+            seed (int): seed for the random node priorities (default 0).
+        """
+
+        self.root: Optional[_TreeNode] = None
+        self._rng = Random(seed)
+        self._size = 0
+
+    def insert(self, start, end, value: Any) -> None:
+        """Method to insert an interval.
+
+        Args:
+            start (int): start of interval.
+            end (int): end of interval (inclusive).
+            value (Any): value attached to the interval.
+        """
+
+        assert start <= end
+        node = _TreeNode(start, end, value, self._rng.random())
+        self.root = self._insert(self.root, node)
+        self._size += 1
+
+    def remove(self, start, end, value: Any) -> bool:
+        """Method to remove an interval.
+
+        Args:
+            start (int): start of interval.
+            end (int): end of interval (inclusive).
+            value (Any): value attached to the interval.
+
+        Returns:
+            bool: if the interval was found (and removed).
+        """
+
+        self.root, found = self._remove(self.root, (start, end, value))
+        if found:
+            self._size -= 1
+        return found
+
+    def overlap(self, start, end) -> List[Any]:
+        """Method to find intervals overlapping a closed interval.
+
+        Args:
+            start (int): start of query interval.
+            end (int): end of query interval (inclusive).
+
+        Returns:
+            List[Any]: values of overlapping intervals (ordered by interval start).
+        """
+
+        result = []
+        stack = []
+        node = self.root
+        # in-order traversal, pruning subtrees ending before `start` or starting after `end`
+        while stack or node is not None:
+            if node is not None:
+                if node.max_end < start:
+                    node = None
+                    continue
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                if node.start > end:
+                    break
+                if node.end >= start:
+                    result.append(node.value)
+                node = node.right
+        return result
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _rotate_right(node: _TreeNode) -> _TreeNode:
+        left = node.left
+        node.left = left.right
+        node.update()
+        left.right = node
+        left.update()
+        return left
+
+    @staticmethod
+    def _rotate_left(node: _TreeNode) -> _TreeNode:
+        right = node.right
+        node.right = right.left
+        node.update()
+        right.left = node
+        right.update()
+        return right
+
+    def _insert(self, node: Optional[_TreeNode], new: _TreeNode) -> _TreeNode:
+        if node is None:
+            return new
+        if new.key < node.key:
+            node.left = self._insert(node.left, new)
+            if node.left.priority > node.priority:
+                return self._rotate_right(node)
+        else:
+            node.right = self._insert(node.right, new)
+            if node.right.priority > node.priority:
+                return self._rotate_left(node)
+        node.update()
+        return node
+
+    def _remove(self, node: Optional[_TreeNode], key: tuple):
+        if node is None:
+            return None, False
+        if key < node.key:
+            node.left, found = self._remove(node.left, key)
+        elif key > node.key:
+            node.right, found = self._remove(node.right, key)
+        else:
+            return self._merge(node.left, node.right), True
+        node.update()
+        return node, found
+
+    def _merge(self, left: Optional[_TreeNode], right: Optional[_TreeNode]) -> Optional[_TreeNode]:
+        # all keys of `left` precede keys of `right`
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            left.update()
+            return left
+        else:
+            right.left = self._merge(left, right.left)
+            right.update()
+            return right
@@ -0,0 +1,31 @@
+import json
+
+from sequence.app.request_app import RequestApp
+from sequence.kernel.quantum_manager import KET_STATE_FORMALISM, BELL_DIAGONAL_STATE_FORMALISM
+from sequence.topology.router_net_topo import RouterNetTopo
+
+
+def run_request(tmp_path, formalism):
+    with open("tests/topology/router_net_topo_sample_config.json") as fh:
+        config = json.load(fh)
+    config[RouterNetTopo.STOP_TIME] = 1.4e12
+    config[RouterNetTopo.FORMALISM] = formalism
+    config_file = str(tmp_path / "{}.json".format(formalism))
+    with open(config_file, "w") as fh:
+        json.dump(config, fh)
+
+    topo = RouterNetTopo(config_file)
+    apps = {r.name: RequestApp(r) for r in topo.get_nodes_by_type(RouterNetTopo.QUANTUM_ROUTER)}
+    # pairs of e3 and e4 need two rounds of purification to reach the target fidelity
+    apps["e3"].start("e4", 1e12, 1.3e12, 10, 0.9)
+    tl = topo.get_timeline()
+    tl.init()
+    tl.run()
+    return apps["e3"].get_throughput()
+
+
+def test_RequestApp_formalisms(tmp_path):
+    ket_throughput = run_request(tmp_path, KET_STATE_FORMALISM)
+    bell_diagonal_throughput = run_request(tmp_path, BELL_DIAGONAL_STATE_FORMALISM)
+    assert ket_throughput > 0
+    assert 0.5 * ket_throughput < bell_diagonal_throughput <= ket_throughput
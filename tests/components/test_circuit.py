@@ -167,3 +167,27 @@ def test_serialization():
     assert deserailized_circuit.size == circuit.size
     assert deserailized_circuit.gates == circuit.gates
     assert deserailized_circuit.measured_qubits == circuit.measured_qubits
+
+
+def test_nonadjacent_gates():
+    # cx with control on last qubit and target on first qubit
+    qc = Circuit(3)
+    qc.cx(2, 0)
+    expect = identity(8)
+    for i in range(8):
+        if i & 1:
+            expect[:, i] = 0
+            expect[i ^ 4, i] = 1
+    assert array_equal(expect, qc.get_unitary_matrix())
+
+    # equivalent to swapping qubits before and after gate
+    qc2 = Circuit(3)
+    qc2.swap(0, 2)
+    qc2.cx(0, 2)
+    qc2.swap(0, 2)
+    assert array_equal(qc.get_unitary_matrix(), qc2.get_unitary_matrix())
+
+    with raises(NotImplementedError):
+        qc3 = Circuit(1)
+        qc3.gates.append(['unknown', [0], None])
+        qc3.get_unitary_matrix()
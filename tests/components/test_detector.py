@@ -48,6 +48,32 @@ def test_Detector_init():
     assert len(tl.events) == 2
 
 
+def test_Detector_get_pulse_train():
+    # efficiency, dead time and time resolution
+    detector, parent, tl = create_detector(efficiency=0.5, count_rate=1e9, time_resolution=150)
+    detector.pulse_train_mode = True
+    tl.init()
+    assert len(tl.events) == 0
+    times = np.arange(1000) * int(1e4)
+    detector.get_pulse_train(times, 0, int(1e7))
+    assert detector.photon_counter == 1000
+    assert abs(len(parent.log) / 1000 - 0.5) < 0.1
+    assert all(msg_time % 150 == 0 for _, msg_time, _ in parent.log)
+
+    parent.log = []
+    detector.next_detection_time = -1
+    detector.efficiency = 1
+    detector.get_pulse_train(np.array([10, 10, 500, 1500]), 0, 2000)
+    assert [msg_time for _, msg_time, _ in parent.log] == [0, 1500]
+
+    # dark count
+    detector, parent, tl = create_detector(dark_count=1e6)
+    detector.pulse_train_mode = True
+    tl.init()
+    detector.get_pulse_train(np.array([], dtype=int), 0, int(1e11))
+    assert abs(len(parent.log) / 1e5 - 1) < 0.05
+
+
 def test_Detector_get():
     # efficiency
     efficiency = 0.5
@@ -329,3 +355,25 @@ def test_QSDetectorFockInterference():
 
     times = qsd.get_photon_times()
     assert len(times[0]) == NUM_TRIALS
+
+
+def test_fock_povm_cache():
+    tl = Timeline(formalism=FOCK_DENSITY_MATRIX_FORMALISM)
+    tl.quantum_manager.truncation = 2
+    qsd1 = QSDetectorFockInterference("qsd1", tl, ["a", "b"])
+    qsd2 = QSDetectorFockInterference("qsd2", tl, ["a", "b"], phase=np.pi / 2)
+    qsd3 = QSDetectorFockDirect("qsd3", tl, ["a", "b"])
+    [qsd3.update_detector_params(i, "efficiency", eff) for i, eff in enumerate([0.5, 1])]
+    tl.init()
+
+    # operators are shared between detectors and phases
+    qsd1.set_phase(np.pi / 2)
+    assert all(povm1 is povm2 for povm1, povm2 in zip(qsd1.povms, qsd2.povms))
+    assert np.allclose(sum(qsd1.povms), np.eye(9))
+    assert not qsd1.povms[0].flags.writeable
+
+    # each detector of direct detector uses its own efficiency
+    assert np.allclose(qsd3.povms[0] + qsd3.povms[1], np.eye(3))
+    assert np.allclose(qsd3.povms[2] + qsd3.povms[3], np.eye(3))
+    assert np.allclose(np.diag(qsd3.povms[1]), [0, 0.5, 0.75])
+    assert np.allclose(np.diag(qsd3.povms[3]), [0, 1, 1])
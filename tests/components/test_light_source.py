@@ -38,3 +38,46 @@ def test_light_source():
         index = int(qubit.name)
         assert state_list[index] == qubit.quantum_state.state
         assert time == index * (1e12 / FREQ)
+
+
+class Owner:
+    def __init__(self, seed):
+        self.generator = random.default_rng(seed)
+
+    def get_generator(self):
+        return self.generator
+
+
+def _emit(seed, batch_emission):
+    tl = Timeline()
+    FREQ, MEAN = 1e8, 0.1
+    ls = LightSource("ls", tl, frequency=FREQ, mean_photon_num=MEAN, bandwidth=0.1, batch_emission=batch_emission)
+    receiver = Receiver(tl)
+    ls.add_receiver(receiver)
+    ls.owner = Owner(seed)
+
+    state_list = [polarization["bases"][i % 2][(i // 2) % 2] for i in range(10000)]
+
+    tl.init()
+    ls.emit(state_list)
+    tl.run()
+    return state_list, ls, receiver.log
+
+
+def test_light_source_batch():
+    FREQ, MEAN = 1e8, 0.1
+    state_list, ls, log = _emit(0, True)
+    _, _, log_single = _emit(0, False)
+
+    assert ls.photon_counter == len(log)
+    assert abs(len(log) / len(state_list) - MEAN) < 0.02
+    assert abs(len(log) - len(log_single)) / len(log_single) < 0.1
+    for time, photon in log:
+        index = int(photon.name)
+        assert state_list[index] == photon.quantum_state.state
+        assert time == index * (1e12 / FREQ)
+        assert abs(photon.wavelength - 1550) < 1
+
+    # same seed gives same emission
+    _, _, log2 = _emit(0, True)
+    assert [(t, p.name, p.wavelength) for t, p in log] == [(t, p.name, p.wavelength) for t, p in log2]
@@ -13,3 +13,24 @@ def test_event():
     assert e1 < e2
     assert e1 < e3
     assert e3 < e2
+
+
+def test_event_time_update():
+    e1 = Event(5, None, 1)
+    e2 = Event(6, None, 0)
+    assert e1 < e2
+    e1.time = 7
+    assert e2 < e1
+    e2.priority = 2
+    e2.time = 7
+    assert e1 < e2
+
+
+def test_event_pickle():
+    import pickle
+
+    e1 = Event(5, None, 1)
+    e1.set_invalid()
+    e2 = pickle.loads(pickle.dumps(e1))
+    assert e2.time == 5 and e2.priority == 1 and e2.is_invalid()
+    assert not e2._queued and e2._version == 0
@@ -1,5 +1,5 @@
 from sequence.kernel.event import Event
-from sequence.kernel.eventlist import EventList
+from sequence.kernel.eventlist import EventList, CalendarEventList
 from numpy import random
 
 
@@ -150,9 +150,162 @@ def test_update_event_time():
             pre_time = event.time
 
 
+def test_update_event_time_stale():
+    random.seed(3)
+    el = EventList(compact_min_size=1000)
+    events = [Event(int(random.randint(1, 1000)), None) for _ in range(300)]
+    for e in events:
+        el.push(e)
+    for e in events:
+        el.update_event_time(e, int(random.randint(1, 1000)))
+    # previous entries of rescheduled events are stale
+    assert len(el) == 300 and len(el.data) == 300
+
+    popped = el.pop()
+    assert not el.contains(popped)
+    el.update_event_time(popped, popped.time + 10)  # not in heap; no effect
+    assert len(el) == 299
+
+    times = [popped.time]
+    remaining = []
+    while not el.isempty():
+        remaining.append(el.pop())
+        times.append(remaining[-1].time)
+    assert times == sorted(times)
+    assert len(set(map(id, remaining))) == 299 and popped not in remaining
+    assert len(el._heap) == 0
+
+    # stale entries count towards compaction
+    el = EventList(compact_ratio=0.5, compact_min_size=0)
+    e1, e2 = Event(1, None), Event(2, None)
+    el.push(e1)
+    el.push(e2)
+    el.update_event_time(e1, 3)
+    assert len(el._heap) == 3
+    el.update_event_time(e1, 1)
+    assert len(el._heap) == 4
+    el.update_event_time(e1, 4)
+    assert len(el._heap) == 2
+    assert el.pop() is e2 and el.pop() is e1
+
+
+def test_compact():
+    el = EventList(compact_ratio=0.5, compact_min_size=0)
+    events = [Event(t, None) for t in range(10)]
+    for e in events:
+        el.push(e)
+    for e in events[:5]:
+        el.remove(e)
+    assert len(el) == 10
+    el.remove(events[5])
+    assert len(el) == 4
+    assert all(not e.is_invalid() for e in el)
+    assert [el.pop().time for _ in range(4)] == [6, 7, 8, 9]
+
+    # removing popped events does not count towards compaction
+    el = EventList(compact_ratio=0.5, compact_min_size=0)
+    e1, e2, e3 = Event(1, None), Event(2, None), Event(3, None)
+    for e in [e1, e2, e3]:
+        el.push(e)
+    el.pop()
+    el.remove(e1)
+    assert len(el) == 2 and el._invalid_num == 0
+
+
 def test_top():
     el = generate_event_list_with_random_time(0, 10)
     while not el.isempty():
         top_event = el.top()
         popped_event = el.pop()
         assert top_event == popped_event
+
+
+def test_calendar_pop():
+    random.seed(0)
+    el = CalendarEventList()
+    events = []
+    for _ in range(1000):
+        e = Event(int(random.randint(MIN_TS, MAX_TS * 1000)), None, int(random.randint(0, 5)))
+        events.append(e)
+        el.push(e)
+    assert len(el) == 1000
+
+    expect = sorted(events, key=lambda e: (e.time, e.priority))
+    popped = [el.pop() for _ in range(len(events))]
+    assert [(e.time, e.priority) for e in popped] == [(e.time, e.priority) for e in expect]
+    assert el.isempty()
+
+
+def test_calendar_same_time_fifo():
+    el = CalendarEventList()
+    events = [Event(10, None, p) for p in [2, 1, 2, 1, 0]]
+    for e in events:
+        el.push(e)
+    order = [el.pop() for _ in range(len(events))]
+    assert order == [events[4], events[1], events[3], events[0], events[2]]
+    assert all(a is b for a, b in zip(order, [events[4], events[1], events[3], events[0], events[2]]))
+
+
+def test_calendar_interleaved():
+    random.seed(1)
+    heap = EventList()
+    calendar = CalendarEventList()
+    now = 0
+    for _ in range(5000):
+        if random.random() < 0.55 or heap.isempty():
+            t = now + int(random.exponential(100))
+            p = int(random.randint(0, 3))
+            heap.push(Event(t, None, p))
+            calendar.push(Event(t, None, p))
+        else:
+            assert calendar.top() == heap.top()
+            e1 = heap.pop()
+            e2 = calendar.pop()
+            assert e1 == e2
+            now = e1.time
+    assert len(heap) == len(calendar)
+    while not heap.isempty():
+        assert heap.pop() == calendar.pop()
+    assert calendar.isempty()
+
+
+def test_calendar_update_event_time():
+    random.seed(2)
+    el = CalendarEventList()
+    events = [Event(int(random.randint(1, 10000)), None) for _ in range(500)]
+    for e in events:
+        el.push(e)
+    for e in events[::3]:
+        el.update_event_time(e, int(random.randint(1, 10000)))
+
+    pre_time = -1
+    while not el.isempty():
+        event = el.pop()
+        assert event.time >= pre_time
+        pre_time = event.time
+
+
+def test_calendar_remove_and_inf():
+    el = CalendarEventList()
+    e1 = Event(0, None)
+    e2 = Event(1, None)
+    e3 = Event(float("inf"), None)
+    for e in [e3, e2, e1]:
+        el.push(e)
+    el.remove(e2)
+    assert e2.is_invalid() and not e1.is_invalid()
+    assert set(map(id, el)) == {id(e1), id(e2), id(e3)}
+    assert el.pop() is e1
+    assert el.pop() is e2
+    assert el.pop() is e3
+
+
+def test_calendar_compact():
+    el = CalendarEventList(compact_ratio=0.5, compact_min_size=0)
+    events = [Event(t * 100, None) for t in range(10)]
+    for e in events:
+        el.push(e)
+    for e in events[:6]:
+        el.remove(e)
+    assert len(el) == 4
+    assert [el.pop().time for _ in range(4)] == [600, 700, 800, 900]
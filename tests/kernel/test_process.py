@@ -22,3 +22,55 @@ def test_run():
     assert a.counter == 1 and b.counter == 0
     p2.run()
     assert a.counter == 1 and b.counter == -10
+
+
+def test_owner_rebind():
+    class Dummy():
+        def __init__(self):
+            self.counter = 0
+
+        def add(self, x=1):
+            self.counter += x
+
+    a = Dummy()
+    b = Dummy()
+    p = Process(a, "add", [], {"x": 2})
+    p.run()
+    p.owner = b
+    p.run()
+    assert a.counter == 2 and b.counter == 2
+    assert Process(a, "add", []).act_kwargs == {}
+
+
+def test_activation_rebind():
+    class Dummy():
+        def __init__(self):
+            self.counter = 0
+
+        def add(self, x):
+            self.counter += x
+
+        def minus(self, x):
+            self.counter -= x
+
+    a = Dummy()
+    p = Process(a, "add", [3])
+    p.run()
+    p.activation = "minus"
+    p.run()
+    assert a.counter == 0 and p.activation == "minus"
+
+
+def test_pickle():
+    import pickle
+    from sequence.kernel.event import Event
+
+    p = Process("entity", "add", [1], {"x": 2})
+    p2 = pickle.loads(pickle.dumps(p))
+    assert p2.owner == "entity" and p2.activation == "add"
+    assert p2.act_params == [1] and p2.act_kwargs == {"x": 2}
+
+    e = Event(5, Process("owner", "m", [1]))
+    e2 = pickle.loads(pickle.dumps(e))
+    assert e2.time == 5 and e2.process.owner == "owner" and e2.process.activation == "m"
+    assert e2.process.act_params == [1] and e2.process.act_kwargs == {}
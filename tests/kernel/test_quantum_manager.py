@@ -1,6 +1,7 @@
 import numpy as np
 from scipy.linalg import fractional_matrix_power
 import math
+from pytest import raises
 
 from sequence.kernel.quantum_manager import *
 from sequence.components.circuit import Circuit
@@ -59,6 +60,39 @@ def test_qmanager_remove():
     assert len(qm.states.keys()) == 0
 
 
+def test_qmanager_key_lifetime():
+    qm = QuantumManagerKet()
+
+    # unentangled keys are reclaimed and reused
+    key = qm.new()
+    qm.remove(key)
+    assert qm.get_stats()["free_keys"] == 1
+    assert qm.new() == key
+
+    # entangled keys are reclaimed when all keys of the state are released
+    keys = [key] + [qm.new() for _ in range(2)]
+    qm.set(keys, [1] + [0] * 7)
+    stats = qm.get_stats()
+    assert stats["live_keys"] == 3 and stats["num_states"] == 1 and stats["largest_group"] == 3
+    assert stats["bytes"] == 8 * 16
+    qm.remove(keys[0])
+    qm.remove(keys[1])
+    assert qm.get_stats()["released_keys"] == 2
+    assert qm.get(keys[2]).keys == keys
+    qm.remove(keys[2])
+    assert len(qm.states) == 0
+    assert qm.get_stats()["free_keys"] == 3
+
+    # released keys are collected after partner state is reset
+    keys = [qm.new() for _ in range(2)]
+    qm.set(keys, [1, 0, 0, 0])
+    qm.remove(keys[0])
+    assert qm.collect() == 0
+    qm.set([keys[1]], [1, 0])
+    assert qm.collect() == 1
+    assert keys[0] not in qm.states and keys[1] in qm.states
+
+
 def test_qmanager_circuit():
     qm = QuantumManagerKet()
 
@@ -197,6 +231,42 @@ def test_qmanager_circuit_density():
     assert np.array_equal(density1.state, density2.state)
 
 
+def test_qmanager_circuit_subset():
+    # circuit on subset of a larger entangled state should match padded dense matrix
+    np.random.seed(0)
+    circuit = Circuit(2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.t(1)
+    pad = np.kron(circuit.get_unitary_matrix(), np.identity(2))
+    swap = np.array([[1, 0, 0, 0, 0, 0, 0, 0],
+                     [0, 0, 1, 0, 0, 0, 0, 0],
+                     [0, 0, 0, 0, 1, 0, 0, 0],
+                     [0, 0, 0, 0, 0, 0, 1, 0],
+                     [0, 1, 0, 0, 0, 0, 0, 0],
+                     [0, 0, 0, 1, 0, 0, 0, 0],
+                     [0, 0, 0, 0, 0, 1, 0, 0],
+                     [0, 0, 0, 0, 0, 0, 0, 1]])  # reorder qubits (0, 1, 2) -> (2, 0, 1)
+
+    ket = np.random.random(8) + 1j * np.random.random(8)
+    ket /= np.linalg.norm(ket)
+
+    qm = QuantumManagerKet()
+    keys = [qm.new() for _ in range(3)]
+    qm.set(keys, ket)
+    qm.run_circuit(circuit, [keys[2], keys[0]])
+    assert qm.get(keys[0]).keys == [keys[2], keys[0], keys[1]]
+    assert np.allclose(qm.get(keys[0]).state, pad @ swap @ ket)
+
+    qm = QuantumManagerDensity()
+    keys = [qm.new() for _ in range(3)]
+    qm.set(keys, np.outer(ket, ket.conj()))
+    qm.run_circuit(circuit, [keys[2], keys[0]])
+    desired = pad @ swap @ np.outer(ket, ket.conj()) @ swap.T @ pad.conj().T
+    assert qm.get(keys[0]).keys == [keys[2], keys[0], keys[1]]
+    assert np.allclose(qm.get(keys[0]).state, desired)
+
+
 def test_qmanager__measure():
     NUM_TESTS = 1000
 
@@ -264,6 +334,54 @@ def test_qmanager__measure():
     assert abs((len(meas_0) / NUM_TESTS) - 0.5) < 0.1
 
 
+def test_qmanager_measure_entangled():
+    # measure first qubit of GHZ state; remaining qubits should collapse to same value
+    ghz = np.zeros(8)
+    ghz[0] = ghz[7] = math.sqrt(1/2)
+    for samp, res in [(0.25, 0), (0.75, 1)]:
+        qm = QuantumManagerKet()
+        keys = [qm.new() for _ in range(3)]
+        qm.set(keys, ghz)
+        assert qm._measure(ghz, [keys[1]], list(keys), samp) == {keys[1]: res}
+        assert qm.get(keys[0]).keys == [keys[0], keys[2]]
+        assert np.allclose(qm.get(keys[0]).state, [1 - res, 0, 0, res])
+
+        qm = QuantumManagerDensity()
+        keys = [qm.new() for _ in range(3)]
+        qm.set(keys, np.outer(ghz, ghz))
+        circuit = Circuit(3)
+        circuit.measure(0)
+        circuit.measure(2)
+        assert qm.run_circuit(circuit, [keys[2], keys[1], keys[0]], samp) == {keys[2]: res, keys[0]: res}
+        desired = np.zeros((8, 8))
+        desired[7 * res, 7 * res] = 1
+        assert np.allclose(qm.get(keys[0]).state, desired)
+
+
+def test_qmanager_measure_factorize():
+    bell = [math.sqrt(1 / 2), 0, 0, math.sqrt(1 / 2)]
+    circuit = Circuit(2)
+    circuit.cx(0, 1)
+    circuit.measure(1)
+
+    for factorize in [False, True]:
+        qm = QuantumManagerKet(factorize=factorize)
+        keys = [qm.new() for _ in range(5)]
+        qm.set(keys[0:2], bell)
+        qm.set(keys[2:4], bell)
+
+        # partner of measured qubit is left in a product state with the other qubit
+        res = qm.run_circuit(circuit, [keys[4], keys[3]], 0.25)
+        assert res == {keys[3]: 0}
+        if factorize:
+            assert qm.get(keys[2]).keys == [keys[2]]
+            assert np.allclose(qm.get(keys[2]).state, [1, 0])
+            assert qm.get(keys[4]).keys == [keys[4]]
+        else:
+            assert qm.get(keys[2]).keys == [keys[4], keys[2]]
+            assert qm.get(keys[2]) is qm.get(keys[4])
+
+
 def test_qmanager__measure_density():
     NUM_TESTS = 1000
 
@@ -553,3 +671,174 @@ def test_qmanager_measure_fock():
             raise Exception()
 
     assert abs((len(meas_0) / NUM_TESTS) - 0.5) < 0.1
+
+
+def test_qmanager_add_loss_fock():
+    TRUNCATION = 2
+    loss = 0.3
+
+    qm = QuantumManagerDensityFock(truncation=TRUNCATION)
+    create, destroy = qm.build_ladder()
+    assert loss_kraus_operators(loss, TRUNCATION) is loss_kraus_operators(loss, TRUNCATION)
+
+    # two photons on second subsystem of compound state
+    key1 = qm.new()
+    key2 = qm.new()
+    qm.apply_operator(np.eye((TRUNCATION + 1) ** 2), [key1, key2])
+    qm.apply_operator(create, [key2])
+    qm.apply_operator(create / math.sqrt(2), [key2])
+    qm.add_loss(key2, loss)
+
+    desired2 = np.diag([loss ** 2, 2 * loss * (1 - loss), (1 - loss) ** 2])
+    desired1 = np.zeros((TRUNCATION + 1, TRUNCATION + 1))
+    desired1[0, 0] = 1
+    assert np.allclose(qm.get(key1).state, np.kron(desired1, desired2))
+
+    # measurement of non-consecutive subsystems
+    keys = [qm.new() for _ in range(3)]
+    qm.apply_operator(np.eye((TRUNCATION + 1) ** 3), keys)
+    qm.apply_operator(create, [keys[2]])
+    povm_vac = np.zeros((TRUNCATION + 1, TRUNCATION + 1))
+    povm_vac[0, 0] = 1
+    povm0 = np.kron(povm_vac, povm_vac)
+    povm1 = np.eye((TRUNCATION + 1) ** 2) - povm0
+    assert qm.measure([keys[2], keys[0]], [povm0, povm1], 0.5) == 1
+    assert qm.get(keys[1]).keys == [keys[1]]
+    assert np.allclose(qm.get(keys[1]).state, desired1)
+
+
+def test_qmanager_stabilizer():
+    from sequence.kernel.timeline import Timeline
+
+    tl = Timeline(formalism=STABILIZER_FORMALISM)
+    assert isinstance(tl.quantum_manager, QuantumManagerStabilizer)
+
+    # compare with ket vector formalism
+    circuit = Circuit(3)
+    circuit.h(0)
+    circuit.cx(0, 2)
+    circuit.s(2)
+    circuit.swap(1, 2)
+    circuit.phase(0, np.pi)
+    circuit.y(1)
+    qm_ket = QuantumManagerKet()
+    qm_stab = QuantumManagerStabilizer()
+    keys_ket = [qm_ket.new() for _ in range(3)]
+    keys_stab = [qm_stab.new() for _ in range(3)]
+    qm_ket.run_circuit(circuit, [keys_ket[2], keys_ket[0], keys_ket[1]])
+    qm_stab.run_circuit(circuit, [keys_stab[2], keys_stab[0], keys_stab[1]])
+    ket = qm_ket.get(keys_ket[0])
+    stab = qm_stab.get(keys_stab[0])
+    assert ket.keys == [2, 0, 1] and stab.keys == [2, 0, 1]
+    assert abs(abs(np.vdot(ket.state, stab.to_ket())) - 1) < 1e-9
+
+    # measure GHZ state of many qubits
+    num_qubits = 200
+    for samp, res in [(0.25, 0), (0.75, 1)]:
+        keys = [qm_stab.new() for _ in range(num_qubits)]
+        circuit = Circuit(1)
+        circuit.h(0)
+        qm_stab.run_circuit(circuit, [keys[0]])
+        circuit = Circuit(2)
+        circuit.cx(0, 1)
+        for key in keys[1:]:
+            qm_stab.run_circuit(circuit, [keys[0], key])
+        assert len(qm_stab.get(keys[0]).keys) == num_qubits
+
+        circuit = Circuit(2)
+        circuit.measure(0)
+        circuit.measure(1)
+        assert qm_stab.run_circuit(circuit, [keys[5], keys[-1]], samp) == {keys[5]: res, keys[-1]: res}
+        assert len(qm_stab.get(keys[0]).keys) == num_qubits - 2
+        circuit = Circuit(1)
+        circuit.measure(0)
+        assert qm_stab.run_circuit(circuit, [keys[0]], 1 - samp) == {keys[0]: res}
+
+    # set to stabilizer states
+    keys = [qm_stab.new() for _ in range(2)]
+    qm_stab.set(keys, [0, math.sqrt(1 / 2), -math.sqrt(1 / 2), 0])
+    assert np.allclose(qm_stab.get(keys[0]).to_ket(), [0, math.sqrt(1 / 2), -math.sqrt(1 / 2), 0])
+    with raises(ValueError):
+        qm_stab.set(keys, [math.sqrt(1 / 3), math.sqrt(2 / 3), 0, 0])
+
+    # non-Clifford gates
+    for gate in ["t", "ccx"]:
+        circuit = Circuit(3)
+        getattr(circuit, gate)(*range({"t": 1, "ccx": 3}[gate]))
+        keys = [qm_stab.new() for _ in range(3)]
+        with raises(NotImplementedError):
+            qm_stab.run_circuit(circuit, keys)
+        assert all(qm_stab.get(key).keys == [key] for key in keys)
+    circuit = Circuit(1)
+    circuit.phase(0, np.pi / 3)
+    with raises(NotImplementedError):
+        qm_stab.run_circuit(circuit, [keys[0]])
+
+
+def test_qmanager_bell_diagonal():
+    from sequence.kernel.timeline import Timeline
+
+    tl = Timeline(formalism=BELL_DIAGONAL_STATE_FORMALISM)
+    assert isinstance(tl.quantum_manager, QuantumManagerBellDiagonal)
+
+    qm = QuantumManagerBellDiagonal()
+    fidelity = 0.9
+    werner = [fidelity] + [(1 - fidelity) / 3] * 3
+
+    # entanglement swapping
+    for samp, results, expected in [(0.1, (0, 0), [1, 0, 0, 0]), (0.9, (1, 1), [0, 0, 0, 1])]:
+        keys = [qm.new() for _ in range(4)]
+        qm.set(keys[0:2], [1, 0, 0, 0])
+        qm.set(keys[2:4], [1, 0, 0, 0])
+        assert qm.swap(keys[1], keys[2], samp) == {keys[1]: results[0], keys[2]: results[1]}
+        assert qm.get(keys[0]).keys == [keys[0], keys[3]]
+        assert np.allclose(qm.get(keys[0]).state, expected)
+        assert np.allclose(qm.get(keys[1]).state, [1 - results[0], results[0]])
+
+    # purification of Werner states
+    keys = [qm.new() for _ in range(4)]
+    qm.set(keys[0:2], werner)
+    qm.set(keys[2:4], werner)
+    res_0 = qm.purify(keys[0], keys[2], 0.1)
+    res_1 = qm.purify(keys[1], keys[3], 0.9)
+    assert res_0 == res_1 == 0
+    error = (1 - fidelity) / 3
+    expected = (fidelity ** 2 + error ** 2) / (fidelity ** 2 + 2 * fidelity * error + 5 * error ** 2)
+    assert abs(qm.get(keys[0]).state[0] - expected) < 1e-9
+    assert qm.get(keys[2]).keys == [keys[2]]
+
+    # pairs are twirled to Werner states before purification
+    keys = [qm.new() for _ in range(4)]
+    qm.set(keys[0:2], [fidelity, 0, 1 - fidelity, 0])
+    qm.set(keys[2:4], [fidelity, 0, 1 - fidelity, 0])
+    qm.purify(keys[0], keys[2], 0.1)
+    qm.purify(keys[1], keys[3], 0.9)
+    assert abs(qm.get(keys[0]).state[0] - expected) < 1e-9
+
+    # Pauli gates and measurement
+    keys = [qm.new() for _ in range(2)]
+    qm.set(keys, [1, 0, 0, 0])
+    circuit = Circuit(1)
+    circuit.x(0)
+    qm.run_circuit(circuit, [keys[1]])
+    assert np.allclose(qm.get(keys[0]).state, [0, 0, 1, 0])
+    circuit = Circuit(1)
+    circuit.measure(0)
+    assert qm.run_circuit(circuit, [keys[0]], 0.75) == {keys[0]: 1}
+    assert np.allclose(qm.get(keys[1]).state, [1, 0])
+
+    # depolarizing
+    keys = [qm.new() for _ in range(2)]
+    qm.set(keys, [1, 0, 0, 0])
+    qm.depolarize(keys[0], 1)
+    assert np.allclose(qm.get(keys[1]).state, [0.25] * 4)
+
+    # unsupported circuits
+    circuit = Circuit(1)
+    circuit.h(0)
+    with raises(NotImplementedError):
+        qm.run_circuit(circuit, [keys[0]])
+    circuit = Circuit(2)
+    circuit.cx(0, 1)
+    with raises(NotImplementedError):
+        qm.run_circuit(circuit, keys)
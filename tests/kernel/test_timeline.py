@@ -1,8 +1,11 @@
 from math import inf
+
+import pytest
 from numpy import random
 
 from sequence.kernel.entity import Entity
 from sequence.kernel.event import Event
+from sequence.kernel.eventlist import HEAP_EVENT_LIST, CALENDAR_EVENT_LIST
 from sequence.kernel.process import Process
 from sequence.kernel.timeline import Timeline
 
@@ -38,8 +41,9 @@ def test_init():
     assert dummy.initialized
 
 
-def _set_up_test(activation_method: str, stop_time = inf, number_of_dummys: int = 1, event_time: int = 10, event_priority = inf) -> Timeline:
-    timeline = Timeline(stop_time)
+def _set_up_test(activation_method: str, stop_time = inf, number_of_dummys: int = 1, event_time: int = 10, event_priority = inf,
+                 event_queue=HEAP_EVENT_LIST) -> Timeline:
+    timeline = Timeline(stop_time, event_queue=event_queue)
     dummys = [Dummy(f'{dummy_number}', timeline) for dummy_number in range(number_of_dummys)]
     processes = [Process(dummy, activation_method, []) for dummy in dummys]
     events = [Event(event_time, process, event_priority) for process in processes]
@@ -77,8 +81,9 @@ def test_run_with_stop_time():
     assert timeline.now() == timeline.time < stop_time and len(timeline.events) == len(events)
     
 
-def test_remove_event():
-    timeline, dummys, events = _set_up_test('operate', number_of_dummys=2, event_time=1)
+@pytest.mark.parametrize("event_queue", [HEAP_EVENT_LIST, CALENDAR_EVENT_LIST])
+def test_remove_event(event_queue):
+    timeline, dummys, events = _set_up_test('operate', number_of_dummys=2, event_time=1, event_queue=event_queue)
 
     assert all(dummy.counter == _INITIAL_COUNT for dummy in dummys)
 
@@ -88,8 +93,9 @@ def test_remove_event():
     assert dummys[0].counter == _INITIAL_COUNT and dummys[1].counter == 1
 
 
-def test_update_event_time():
-    timeline, dummys, events = _set_up_test('click', number_of_dummys=2)
+@pytest.mark.parametrize("event_queue", [HEAP_EVENT_LIST, CALENDAR_EVENT_LIST])
+def test_update_event_time(event_queue):
+    timeline, dummys, events = _set_up_test('click', number_of_dummys=2, event_queue=event_queue)
 
     assert all(dummy.click_time is None for dummy in dummys)
 
@@ -99,6 +105,30 @@ def test_update_event_time():
     assert dummys[0].click_time == 10 and dummys[1].click_time == 20
 
 
+@pytest.mark.parametrize("event_queue", [HEAP_EVENT_LIST, CALENDAR_EVENT_LIST])
+def test_event_queue(event_queue):
+    random.seed(0)
+    tl = Timeline(event_queue=event_queue)
+    dummy = Dummy("dummy", tl)
+    times = random.randint(0, 1000, 200)
+    for t in times:
+        tl.schedule(Event(int(t), Process(dummy, "operate", [])))
+    tl.init()
+    tl.run()
+    assert dummy.counter == 200
+    assert tl.now() == max(times)
+
+
+def test_invalid_event_queue():
+    with pytest.raises(ValueError):
+        Timeline(event_queue="invalid")
+
+
+def test_factorize():
+    assert not Timeline().quantum_manager.factorize
+    assert Timeline(factorize=True).quantum_manager.factorize
+
+
 def test_ns_to_human_time():
     tl = Timeline()
     ten_hours = int(10 * 3600e9)
@@ -146,3 +176,36 @@ def test_schedule():
     tl.init()
     tl.run()
     assert tl.run_counter == SCHEDULE_NUM == e1.counter
+
+
+def test_profiling():
+    import json
+
+    tl = Timeline()
+    assert tl.profiler is None
+    dummy = Dummy("dummy", tl)
+    for t in range(10):
+        tl.schedule(Event(t * 1000, Process(dummy, "operate", [])))
+    tl.schedule(Event(5000, Process(dummy, "click", [])))
+    profiler = tl.enable_profiling(time_bin=5000)
+    tl.init()
+    tl.run()
+
+    records = {(r["owner"], r["activation"]): r for r in profiler.to_dict()}
+    assert set(records.keys()) == {("Dummy", "operate"), ("Dummy", "click")}
+    operate = records[("Dummy", "operate")]
+    assert operate["count"] == 10
+    assert operate["first_sim_time"] == 0 and operate["last_sim_time"] == 9000
+    assert operate["sim_time_histogram"] == {0: 5, 5000: 5}
+    assert 0 <= operate["max_wall_time"] <= operate["total_wall_time"]
+    assert records[("Dummy", "click")]["count"] == 1
+
+    output = json.loads(profiler.to_json())
+    assert output["time_bin"] == 5000 and len(output["events"]) == 2
+    table = profiler.table().split("\n")
+    assert len(table) == 4 and table[0].startswith("owner")
+
+    tl.disable_profiling()
+    tl.schedule(Event(20000, Process(dummy, "operate", [])))
+    tl.run()
+    assert sum(r["count"] for r in profiler.to_dict()) == 11
@@ -1,4 +1,5 @@
 from numpy import random
+from pytest import raises
 from sequence.components.optical_channel import QuantumChannel, ClassicalChannel
 from sequence.components.memory import MemoryArray
 from sequence.kernel.timeline import Timeline
@@ -239,6 +240,45 @@ def test_ResourceReservationProtocol_schedule():
             assert counter == 0
 
 
+def test_ResourceReservationProtocol_schedule_placement():
+    tl = Timeline()
+    n1 = FakeNode("n1", tl, memo_size=6)
+    assert n1.rsvp.placement == "first_fit"
+    with raises(ValueError):
+        n1.rsvp.set_placement("worst_fit")
+
+    # memories 0-2 busy until 100, memories 3-4 busy until 50
+    r1 = Reservation("n1", "", 0, 100, 3, 0.9)
+    r2 = Reservation("n1", "", 0, 50, 2, 0.9)
+    assert n1.rsvp.schedule(r1) and n1.rsvp.schedule(r2)
+    assert n1.rsvp.get_memory_indices(r1) == [0, 1, 2]
+    assert n1.rsvp.get_memory_indices(r2) == [3, 4]
+
+    # first fit uses lowest free memories
+    r3 = Reservation("n1", "", 60, 200, 2, 0.9)
+    assert n1.rsvp.schedule(r3)
+    assert n1.rsvp.get_memory_indices(r3) == [3, 4]
+    n1.rsvp.pop("n2", ResourceReservationMessage(RSVPMsgType.REJECT, n1.rsvp.name, r3))
+    assert n1.rsvp.get_memory_indices(r3) == []
+    assert len(n1.rsvp.reservation_index) == 5
+
+    # best fit prefers memories where the reservation fits most tightly (and keeps memory 5 free)
+    n1.rsvp.set_placement("best_fit")
+    r4 = Reservation("n1", "", 110, 200, 1, 0.9)
+    r5 = Reservation("n1", "", 101, 105, 1, 0.9)
+    assert n1.rsvp.schedule(r4)
+    assert n1.rsvp.get_memory_indices(r4) == [0]
+    assert n1.rsvp.schedule(r5)
+    assert n1.rsvp.get_memory_indices(r5) == [0]
+    r7 = Reservation("n1", "", 60, 80, 1, 0.9)
+    assert n1.rsvp.schedule(r7)
+    assert n1.rsvp.get_memory_indices(r7) == [3]
+
+    r6 = Reservation("n1", "", 0, 200, 2, 0.9)
+    assert not n1.rsvp.schedule(r6)
+    assert n1.rsvp.get_memory_indices(r6) == []
+
+
 def test_ResourceReservationProtocol_create_rules():
     tl = Timeline()
     routers = []
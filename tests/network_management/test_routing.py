@@ -0,0 +1,64 @@
+from networkx import Graph
+
+from sequence.network_management.routing import StaticRoutingProtocol
+
+
+class FakeNode:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_StaticRoutingProtocol_handle_link_change():
+    # square a - b - c - d - a, with a shortcut a - c
+    graph = Graph()
+    graph.add_weighted_edges_from([("a", "b", 1), ("b", "c", 1), ("c", "d", 1), ("d", "a", 1), ("a", "c", 5)])
+    protocol = StaticRoutingProtocol(FakeNode("a"), "a.routing", {})
+    protocol.set_graph(graph)
+    protocol.compute_forwarding_table()
+    assert protocol.forwarding_table == {"b": "b", "c": "b", "d": "d"}
+    assert protocol.distances["c"] == 2
+
+    # longer link not on shortest paths
+    graph.add_edge("a", "c", weight=6)
+    assert not protocol.handle_link_change("a", "c", 5)
+    # shorter link creating no shorter path
+    graph.add_edge("a", "c", weight=2)
+    assert not protocol.handle_link_change("a", "c", 6)
+    # shorter link creating shorter path
+    graph.add_edge("a", "c", weight=1)
+    assert protocol.handle_link_change("a", "c", 2)
+    assert protocol.forwarding_table["c"] == "c"
+
+    # removed link on shortest path
+    graph.remove_edge("a", "c")
+    assert protocol.handle_link_change("a", "c", 1)
+    assert protocol.forwarding_table["c"] == "b"
+    graph.remove_edge("a", "b")
+    assert protocol.handle_link_change("a", "b", 1)
+    assert protocol.forwarding_table == {"c": "d", "d": "d", "b": "d"}
+
+    # partition
+    graph.remove_edge("a", "d")
+    assert protocol.handle_link_change("a", "d", 1)
+    assert protocol.forwarding_table == {}
+    graph.remove_edge("b", "c")
+    assert not protocol.handle_link_change("b", "c", 1)
+
+
+def test_StaticRoutingProtocol_on_demand():
+    graph = Graph()
+    graph.add_weighted_edges_from([("a", "b", 1), ("b", "c", 1), ("a", "c", 5)])
+    protocol = StaticRoutingProtocol(FakeNode("a"), "a.routing", {})
+    protocol.set_graph(graph, on_demand=True)
+    assert protocol.forwarding_table == {}
+
+    # table is not computed before first use
+    graph.add_edge("a", "c", weight=1)
+    assert not protocol.handle_link_change("a", "c", 5)
+    assert protocol.forwarding_table == {}
+
+    protocol.push("b", None)
+    assert protocol.forwarding_table == {"b": "b", "c": "c"}
+    graph.add_edge("a", "c", weight=5)
+    assert protocol.handle_link_change("a", "c", 1)
+    assert protocol.forwarding_table == {"b": "b", "c": "b"}
@@ -1,3 +1,5 @@
+import pytest
+
 from sequence.qkd.BB84 import pair_bb84_protocols
 
 # For testing BB84 Protocol
@@ -72,6 +74,46 @@ def test_BB84_polarization():
     assert pa.counter == pb.counter == 10
 
 
+def test_BB84_polarization_pulse_train():
+    tl = Timeline(1e12)  # stop time is 1 s
+
+    alice = QKDNode("alice", tl, stack_size=1, pulse_train=True)
+    bob = QKDNode("bob", tl, stack_size=1, pulse_train=True)
+    alice.set_seed(0)
+    bob.set_seed(1)
+    for detector in bob.components["bob.qsdetector"].detectors:
+        detector.dark_count = 100
+    pair_bb84_protocols(alice.protocol_stack[0], bob.protocol_stack[0])
+
+    qc0 = QuantumChannel("qc0", tl, distance=10e3, polarization_fidelity=0.99,
+                         attenuation=0.00002)
+    qc1 = QuantumChannel("qc1", tl, distance=10e3, polarization_fidelity=0.99,
+                         attenuation=0.00002)
+    qc0.set_ends(alice, bob.name)
+    qc1.set_ends(bob, alice.name)
+    cc0 = ClassicalChannel("cc0", tl, distance=10e3)
+    cc1 = ClassicalChannel("cc1", tl, distance=10e3)
+    cc0.set_ends(alice, bob.name)
+    cc1.set_ends(bob, alice.name)
+
+    # Parent
+    pa = Parent(alice, 128, "alice")
+    pb = Parent(bob, 128, "bob")
+    alice.protocol_stack[0].upper_protocols.append(pa)
+    pa.lower_protocols.append(alice.protocol_stack[0])
+    bob.protocol_stack[0].upper_protocols.append(pb)
+    pb.lower_protocols.append(bob.protocol_stack[0])
+
+    process = Process(pa, "push", [])
+    event = Event(0, process)
+    tl.schedule(event)
+
+    tl.init()
+    tl.run()
+    assert pa.counter == pb.counter == 10
+    assert max(alice.protocol_stack[0].error_rates) < 0.1
+
+
 def test_BB84_time_bin():
     tl = Timeline(1e12)  # stop time is 1 s
 
@@ -108,3 +150,9 @@ def test_BB84_time_bin():
     tl.run()
     assert pa.counter == pb.counter == 10
 
+
+
+def test_BB84_pulse_train_encoding():
+    tl = Timeline()
+    with pytest.raises(ValueError):
+        QKDNode("alice", tl, encoding=time_bin, stack_size=1, pulse_train=True)
@@ -41,3 +41,25 @@ def test_update():
     assert manager[0].remote_memo == 0
 
 
+def test_state_index():
+    tl = Timeline()
+    arr = MemoryArray("memo_arr", tl, num_memories=4)
+    manager = MemoryManager(arr)
+    assert [info.index for info in manager.get_infos_by_state("RAW")] == [0, 1, 2, 3]
+
+    for i, node in [(2, "alice"), (0, "alice"), (1, "bob")]:
+        arr[i].entangled_memory = {"node_id": node, "memo_id": i}
+        manager.update(arr[i], "ENTANGLED")
+    assert [info.index for info in manager.get_infos_by_state("RAW")] == [3]
+    assert [info.index for info in manager.get_infos_by_state("ENTANGLED")] == [0, 1, 2]
+    assert [info.index for info in manager.get_entangled_infos("alice")] == [0, 2]
+    assert manager.get_entangled_infos("charlie") == []
+
+    # transitions made on memory info objects are also indexed
+    manager[0].to_occupied()
+    assert [info.index for info in manager.get_infos_by_state("OCCUPIED")] == [0]
+    assert [info.index for info in manager.get_entangled_infos("alice")] == [2]
+    manager.update(arr[1], "RAW")
+    assert manager.get_entangled_infos("bob") == []
+    assert "bob" not in manager.entangled_index
+    assert [info.index for info in manager.get_infos_by_state("RAW")] == [1, 3]
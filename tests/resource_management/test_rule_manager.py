@@ -2,7 +2,7 @@ from numpy import random
 from sequence.components.memory import Memory
 from sequence.kernel.timeline import Timeline
 from sequence.resource_management.memory_manager import MemoryInfo
-from sequence.resource_management.rule_manager import RuleManager, Rule
+from sequence.resource_management.rule_manager import RuleManager, Rule, memory_states
 
 random.seed(1)
 
@@ -96,3 +96,36 @@ def test_RuleManager_expire():
     protocol = ruleset.expire(rule)
     assert len(ruleset) == 0
     assert protocol == ["protocol"]
+
+
+def test_RuleManager_get_candidate_rules():
+    @memory_states("ENTANGLED")
+    def indexed_condition(memory_info, manager, args):
+        return []
+
+    tl = Timeline()
+    memory = Memory("mem", tl, fidelity=1, frequency=0, efficiency=1, coherence_time=-1, wavelength=500)
+    rule_manager = RuleManager()
+    rule1 = Rule(5, None, indexed_condition, None, {"memory_indices": [0, 1]})
+    rule2 = Rule(1, None, indexed_condition, None, {"memory_indices": [1]})
+    rule3 = Rule(5, None, None, None, None)
+    rule4 = Rule(1, None, indexed_condition, None, None)
+    for rule in [rule1, rule2, rule3, rule4]:
+        rule_manager.load(rule)
+    assert rule1.index_keys == [(0, "ENTANGLED"), (1, "ENTANGLED")]
+    assert rule3.index_keys is None and rule4.index_keys is None
+
+    info = MemoryInfo(memory, 1, "ENTANGLED")
+    candidates = list(rule_manager.get_candidate_rules(info))
+    # same order as all installed rules
+    assert candidates == list(rule_manager)
+    info = MemoryInfo(memory, 0, "ENTANGLED")
+    assert list(rule_manager.get_candidate_rules(info)) == [rule4, rule3, rule1]
+    info = MemoryInfo(memory, 1, "RAW")
+    assert list(rule_manager.get_candidate_rules(info)) == [rule4, rule3]
+
+    rule_manager.expire(rule1)
+    rule_manager.expire(rule3)
+    assert (0, "ENTANGLED") not in rule_manager.indexed_rules
+    info = MemoryInfo(memory, 1, "ENTANGLED")
+    assert list(rule_manager.get_candidate_rules(info)) == [rule4, rule2]
@@ -1,5 +1,9 @@
+from pytest import raises
+
 from sequence.components.optical_channel import ClassicalChannel, QuantumChannel
 from sequence.kernel.timeline import Timeline
+from sequence.message import Message
+from sequence.protocol import Protocol
 from sequence.topology.node import Node, QuantumRouter, BSMNode
 
 
@@ -62,6 +66,49 @@ def test_Node_send_message():
         assert actual == expect
 
 
+def test_Node_receive_message():
+    class FakeProtocol(Protocol):
+        def __init__(self, own, name, accept=True):
+            super().__init__(own, name)
+            self.accept = accept
+            self.log = []
+
+        def received_message(self, src, msg):
+            self.log.append((src, msg))
+            return self.accept
+
+    class OtherProtocol(FakeProtocol):
+        pass
+
+    tl = Timeline()
+    node = Node("node1", tl)
+    p1 = FakeProtocol(node, "p1", accept=False)
+    p2 = FakeProtocol(node, "p1")
+    p3 = FakeProtocol(node, "p1")
+    p4 = OtherProtocol(node, "p4")
+    for p in [p1, p2, p3, p4]:
+        node.protocols.append(p)
+    node.protocols.append(p1)
+    assert len(node.protocols) == 4 and node.protocols[0] == p1 and p4 in node.protocols
+
+    # message for named receiver is delivered until accepted
+    node.receive_message("node2", Message("type", "p1"))
+    assert len(p1.log) == len(p2.log) == 1 and len(p3.log) == 0
+
+    # message without receiver is delivered to protocols of the exact type
+    msg = Message("type", None)
+    msg.protocol_type = OtherProtocol
+    node.receive_message("node2", msg)
+    assert len(p4.log) == 1 and len(p3.log) == 0
+
+    node.protocols.remove(p2)
+    assert node.protocols.get_by_name("p1") == [p1, p3]
+    assert node.protocols.get_by_type(FakeProtocol) == [p1, p3]
+    assert list(node.protocols) == [p1, p3, p4]
+    with raises(ValueError):
+        node.protocols.remove(p2)
+
+
 def test_Node_send_qubit():
     from sequence.components.photon import Photon
     from numpy import random
@@ -1,3 +1,8 @@
+import gzip
+import json
+
+import pytest
+
 from sequence.topology.router_net_topo import RouterNetTopo
 from sequence.kernel.timeline import Timeline
 
@@ -60,4 +65,143 @@ def test_sequential_simulation():
     for r in topo.get_nodes_by_type(RouterNetTopo.QUANTUM_ROUTER):
         assert len(r.network_manager.protocol_stack[0].forwarding_table) > 0
 
+
+def test_routing_cache(tmp_path, monkeypatch):
+    with open("tests/topology/router_net_topo_sample_config.json") as fh:
+        config = json.load(fh)
+    config[RouterNetTopo.ROUTING_CACHE] = str(tmp_path / "cache")
+    config_file = str(tmp_path / "config.json")
+    with open(config_file, "w") as fh:
+        json.dump(config, fh)
+
+    topo = RouterNetTopo(config_file)
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+    tables = {r.name: r.network_manager.protocol_stack[0].forwarding_table
+              for r in topo.get_nodes_by_type(RouterNetTopo.QUANTUM_ROUTER)}
+    assert tables["e1"] == {"e2": "e2"} and tables["e3"] == {"e4": "e4"}
+
+    def fail(*args):
+        raise AssertionError("forwarding tables should be loaded from cache")
+
+    compute_next_hops = RouterNetTopo._compute_next_hops
+    monkeypatch.setattr(RouterNetTopo, "_compute_next_hops", staticmethod(fail))
+    cached_topo = RouterNetTopo(config_file)
+    for r in cached_topo.get_nodes_by_type(RouterNetTopo.QUANTUM_ROUTER):
+        assert r.network_manager.protocol_stack[0].forwarding_table == tables[r.name]
+        assert r.network_manager.protocol_stack[0].distances[r.name] == 0
+
+    # cached distances allow incremental updates
+    monkeypatch.setattr(RouterNetTopo, "_compute_next_hops", staticmethod(compute_next_hops))
+    routers = {r.name: r for r in cached_topo.get_nodes_by_type(RouterNetTopo.QUANTUM_ROUTER)}
+    cached_topo.update_link("e3", "e4", 3000)
+    assert not routers["e1"].network_manager.protocol_stack[0].handle_link_change("e3", "e4", 2000)
+
+
+def test_update_link():
+    topo = RouterNetTopo("tests/topology/router_net_topo_sample_config.json")
+    routers = {r.name: r for r in topo.get_nodes_by_type(RouterNetTopo.QUANTUM_ROUTER)}
+    assert "e4" not in routers["e1"].network_manager.protocol_stack[0].forwarding_table
+
+    topo.update_link("e2", "e3", 500)
+    assert routers["e1"].network_manager.protocol_stack[0].forwarding_table["e4"] == "e2"
+    assert routers["e2"].network_manager.protocol_stack[0].forwarding_table["e4"] == "e3"
+    assert routers["e4"].network_manager.protocol_stack[0].forwarding_table["e1"] == "e3"
+
+    topo.update_link("e2", "e3")
+    assert "e4" not in routers["e1"].network_manager.protocol_stack[0].forwarding_table
+    assert routers["e1"].network_manager.protocol_stack[0].forwarding_table == {"e2": "e2"}
+
+
+def test_update_link_symmetric():
+    topo = RouterNetTopo("tests/topology/router_net_topo_sample_config.json")
+    tables = {r.name: r.network_manager.protocol_stack[0].forwarding_table
+              for r in topo.get_nodes_by_type(RouterNetTopo.QUANTUM_ROUTER)}
+
+    def check_square():
+        # opposite corners of the square use the same middle router in both directions
+        for src, dst in [("e1", "e3"), ("e2", "e4")]:
+            assert tables[src][dst] == tables[dst][src]
+            assert tables[src][dst] not in (src, dst)
+        for src, dst in [("e1", "e2"), ("e2", "e3"), ("e3", "e4"), ("e1", "e4")]:
+            assert tables[src][dst] == dst and tables[dst][src] == src
+
+    # square e1 - e2 - e3 - e4 - e1, with equal paths between opposite corners
+    topo.update_link("e1", "e2", 1000)
+    topo.update_link("e3", "e4", 1000)
+    topo.update_link("e2", "e3", 1000)
+    topo.update_link("e1", "e4", 1000)
+    check_square()
+
+    # changes affecting the trees of some routers only
+    for node1, node2, distance in [("e3", "e4", 900), ("e3", "e4", 1000), ("e1", "e2", 1100), ("e1", "e2", 1000)]:
+        topo.update_link(node1, node2, distance)
+        check_square()
+
+    # shorter link on one side of the square
+    topo.update_link("e3", "e4", 900)
+    assert tables["e1"]["e3"] == tables["e3"]["e1"] == "e4"
+    assert tables["e2"]["e4"] == tables["e4"]["e2"] == "e3"
+
+
+def test_compressed_config(tmp_path):
+    with open("tests/topology/router_net_topo_sample_config.json") as fh:
+        config = json.load(fh)
+    config_file = str(tmp_path / "config.json.gz")
+    with gzip.open(config_file, "wt") as fh:
+        json.dump(config, fh)
+
+    topo = RouterNetTopo(config_file)
+    assert len(topo.get_nodes_by_type(RouterNetTopo.QUANTUM_ROUTER)) == 4
+    assert len(topo.get_nodes_by_type(RouterNetTopo.BSM_NODE)) == 2
+    assert len(topo.get_qchannels()) == 4
+    assert len(topo.get_cchannels()) == 10
+
+
+def test_msgpack_config(tmp_path):
+    msgpack = pytest.importorskip("msgpack")
+    with open("tests/topology/router_net_topo_sample_config.json") as fh:
+        config = json.load(fh)
+    config_file = str(tmp_path / "config.msgpack")
+    with open(config_file, "wb") as fh:
+        msgpack.pack(config, fh)
+
+    topo = RouterNetTopo(config_file)
+    assert len(topo.get_nodes_by_type(RouterNetTopo.QUANTUM_ROUTER)) == 4
+    assert len(topo.get_cchannels()) == 10
+
+
+def test_qconnection_delay(tmp_path):
+    with open("tests/topology/router_net_topo_sample_config.json") as fh:
+        config = json.load(fh)
+    # delays of classical channels and connections between e3 and e4 are averaged
+    config[RouterNetTopo.ALL_C_CHANNEL].append({"name": "cc.e3.e4.extra", "source": "e3", "destination": "e4", "delay": 3e9})
+    config[RouterNetTopo.ALL_C_CHANNEL].append({"name": "cc.e4.e3.extra", "source": "e4", "destination": "e3",
+                                                 "distance": 4e5})
+    config_file = str(tmp_path / "config.json")
+    with open(config_file, "w") as fh:
+        json.dump(config, fh)
+
+    topo = RouterNetTopo(config_file)
+    bsm_name = "BSM.e3.e4.auto"
+    bsm_channels = [cc for cc in topo.get_cchannels() if bsm_name in (cc.sender.name, cc.receiver)]
+    assert len(bsm_channels) == 4
+    for cc in bsm_channels:
+        assert cc.delay == 1e9
+
+
+def test_on_demand_routing(tmp_path):
+    with open("tests/topology/router_net_topo_sample_config.json") as fh:
+        config = json.load(fh)
+    config[RouterNetTopo.ON_DEMAND_ROUTING] = True
+    config_file = str(tmp_path / "config.json")
+    with open(config_file, "w") as fh:
+        json.dump(config, fh)
+
+    topo = RouterNetTopo(config_file)
+    for r in topo.get_nodes_by_type(RouterNetTopo.QUANTUM_ROUTER):
+        routing = r.network_manager.protocol_stack[0]
+        assert routing.forwarding_table == {}
+        routing.compute_forwarding_table()
+        assert len(routing.forwarding_table) == 1
+
 # TODO: unit test for the parallel simulation
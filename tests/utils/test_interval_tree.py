@@ -0,0 +1,50 @@
+from numpy import random
+from sequence.utils.interval_tree import IntervalTree
+
+random.seed(0)
+
+
+def test_IntervalTree_overlap():
+    tree = IntervalTree()
+    intervals = []
+    for i in range(500):
+        start = random.randint(1000)
+        end = start + random.randint(50)
+        tree.insert(start, end, i)
+        intervals.append((start, end, i))
+    assert len(tree) == 500
+
+    for _ in range(200):
+        start = random.randint(1000)
+        end = start + random.randint(50)
+        expect = sorted(i for s, e, i in intervals if s <= end and e >= start)
+        assert sorted(tree.overlap(start, end)) == expect
+
+    # closed intervals
+    tree = IntervalTree()
+    tree.insert(10, 20, "a")
+    assert tree.overlap(20, 30) == ["a"] and tree.overlap(0, 10) == ["a"]
+    assert tree.overlap(21, 30) == [] and tree.overlap(0, 9) == []
+
+
+def test_IntervalTree_remove():
+    tree = IntervalTree()
+    intervals = []
+    for i in range(300):
+        start = random.randint(1000)
+        end = start + random.randint(50)
+        tree.insert(start, end, i % 10)
+        intervals.append((start, end, i % 10))
+
+    random.shuffle(intervals)
+    removed, kept = intervals[:150], intervals[150:]
+    for s, e, i in removed:
+        assert tree.remove(s, e, i)
+    assert not tree.remove(-1, -1, 0)
+    assert len(tree) == 150
+
+    for _ in range(100):
+        start = random.randint(1000)
+        end = start + random.randint(50)
+        expect = sorted(i for s, e, i in kept if s <= end and e >= start)
+        assert sorted(tree.overlap(start, end)) == expect
@@ -0,0 +1,98 @@
+"""Compares memory use and execution rate of slotted events and processes with the previous dict-based records.
+
+For each record type, the script reports the memory used per event (event and process) and the number of events
+executed per second by the timeline.
+Dict-based records are measured as implemented before slots; the queue state required by the current event list is
+attached after the memory measurement.
+"""
+
+from math import inf
+from time import perf_counter
+import tracemalloc
+
+from numpy import random
+
+from sequence.kernel.entity import Entity
+from sequence.kernel.event import Event
+from sequence.kernel.process import Process
+from sequence.kernel.timeline import Timeline
+
+
+EVENT_NUM = 200000
+
+
+class Counter(Entity):
+    def __init__(self, name, timeline):
+        super().__init__(name, timeline)
+        self.counter = 0
+
+    def init(self):
+        pass
+
+    def operate(self):
+        self.counter += 1
+
+
+class DictProcess:
+    """Process record as implemented before slots."""
+
+    def __init__(self, owner, activation_method, act_params, act_kwargs={}):
+        self.owner = owner
+        self.activation = activation_method
+        self.act_params = act_params
+        self.act_kwargs = act_kwargs
+
+    def run(self):
+        return getattr(self.owner, self.activation)(*self.act_params, **self.act_kwargs)
+
+
+class DictEvent:
+    """Event record as implemented before slots."""
+
+    def __init__(self, time, process, priority=inf):
+        self.time = time
+        self.priority = priority
+        self.process = process
+        self._is_removed = False
+
+    def __lt__(self, another):
+        return (self.time < another.time) or (self.time == another.time and self.priority < another.priority)
+
+    def is_invalid(self):
+        return self._is_removed
+
+
+def run(event_cls, process_cls, times):
+    tl = Timeline()
+    counter = Counter("counter", tl)
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    events = [event_cls(t, process_cls(counter, "operate", [])) for t in times]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # exclude the list holding the events
+    bytes_per_event = (after - before - events.__sizeof__()) / len(times)
+
+    if event_cls is DictEvent:
+        for event in events:
+            event._queued = False
+            event._version = 0
+
+    for event in events:
+        tl.schedule(event)
+    tick = perf_counter()
+    tl.run()
+    events_per_sec = len(times) / (perf_counter() - tick)
+
+    assert counter.counter == len(times)
+    return bytes_per_event, events_per_sec
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    times = random.randint(0, EVENT_NUM, EVENT_NUM).tolist()
+    print("{:>8} {:>12} {:>12}".format("records", "bytes/event", "events/sec"))
+    for name, event_cls, process_cls in [("dict", DictEvent, DictProcess), ("slotted", Event, Process)]:
+        bytes_per_event, events_per_sec = run(event_cls, process_cls, times)
+        print("{:>8} {:>12.0f} {:>12.0f}".format(name, bytes_per_event, events_per_sec))
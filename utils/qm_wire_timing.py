@@ -0,0 +1,72 @@
+"""Compares the per-message overhead of the JSON and binary quantum manager wire protocols.
+
+For RUN and SET messages, the script measures message size and the time to encode a frame on the client,
+send it over a local socket pair, and decode it on the server (no quantum manager operations are performed).
+Requires the parallel `psequence` package.
+"""
+
+import socket
+from time import perf_counter
+from uuid import uuid4
+
+import numpy as np
+
+from psequence.communication import send_msg_with_length, recv_msg_with_length, send_frame, decode_records, \
+    FrameReader
+from psequence.quantum_manager_server import QuantumManagerMessage, QuantumManagerMsgType
+from sequence.components.circuit import Circuit
+
+
+NUM_TRIALS = 10000
+NUM_QUBITS = [2, 6, 10]  # number of qubits of SET states
+
+
+def json_round_trip(sender, receiver, msg):
+    send_msg_with_length(sender, [msg.serialize()])
+    for m_raw in recv_msg_with_length(receiver):
+        QuantumManagerMessage(None, [], []).deserialize(m_raw)
+
+
+def binary_round_trip(sender, reader, msg):
+    send_frame(sender, [msg.encode()])
+    for record in decode_records(reader.recv_frame()):
+        QuantumManagerMessage(None, [], []).decode(*record)
+
+
+def time_message(msg):
+    sender, receiver = socket.socketpair()
+    reader = FrameReader(receiver)
+    results = {}
+    for name, func, target, size in [("json", json_round_trip, receiver, len(str(msg.serialize()))),
+                                     ("binary", binary_round_trip, reader, len(msg.encode()))]:
+        start = perf_counter()
+        for _ in range(NUM_TRIALS):
+            func(sender, target, msg)
+        results[name] = ((perf_counter() - start) / NUM_TRIALS * 1e6, size)
+    sender.close()
+    receiver.close()
+    return results
+
+
+def print_results(label, results):
+    (json_time, json_size), (binary_time, binary_size) = results["json"], results["binary"]
+    print("{:<12} json: {:8.1f} us {:8d} B    binary: {:8.1f} us {:8d} B    speedup: {:5.1f}x".format(
+        label, json_time, json_size, binary_time, binary_size, json_time / binary_time))
+
+
+if __name__ == "__main__":
+    circuit = Circuit(2)
+    circuit.cx(0, 1)
+    circuit.h(0)
+    circuit.measure(0)
+    circuit.measure(1)
+    keys = [uuid4().int for _ in range(4)]
+    msg = QuantumManagerMessage(QuantumManagerMsgType.RUN, keys, [circuit, keys[1:3], 0.5])
+    print_results("RUN", time_message(msg))
+
+    for num_qubits in NUM_QUBITS:
+        keys = [uuid4().int for _ in range(num_qubits)]
+        amplitudes = np.random.random(2 ** num_qubits) + 1j * np.random.random(2 ** num_qubits)
+        amplitudes = list(amplitudes / np.linalg.norm(amplitudes))
+        msg = QuantumManagerMessage(QuantumManagerMsgType.SET, keys, [amplitudes])
+        print_results("SET ({} q)".format(num_qubits), time_message(msg))
@@ -0,0 +1,85 @@
+"""Compares memory reservation admission control policies of the reservation protocol.
+
+Reservations are drawn as by the `RandomRequestApp` (start 1-2 s after the request, random duration and memory size),
+with arrivals set so that the offered load exceeds the memory capacity of the router.
+For each memory array size, the script reports the acceptance rate and the time per request for:
+
+* legacy: timecards tried one by one, with rollback of rejected requests (the previous implementation).
+* first_fit: one query of the node reservation index, lowest free memories.
+* best_fit: one query of the node reservation index, tightest fitting memories.
+"""
+
+from time import perf_counter
+
+import numpy as np
+
+from sequence.kernel.timeline import Timeline
+from sequence.network_management.reservation import Reservation, MemoryTimeCard
+from sequence.topology.node import QuantumRouter
+
+
+NUM_REQUESTS = 5000
+MEMO_SIZES = [50, 500, 1000]
+MIN_DUR, MAX_DUR = 1e12, 2e12
+MIN_SIZE, MAX_SIZE = 10, 25
+OFFERED_LOAD = 1.5  # ratio of requested memory time to memory capacity
+
+
+def generate_reservations(memo_size, seed=0):
+    rng = np.random.default_rng(seed)
+    # intermediate routers reserve 2 memories per requested pair
+    mean_demand = (MIN_DUR + MAX_DUR) / 2 * (MIN_SIZE + MAX_SIZE)
+    mean_gap = mean_demand / (OFFERED_LOAD * memo_size)
+    reservations = []
+    now = 0
+    for _ in range(NUM_REQUESTS):
+        now += rng.exponential(mean_gap)
+        start_time = now + rng.integers(10, 20) * 1e11
+        end_time = start_time + rng.integers(MIN_DUR, MAX_DUR)
+        memory_size = int(rng.integers(MIN_SIZE, MAX_SIZE))
+        reservations.append(Reservation("initiator", "responder", start_time, end_time, memory_size, 0.9))
+    return reservations
+
+
+def legacy_schedule(timecards, reservation):
+    counter = reservation.memory_size * 2
+    cards = []
+    for card in timecards:
+        if card.add(reservation):
+            counter -= 1
+            cards.append(card)
+        if counter == 0:
+            break
+
+    if counter > 0:
+        for card in cards:
+            card.remove(reservation)
+        return False
+    return True
+
+
+def make_legacy(memo_size):
+    timecards = [MemoryTimeCard(i) for i in range(memo_size)]
+    return lambda reservation: legacy_schedule(timecards, reservation)
+
+
+def make_policy(memo_size, placement):
+    router = QuantumRouter("router", Timeline(), memo_size=memo_size)
+    rsvp = router.network_manager.protocol_stack[1]
+    rsvp.set_placement(placement)
+    return rsvp.schedule
+
+
+if __name__ == "__main__":
+    print("{:>6} {:>10} {:>10} {:>12}".format("memos", "policy", "accepted", "us/request"))
+    for memo_size in MEMO_SIZES:
+        reservations = generate_reservations(memo_size)
+        schedulers = [("legacy", make_legacy(memo_size)),
+                      ("first_fit", make_policy(memo_size, "first_fit")),
+                      ("best_fit", make_policy(memo_size, "best_fit"))]
+        for name, schedule in schedulers:
+            start = perf_counter()
+            results = [schedule(reservation) for reservation in reservations]
+            elapsed = perf_counter() - start
+            print("{:>6} {:>10} {:>9.1%} {:>12.1f}".format(memo_size, name, sum(results) / len(results),
+                                                           elapsed / len(results) * 1e6))
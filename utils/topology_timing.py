@@ -0,0 +1,113 @@
+"""Measures the time to build router network topologies from generated grid mesh configuration files.
+
+Routers are placed on a square grid, and neighbouring routers are joined by a meet-in-the-middle quantum connection
+and a classical connection (so that each quantum connection is expanded into a BSM node and its channels).
+Forwarding tables are computed on demand, as all-pairs tables of large networks do not fit in memory.
+For each network size, the script reports:
+
+* legacy: time to expand quantum connections by scanning all classical connections (the previous implementation).
+* expand: time to expand quantum connections with the classical delay index.
+* json, json.gz: time to build the whole topology from a json (or gzip compressed json) configuration file.
+"""
+
+import gzip
+import json
+import os
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from numpy import mean
+
+from sequence.topology.router_net_topo import RouterNetTopo
+
+
+GRID_SIDES = [10, 32, 100]
+LEGACY_MAX_SIDE = 32  # the legacy expansion is quadratic in the number of connections
+MEMO_SIZE = 10
+DISTANCE = 2e3
+ATTENUATION = 0.0002
+CC_DELAY = 1e9
+
+
+def generate_grid(side):
+    names = [["router_{}_{}".format(i, j) for j in range(side)] for i in range(side)]
+    nodes = []
+    q_connections = []
+    c_connections = []
+    for i in range(side):
+        for j in range(side):
+            nodes.append({RouterNetTopo.NAME: names[i][j],
+                          RouterNetTopo.TYPE: RouterNetTopo.QUANTUM_ROUTER,
+                          RouterNetTopo.SEED: i * side + j,
+                          RouterNetTopo.MEMO_ARRAY_SIZE: MEMO_SIZE})
+            neighbours = ([names[i + 1][j]] if i + 1 < side else []) + ([names[i][j + 1]] if j + 1 < side else [])
+            for neighbour in neighbours:
+                q_connections.append({RouterNetTopo.CONNECT_NODE_1: names[i][j],
+                                      RouterNetTopo.CONNECT_NODE_2: neighbour,
+                                      RouterNetTopo.ATTENUATION: ATTENUATION,
+                                      RouterNetTopo.DISTANCE: DISTANCE,
+                                      RouterNetTopo.TYPE: RouterNetTopo.MEET_IN_THE_MID})
+                c_connections.append({RouterNetTopo.CONNECT_NODE_1: names[i][j],
+                                      RouterNetTopo.CONNECT_NODE_2: neighbour,
+                                      RouterNetTopo.DELAY: CC_DELAY})
+
+    return {RouterNetTopo.IS_PARALLEL: False,
+            RouterNetTopo.STOP_TIME: 1e12,
+            RouterNetTopo.ON_DEMAND_ROUTING: True,
+            RouterNetTopo.ALL_NODE: nodes,
+            RouterNetTopo.ALL_Q_CHANNEL: [],
+            RouterNetTopo.ALL_C_CHANNEL: [],
+            RouterNetTopo.ALL_QC_CONNECT: q_connections,
+            RouterNetTopo.ALL_CC_CONNECT: c_connections}
+
+
+def legacy_delays(config):
+    # delays of all quantum connections, found by scanning classical connections
+    delays = []
+    for q_connect in config[RouterNetTopo.ALL_QC_CONNECT]:
+        node1 = q_connect[RouterNetTopo.CONNECT_NODE_1]
+        node2 = q_connect[RouterNetTopo.CONNECT_NODE_2]
+        cc_delay = []
+        for cc in config[RouterNetTopo.ALL_CC_CONNECT]:
+            if (cc[RouterNetTopo.CONNECT_NODE_1] == node1 and cc[RouterNetTopo.CONNECT_NODE_2] == node2) \
+                    or (cc[RouterNetTopo.CONNECT_NODE_1] == node2 and cc[RouterNetTopo.CONNECT_NODE_2] == node1):
+                cc_delay.append(cc[RouterNetTopo.DELAY])
+        delays.append(mean(cc_delay) // 2)
+    return delays
+
+
+def expand(config):
+    # expand quantum connections without building the rest of the topology
+    topo = RouterNetTopo.__new__(RouterNetTopo)
+    topo._add_qconnections(config)
+
+
+def time_call(func, *args):
+    start = perf_counter()
+    func(*args)
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    print("{:>8} {:>8} {:>10} {:>10} {:>10} {:>10}".format("routers", "nodes", "legacy(s)", "expand(s)",
+                                                          "json(s)", "json.gz(s)"))
+    with TemporaryDirectory() as tmp_dir:
+        for side in GRID_SIDES:
+            config = generate_grid(side)
+            num_routers = len(config[RouterNetTopo.ALL_NODE])
+            num_nodes = num_routers + len(config[RouterNetTopo.ALL_QC_CONNECT])
+
+            legacy = time_call(legacy_delays, config) if side <= LEGACY_MAX_SIDE else float("nan")
+            expanded = time_call(expand, json.loads(json.dumps(config)))
+
+            json_file = os.path.join(tmp_dir, "grid_{}.json".format(side))
+            with open(json_file, 'w') as fh:
+                json.dump(config, fh)
+            gz_file = json_file + ".gz"
+            with gzip.open(gz_file, 'wt') as fh:
+                json.dump(config, fh)
+            build_json = time_call(RouterNetTopo, json_file)
+            build_gz = time_call(RouterNetTopo, gz_file)
+
+            print("{:>8} {:>8} {:>10.3f} {:>10.3f} {:>10.2f} {:>10.2f}".format(num_routers, num_nodes, legacy, expanded,
+                                                                               build_json, build_gz))